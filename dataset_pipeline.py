@@ -0,0 +1,588 @@
+#!/usr/bin/env python3
+"""Incremental build of the extended player dataset from declared stages.
+
+One pipeline with six declared stages replaces the add_*/extend_* scripts,
+which each loaded, filtered and rewrote the dataset in their own way. Those
+scripts are now thin wrappers that run one of the LEGACY_BUILDS below.
+
+    fetch      LeagueDashPlayerStats per season (through the nba_cache disk cache)
+    convert    per-game season records for every player in a season
+    select     the season rows kept by the selection rules
+    merge      one player dict per selected player with their seasons, merged
+               into a base dataset when the build has one
+    aggregate  career averages, ordering and the optional player cap
+    publish    the output dataset JSON plus its .npz snapshot
+
+Every stage output is stored under server/.pipeline_cache keyed by a hash of
+its inputs (a content hash of the fetched frame for convert, the upstream keys,
+the rules and the base dataset's hash for later stages). A stage whose key is
+unchanged is loaded instead of recomputed, so editing a selection rule reruns
+select -> publish from cached season records in seconds instead of refetching
+every season. Finished-season fetches are checkpointed in a build journal: a
+season that keeps failing stops the run before select, and the next run only
+fetches the seasons that failed.
+
+By default the pipeline builds from scratch into DEFAULT_OUTPUT
+(server/extended_players.pipeline.json, untracked) rather than over the
+served server/extended_players.json; pass --output to replace that file.
+
+Usage: python dataset_pipeline.py [--rules rules.json] [--base dataset.json] [--output path]
+                                  [--force STAGE] [--dry-run]
+       python dataset_pipeline.py --build NAME [--output path] [--force STAGE] [--dry-run]
+"""
+
+import argparse
+import gzip
+import hashlib
+import json
+import os
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+# Server modules first: the nba_data.py next to this script is an outdated copy
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), 'server'))
+
+try:
+    from nba_api.stats.endpoints import leaguedashplayerstats
+    from nba_cache import current_season, fetch_endpoint
+    from nba_data import get_fetch_concurrency
+    from stat_rows import season_records
+    from career_stats import update_career_stats
+    from build_journal import BuildJournal, unit_key
+    from player_snapshot import file_sha256, load_players, save_players
+    from profiling import run_profiled
+    import pandas as pd
+    NBA_API_AVAILABLE = True
+except ImportError:
+    NBA_API_AVAILABLE = False
+    print("NBA API not available")
+    sys.exit(1)
+
+PIPELINE_CACHE_DIR = os.environ.get(
+    'NBA_PIPELINE_CACHE_DIR',
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), 'server', '.pipeline_cache')
+)
+
+# The dataset the server reads; legacy builds merge into it and publish over it
+DATASET_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'server', 'extended_players.json')
+
+# Where a plain pipeline run publishes unless --output says otherwise
+DEFAULT_OUTPUT = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'server',
+                              'extended_players.pipeline.json')
+
+# Bump a stage's version when its code changes so cached outputs are rebuilt
+STAGE_VERSIONS = {
+    'convert': 1,
+    'select': 2,
+    'merge': 2,
+    'aggregate': 1,
+}
+
+STAGES = ['fetch', 'convert', 'select', 'merge', 'aggregate', 'publish']
+
+HISTORICAL_SEASONS = [
+    '2009-10', '2008-09', '2007-08', '2006-07', '2005-06', '2004-05',
+    '2003-04', '2002-03', '2001-02', '2000-01', '1999-00', '1998-99',
+    '1997-98', '1996-97'
+]
+
+MODERN_SEASONS = [
+    '2024-25', '2023-24', '2022-23', '2021-22', '2020-21', '2019-20',
+    '2018-19', '2017-18', '2016-17', '2015-16', '2014-15', '2013-14',
+    '2012-13', '2011-12', '2010-11'
+]
+
+# Which season rows enter the dataset. Each rule reads its seasons in order
+# and filters one season at a time:
+#
+#   players          only these player ids
+#   base_players     'existing' / 'new': only players already in / missing
+#                    from the base dataset
+#   before_earliest  only seasons older than the player's earliest base season
+#   min_games        at least this many games
+#   min_points       at least this many points per game
+#   min_total_points at least this many points over the season
+#   rank_by, top     then only the `top` rows by 'points' per game or 'totalPoints'
+#   per_player       'first': one row per player, from the earliest season in
+#                    the rule's order; 'peak': the row with the most points per game
+#   max_players      stop once this many different players were kept
+#
+# A row is kept if any rule keeps it.
+SELECTION_RULES = [
+    # Modern rotation players: each season's top 40 scorers with 20+ games.
+    # This is the pipeline's own rule; nba_data's API fallback instead keeps
+    # every 5+ game row and caps the result at 500 players.
+    {'name': 'modern_top_scorers', 'seasons': MODERN_SEASONS, 'min_games': 20, 'rank_by': 'points', 'top': 40},
+    # add_historical_top15.py: top 15 by total points, 30+ games
+    {'name': 'historical_top15', 'seasons': HISTORICAL_SEASONS, 'min_games': 30, 'rank_by': 'totalPoints', 'top': 15},
+    # optimize_historical_dataset.py: top 15 by points per game, 40+ games
+    {'name': 'historical_top15_ppg', 'seasons': HISTORICAL_SEASONS, 'min_games': 40, 'rank_by': 'points', 'top': 15},
+    # add_nba_legends.py: top 30 scorers at 15+ PPG over 40+ games in peak years
+    {'name': 'peak_legends', 'seasons': ['2002-03', '2001-02', '2000-01', '1999-00', '1998-99', '1997-98'],
+     'min_games': 40, 'min_points': 15, 'rank_by': 'totalPoints', 'top': 30},
+]
+
+# extend_*_careers.py: once a player is selected, also keep their other
+# fetched seasons with at least this many games (None disables it)
+CAREER_EXTENSION = {'min_games': 20}
+
+# Keep only this many players by career points after aggregation (None keeps all)
+MAX_PLAYERS = None
+
+# Player ids extend_key_legends.py extends back to 1996
+KEY_LEGEND_IDS = [2544, 977, 1495, 708, 1718, 2199, 959, 2746, 201142, 101108, 201935, 201566]
+
+# Name fragments extend_prominent_careers.py always treats as prominent
+PROMINENT_NAMES = ['LeBron', 'Kobe', 'Duncan', 'Garnett', 'Pierce', 'Carter', 'Wade',
+                   'Nash', 'Nowitzki', 'Howard', 'Anthony', 'Paul', 'Parker',
+                   'Ginobili', 'Allen', 'Wallace', 'Gasol', 'Bosh']
+
+def prominent_player_ids(players):
+    """Players with only post-2010 seasons and a long or high-scoring career
+    (15+ seasons, 1000+ games, 20+ PPG or a PROMINENT_NAMES match)"""
+    prominent = []
+    for player in players:
+        seasons = player.get('availableSeasons', [])
+        is_prominent = (
+            len(seasons) >= 15
+            or player.get('gamesPlayed', 0) >= 1000
+            or player.get('points', 0) >= 20
+            or any(name in player['name'] for name in PROMINENT_NAMES)
+        )
+        if is_prominent and min(seasons, default='2024-25') >= '2010-11':
+            prominent.append(player['playerId'])
+    return prominent
+
+# What each legacy add_*/extend_* script does, as a pipeline build. Every
+# build reads the served dataset as its base and, unless include_base is
+# False, merges the selected seasons into it. 'rules' may be a function of
+# the base players.
+LEGACY_BUILDS = {
+    'add_historical_top15': {
+        'rules': [{'name': 'historical_top15', 'seasons': HISTORICAL_SEASONS, 'min_games': 30,
+                   'rank_by': 'totalPoints', 'top': 15}],
+    },
+    'optimize_historical_dataset': {
+        # Drop every pre-2010 season of the base, then add the top 15 by PPG
+        'base_from_season': '2010-11',
+        'rules': [{'name': 'historical_top15_ppg', 'seasons': HISTORICAL_SEASONS, 'min_games': 40,
+                   'rank_by': 'points', 'top': 15}],
+    },
+    'add_nba_legends': {
+        'rules': [{'name': 'peak_legends', 'seasons': ['2002-03', '2001-02', '2000-01', '1999-00', '1998-99', '1997-98'],
+                   'base_players': 'new', 'min_games': 40, 'min_points': 15, 'rank_by': 'totalPoints',
+                   'top': 30, 'per_player': 'first', 'max_players': 50}],
+    },
+    'create_historical_dataset': {
+        'rules': [{'name': 'historical_contributors', 'seasons': HISTORICAL_SEASONS,
+                   'min_games': 20, 'min_points': 8}],
+    },
+    'extend_key_legends': {
+        'rules': [{'name': 'key_legends', 'seasons': HISTORICAL_SEASONS, 'players': KEY_LEGEND_IDS,
+                   'base_players': 'existing', 'before_earliest': True, 'min_games': 10}],
+    },
+    'extend_prominent_careers': {
+        'rules': lambda base: [{'name': 'prominent_careers', 'seasons': HISTORICAL_SEASONS,
+                                'players': prominent_player_ids(base), 'base_players': 'existing',
+                                'min_games': 20}],
+    },
+    'extend_player_history': {
+        'rules': [{'name': 'player_history', 'seasons': HISTORICAL_SEASONS, 'base_players': 'existing',
+                   'min_games': 10, 'min_total_points': 3}],
+        'output': os.path.join(os.path.dirname(os.path.abspath(__file__)), 'extended_players.json'),
+    },
+    'add_historical_legends': {
+        # Only the peak season of each historical scorer missing from the dataset
+        'include_base': False,
+        'rules': [{'name': 'historical_legends', 'seasons': ['2004-05', '2003-04', '2002-03', '2001-02', '2000-01',
+                                                             '1999-00', '1998-99', '1997-98', '1996-97'],
+                   'base_players': 'new', 'min_games': 15, 'min_total_points': 6, 'rank_by': 'totalPoints',
+                   'top': 15, 'per_player': 'peak'}],
+        'output': os.path.join(os.path.dirname(os.path.abspath(__file__)), 'historical_legends.json'),
+    },
+}
+
+def digest(value):
+    """Stable SHA-256 of a JSON-serializable value"""
+    return hashlib.sha256(json.dumps(value, sort_keys=True).encode('utf-8')).hexdigest()
+
+def stage_key(stage, inputs):
+    """Cache key of a stage run: its name, code version and input description"""
+    return digest([stage, STAGE_VERSIONS.get(stage, 0), inputs])
+
+def stage_cache_path(stage, key):
+    """Location of a cached stage output"""
+    return os.path.join(PIPELINE_CACHE_DIR, stage, f"{key}.json.gz")
+
+def read_stage(stage, key):
+    """Cached stage output, or None when missing or unreadable"""
+    path = stage_cache_path(stage, key)
+    try:
+        with gzip.open(path, 'rt', encoding='utf-8') as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return None
+    except (OSError, EOFError, ValueError) as e:
+        print(f"Ignoring unreadable stage cache {path}: {e}", file=sys.stderr)
+        return None
+
+def write_stage(stage, key, value):
+    """Atomically store a stage output"""
+    path = stage_cache_path(stage, key)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with gzip.open(tmp_path, 'wt', encoding='utf-8') as f:
+        json.dump(value, f)
+    os.replace(tmp_path, path)
+
+class StageRunner:
+    """Runs stages through the cache and keeps a per-stage report"""
+
+    def __init__(self, force=()):
+        self.force = set(force)
+        self.report = {stage: {'ran': 0, 'cached': 0, 'seconds': 0.0} for stage in STAGES}
+        self.lock = threading.Lock()
+
+    def count(self, stage, outcome, seconds):
+        """Record one 'ran' or 'cached' run of a stage (safe from the fetch threads)"""
+        with self.lock:
+            self.report[stage][outcome] += 1
+            self.report[stage]['seconds'] += seconds
+
+    def run(self, stage, key, compute):
+        """Output of a stage for a key, recomputed only when not cached (or forced)"""
+        start = time.perf_counter()
+        value = None if stage in self.force else read_stage(stage, key)
+        outcome = 'cached'
+        if value is None:
+            value = compute()
+            write_stage(stage, key, value)
+            outcome = 'ran'
+        self.count(stage, outcome, time.perf_counter() - start)
+        return value
+
+    def print_report(self):
+        for stage in STAGES:
+            entry = self.report[stage]
+            print(f"  {stage:<10} ran {entry['ran']:>3}, cached {entry['cached']:>3}, {entry['seconds']:.2f}s")
+
+def pipeline_seasons(rules):
+    """Every season any rule reads, most recent first"""
+    seasons = {season for rule in rules for season in rule['seasons']}
+    return sorted(seasons, reverse=True)
+
+def fetch_season_frame(season):
+    """Raw regular season LeagueDashPlayerStats frame for one season"""
+    player_stats = fetch_endpoint(
+        leaguedashplayerstats.LeagueDashPlayerStats,
+        season=season,
+        season_type_all_star='Regular Season'
+    )
+    return player_stats.get_data_frames()[0]
+
+def frame_hash(df):
+    """Content hash of a fetched frame (values and column names)"""
+    content = pd.util.hash_pandas_object(df, index=False).to_numpy().tobytes()
+    return hashlib.sha256(content + ','.join(df.columns).encode('utf-8')).hexdigest()
+
+def convert_stage(runner, season, season_hash, load_frame):
+    """convert: [playerId, name, season record] rows for one season"""
+    key = stage_key('convert', [season, season_hash])
+    rows = runner.run('convert', key, lambda: [list(record) for record in season_records(load_frame(), season)])
+    return key, rows
+
+def fetch_stage(runner, journal, seasons, live_season):
+    """fetch + convert: {season: (convert key, rows)}, or None when a season failed.
+
+    Responses come from the nba_cache disk cache when fresh, so fetching is
+    cheap for finished seasons. Each finished season's frame hash is
+    checkpointed in the journal (the live season excepted, since it changes).
+    A season whose fetch fails, the live one included, is recorded there and
+    reported instead of aborting the other fetches. Requests are retried by
+    nba_throttle only; the journal makes one attempt per season.
+    """
+    def fetch_and_convert(season):
+        df = fetch_season_frame(season)
+        season_hash = frame_hash(df)
+        convert_stage(runner, season, season_hash, lambda: df)
+        return season_hash
+
+    def season_unit(season):
+        start = time.perf_counter()
+        unit = unit_key('LeagueDashPlayerStats', season)
+        checkpoint = season != live_season
+        replayed = checkpoint and journal.is_done(unit)
+        season_hash = journal.run(unit, lambda: fetch_and_convert(season), checkpoint=checkpoint)
+        runner.count('fetch', 'cached' if replayed else 'ran', time.perf_counter() - start)
+        return season_hash
+
+    with ThreadPoolExecutor(max_workers=get_fetch_concurrency()) as executor:
+        hashes = dict(zip(seasons, executor.map(season_unit, seasons)))
+    if not journal.complete():
+        print(journal.summary())
+        return None
+
+    # Cached by now; a replayed season only refetches if its convert cache was cleared
+    return {season: convert_stage(runner, season, season_hash, lambda: fetch_season_frame(season))
+            for season, season_hash in hashes.items()}
+
+def base_earliest_seasons(base_players):
+    """{playerId: earliest season} of the base dataset"""
+    return {player['playerId']: min((season['season'] for season in player['seasons']), default='9999-99')
+            for player in base_players}
+
+def row_matches(rule, row, base_earliest, players):
+    """Whether one converted row passes a rule's per-row filters"""
+    player_id, _, season_data = row
+    if players is not None and player_id not in players:
+        return False
+    membership = rule.get('base_players')
+    if membership == 'existing' and player_id not in base_earliest:
+        return False
+    if membership == 'new' and player_id in base_earliest:
+        return False
+    if rule.get('before_earliest') and season_data['season'] >= base_earliest.get(player_id, '9999-99'):
+        return False
+    games = season_data['gamesPlayed']
+    return (games >= rule.get('min_games', 0)
+            and season_data['points'] >= rule.get('min_points', 0)
+            and season_data['points'] * games >= rule.get('min_total_points', 0))
+
+def rule_rows(rule, rows, base_earliest=None):
+    """Rows one rule keeps from a season's converted rows"""
+    base_earliest = base_earliest or {}
+    players = set(rule['players']) if rule.get('players') is not None else None
+    kept = [row for row in rows if row_matches(rule, row, base_earliest, players)]
+    rank_by = rule.get('rank_by')
+    if rank_by == 'totalPoints':
+        kept.sort(key=lambda row: row[2]['points'] * row[2]['gamesPlayed'], reverse=True)
+    elif rank_by:
+        kept.sort(key=lambda row: row[2][rank_by], reverse=True)
+    if rule.get('top'):
+        kept = kept[:rule['top']]
+    return kept
+
+def apply_rule(rule, converted, base_earliest):
+    """{(playerId, season): row} one rule keeps across its seasons"""
+    per_player = rule.get('per_player')
+    max_players = rule.get('max_players')
+    chosen = {}
+    for season in rule['seasons']:
+        for row in rule_rows(rule, converted.get(season, []), base_earliest):
+            player_id = row[0]
+            if player_id not in chosen:
+                if max_players and len(chosen) >= max_players:
+                    continue
+                chosen[player_id] = []
+            elif per_player == 'first':
+                continue
+            chosen[player_id].append(row)
+
+    kept = {}
+    for player_id, rows in chosen.items():
+        if per_player == 'peak':
+            rows = [max(rows, key=lambda row: row[2]['points'])]
+        for row in rows:
+            kept[(player_id, row[2]['season'])] = row
+    return kept
+
+def select_rows(converted, rules, extension, base_earliest=None):
+    """select: season rows kept by any rule, plus career extensions"""
+    base_earliest = base_earliest or {}
+    selected = {}
+    for rule in rules:
+        selected.update(apply_rule(rule, converted, base_earliest))
+
+    if extension:
+        chosen_players = {player_id for player_id, _ in selected}
+        for season, rows in converted.items():
+            for row in rows:
+                if row[0] in chosen_players and row[2]['gamesPlayed'] >= extension.get('min_games', 0):
+                    selected.setdefault((row[0], season), row)
+
+    return [selected[key] for key in sorted(selected, key=lambda key: (key[0], key[1]))]
+
+def trim_base(base_players, from_season):
+    """Base players with only their seasons from `from_season` on; players left without any are dropped"""
+    trimmed = []
+    for player in base_players:
+        seasons = [season for season in player['seasons'] if season['season'] >= from_season]
+        if seasons:
+            trimmed.append(dict(player, seasons=seasons, availableSeasons=[s['season'] for s in seasons]))
+    return trimmed
+
+def merge_players(rows, base_players=()):
+    """merge: one player dict per player with their selected seasons, added to the base players.
+
+    A season a base player already has is kept as it is.
+    """
+    players = {}
+    known_seasons = {}
+    for player in base_players:
+        players[player['playerId']] = dict(player, seasons=list(player['seasons']))
+        known_seasons[player['playerId']] = {season['season'] for season in player['seasons']}
+    for player_id, player_name, season_data in rows:
+        if player_id not in players:
+            players[player_id] = {'playerId': player_id, 'name': player_name, 'seasons': []}
+            known_seasons[player_id] = set()
+        if season_data['season'] not in known_seasons[player_id]:
+            players[player_id]['seasons'].append(season_data)
+            known_seasons[player_id].add(season_data['season'])
+    return list(players.values())
+
+def aggregate_players(players, max_players):
+    """aggregate: career averages, sorted by career points, optionally capped"""
+    update_career_stats(players)
+    players.sort(key=lambda x: x.get('points', 0) * x.get('gamesPlayed', 0), reverse=True)
+    if max_players:
+        players = players[:max_players]
+    return players
+
+def publish_marker_path(dataset_path):
+    """Marker recording what was last published to a dataset path"""
+    name = hashlib.sha256(os.path.abspath(dataset_path).encode('utf-8')).hexdigest()[:16]
+    return os.path.join(PIPELINE_CACHE_DIR, 'publish', f"{name}.json")
+
+def publish_stage(runner, key, players, dataset_path, dry_run=False):
+    """publish: rewrite the dataset only when its aggregate input changed"""
+    start = time.perf_counter()
+    marker_path = publish_marker_path(dataset_path)
+    try:
+        with open(marker_path, 'r') as f:
+            marker = json.load(f)
+    except (FileNotFoundError, ValueError):
+        marker = {}
+
+    up_to_date = (
+        'publish' not in runner.force
+        and marker.get('key') == key
+        and os.path.exists(dataset_path)
+        and marker.get('sha256') == file_sha256(dataset_path)
+    )
+    if not (up_to_date or dry_run):
+        save_players(players, dataset_path)
+        os.makedirs(os.path.dirname(marker_path), exist_ok=True)
+        with open(marker_path, 'w') as f:
+            json.dump({'key': key, 'sha256': file_sha256(dataset_path), 'players': len(players),
+                       'path': os.path.abspath(dataset_path)}, f)
+    runner.count('publish', 'cached' if up_to_date or dry_run else 'ran', time.perf_counter() - start)
+    return not up_to_date and not dry_run
+
+def run_pipeline(rules=None, extension=CAREER_EXTENSION, max_players=MAX_PLAYERS,
+                 dataset_path=DEFAULT_OUTPUT, force=(), dry_run=False,
+                 base_path=None, base_from_season=None, include_base=True):
+    """Run every stage, reusing cached outputs whose inputs are unchanged.
+
+    With base_path the selected seasons are merged into that dataset (after
+    dropping its seasons before base_from_season); rules can then refer to its
+    players. With include_base=False the base only steers selection and the
+    output holds just the selected players. Returns the published player list,
+    or None when a season could not be fetched.
+    """
+    rules = SELECTION_RULES if rules is None else rules
+    runner = StageRunner(force)
+
+    base_players, base_hash = [], None
+    if base_path:
+        base_players = load_players(base_path)
+        base_hash = file_sha256(base_path)
+        if base_from_season:
+            base_players = trim_base(base_players, base_from_season)
+    if callable(rules):
+        rules = rules(base_players)
+
+    seasons = pipeline_seasons(rules)
+    live_season = current_season()
+    journal = BuildJournal('dataset_pipeline', params={'convert': STAGE_VERSIONS['convert']})
+
+    print(f"Fetching {len(seasons)} seasons (live season {live_season})...")
+    fetched = fetch_stage(runner, journal, seasons, live_season)
+    if fetched is None:
+        runner.print_report()
+        return None
+    convert_keys = {season: key for season, (key, _) in fetched.items()}
+    converted = {season: rows for season, (_, rows) in fetched.items()}
+
+    base_inputs = [base_hash, base_from_season]
+    select_key = stage_key('select', [convert_keys, rules, extension, base_inputs])
+    selected = runner.run('select', select_key,
+                          lambda: select_rows(converted, rules, extension, base_earliest_seasons(base_players)))
+
+    merge_key = stage_key('merge', [select_key, base_inputs, include_base])
+    players = runner.run('merge', merge_key,
+                         lambda: merge_players(selected, base_players if include_base else ()))
+
+    aggregate_key = stage_key('aggregate', [merge_key, max_players])
+    players = runner.run('aggregate', aggregate_key, lambda: aggregate_players(players, max_players))
+
+    published = publish_stage(runner, aggregate_key, players, dataset_path, dry_run)
+    journal.finish()
+
+    season_total = sum(len(player['seasons']) for player in players)
+    action = 'Published' if published else 'Dataset unchanged:' if not dry_run else 'Dry run, not published:'
+    print(f"{action} {len(players)} players, {season_total} seasons -> {dataset_path}")
+    runner.print_report()
+    return players
+
+def run_legacy_build(name, dataset_path=None, force=(), dry_run=False):
+    """Run one of LEGACY_BUILDS against the served dataset"""
+    build = LEGACY_BUILDS[name]
+    return run_pipeline(
+        build['rules'], extension=None, max_players=None,
+        dataset_path=dataset_path or build.get('output', DATASET_PATH),
+        force=force, dry_run=dry_run, base_path=DATASET_PATH,
+        base_from_season=build.get('base_from_season'), include_base=build.get('include_base', True)
+    )
+
+def run_legacy_main(name):
+    """Parse a wrapper script's options and run its build"""
+    parser = argparse.ArgumentParser(description=f"Run the '{name}' build of dataset_pipeline.py")
+    parser.add_argument('--force', action='append', default=[], choices=STAGES,
+                        help="Recompute a stage even when cached (repeatable)")
+    parser.add_argument('--dry-run', action='store_true', help="Run every stage but do not publish")
+    parser.add_argument('--output', help="Dataset JSON to publish (default: the script's usual target)")
+    args = parser.parse_args()
+    return run_legacy_build(name, args.output, args.force, args.dry_run)
+
+def legacy_main(name):
+    """Entry point of the add_*/extend_* wrapper scripts"""
+    # Profiled like main(): run_profiled takes --profile out of sys.argv before parsing
+    return run_profiled(run_legacy_main, name)
+
+def load_rules(path):
+    """Selection rules from a JSON file: a list of rules, or an object with
+    "rules" and optionally "careerExtension" and "maxPlayers"."""
+    with open(path, 'r') as f:
+        config = json.load(f)
+    if isinstance(config, list):
+        return config, CAREER_EXTENSION, MAX_PLAYERS
+    return (config['rules'], config.get('careerExtension', CAREER_EXTENSION),
+            config.get('maxPlayers', MAX_PLAYERS))
+
+def main():
+    parser = argparse.ArgumentParser(description="Incrementally build the extended player dataset")
+    parser.add_argument('--rules', help="JSON file overriding SELECTION_RULES")
+    parser.add_argument('--build', choices=sorted(LEGACY_BUILDS),
+                        help="Run what one of the old add_*/extend_* scripts did")
+    parser.add_argument('--base', help="Dataset JSON to merge the selected seasons into")
+    parser.add_argument('--force', action='append', default=[], choices=STAGES,
+                        help="Recompute a stage even when cached (repeatable)")
+    parser.add_argument('--dry-run', action='store_true', help="Run every stage but do not publish")
+    parser.add_argument('--output', help=f"Dataset JSON to publish (default {os.path.relpath(DEFAULT_OUTPUT)}; "
+                                         f"pass {os.path.relpath(DATASET_PATH)} to replace the served dataset)")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    if args.build:
+        run_legacy_build(args.build, args.output, args.force, args.dry_run)
+    else:
+        rules, extension, max_players = SELECTION_RULES, CAREER_EXTENSION, MAX_PLAYERS
+        if args.rules:
+            rules, extension, max_players = load_rules(args.rules)
+        run_pipeline(rules, extension, max_players, args.output or DEFAULT_OUTPUT, args.force,
+                     args.dry_run, base_path=args.base)
+    print(f"Pipeline finished in {time.perf_counter() - start:.2f}s")
+
+if __name__ == "__main__":
+    run_profiled(main)
@@ -0,0 +1,306 @@
+#!/usr/bin/env python3
+"""Generate scaled synthetic copies of server/extended_players.json.
+
+The real dataset has ~3,800 player-seasons, too few for slow paths to show
+up. This script fits simple distributions to it and samples new players at
+10x, 100x and 1000x its size (~38k to ~3.8M player-seasons):
+
+- career length, final season and games played: empirical distributions
+- per-game stats: a player "talent" vector drawn from the covariance of the
+  real players' career means, plus per-season noise from the covariance of
+  their season-to-season deviations, clipped to the observed range. Counting
+  stats are rounded to whole season totals, percentages to three decimals.
+- team: the real team frequencies, changing between seasons at the observed rate
+- names: real first and last names recombined
+
+Career fields come from career_stats.aggregate_careers, as for the real
+dataset, and the same share of players carries the extended career fields.
+Each scale is written in the dataset's JSON shape and/or as the columnar
+.npz snapshot (player_snapshot layout) next to it, so load_players() and the
+snapshot/store benchmarks work on it unchanged.
+
+Usage: python generate_synthetic_dataset.py [--scales 10 100 1000] [--formats json npz]
+                                            [--seed 0] [--output-dir server/synthetic]
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import sys
+import time
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), 'server'))
+
+import numpy as np
+
+from career_stats import aggregate_careers
+from player_snapshot import (
+    SNAPSHOT_VERSION, SEASON_KEYS, SEASON_STRING_FIELDS, CAREER_KEYS, BASE_CAREER_KEYS,
+    EXTENDED_CAREER_FIELDS, EXTENDED_PLAYER_KEYS, load_players, offsets, snapshot_path,
+    source_stamp, stamp_arrays
+)
+from profiling import run_profiled
+
+DATASET_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'server', 'extended_players.json')
+OUTPUT_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'server', 'synthetic')
+
+DEFAULT_SCALES = [10, 100, 1000]
+
+# Synthetic ids start well above the real NBA player ids
+SYNTHETIC_ID_BASE = 10000000
+
+# Players converted to dicts at a time while writing JSON
+JSON_CHUNK_PLAYERS = 5000
+
+# Sampled per season from the fitted talent + noise model
+STAT_FIELDS = [field for field in SEASON_KEYS if field not in SEASON_STRING_FIELDS and field != 'gamesPlayed']
+
+# Per-game stats stored as season total / games played
+TOTAL_FIELDS = [
+    'points', 'assists', 'rebounds', 'steals', 'blocks', 'turnovers',
+    'fieldGoalAttempts', 'threePointAttempts', 'freeThrowAttempts', 'plusMinus'
+]
+
+# Stored with three decimals, as the API reports them
+ROUNDED_FIELDS = ['fieldGoalPercentage', 'threePointPercentage', 'freeThrowPercentage', 'winPercentage']
+
+def season_label(start_year):
+    """'2024-25' style label for a season starting in start_year"""
+    return f"{start_year}-{(start_year + 1) % 100:02d}"
+
+def frequencies(values):
+    """(unique values, probabilities) of a sequence"""
+    labels, counts = np.unique(np.asarray(values), return_counts=True)
+    return labels, counts / counts.sum()
+
+def fit_model(players):
+    """Distributions of the real dataset used to sample synthetic players"""
+    seasons = [season for player in players for season in player['seasons']]
+    lengths = np.array([len(player['seasons']) for player in players])
+    owners = np.repeat(np.arange(len(players)), lengths)
+
+    stats = np.array([[season[field] for field in STAT_FIELDS] for season in seasons], dtype='float64')
+    player_means = np.zeros((len(players), len(STAT_FIELDS)))
+    np.add.at(player_means, owners, stats)
+    player_means /= lengths[:, None]
+    deviations = stats - player_means[owners]
+
+    # Share of consecutive seasons a player stays on the same team
+    same_team = [newer['team'] == older['team']
+                 for player in players
+                 for newer, older in zip(player['seasons'], player['seasons'][1:])]
+
+    names = [player['name'].split(' ', 1) for player in players]
+    return {
+        'careerLengths': lengths,
+        'finalYears': np.array([int(max(s['season'] for s in player['seasons'])[:4]) for player in players]),
+        'gamesPlayed': np.array([season['gamesPlayed'] for season in seasons]),
+        'talentMean': player_means.mean(axis=0),
+        'talentCov': np.cov(player_means, rowvar=False),
+        'seasonCov': np.cov(deviations, rowvar=False),
+        'statMin': stats.min(axis=0),
+        'statMax': stats.max(axis=0),
+        'teams': frequencies([season['team'] for season in seasons]),
+        'positions': frequencies([player['position'] for player in players]),
+        'teamChangeRate': 1.0 - (np.mean(same_team) if same_team else 1.0),
+        'extendedShare': np.mean([set(player) == EXTENDED_PLAYER_KEYS for player in players]),
+        'firstNames': np.array([name[0] for name in names]),
+        'lastNames': np.array([name[1] if len(name) > 1 else name[0] for name in names]),
+    }
+
+def sample_teams(model, starts, row_count, rng):
+    """Team per season row, kept from one season to the next unless the player moves"""
+    teams, weights = model['teams']
+    candidates = rng.choice(len(teams), size=row_count, p=weights)
+    moves = rng.random(row_count) < model['teamChangeRate']
+    moves[starts] = True
+    # Each row takes the candidate of the latest move at or before it
+    source = np.maximum.accumulate(np.where(moves, np.arange(row_count), 0))
+    return teams[candidates[source]]
+
+def generate_columns(model, player_count, rng):
+    """Season and player columns for player_count synthetic players.
+
+    Season rows are grouped by player, most recent season first, matching
+    the nesting order of extended_players.json.
+    """
+    lengths = rng.choice(model['careerLengths'], size=player_count)
+    final_years = rng.choice(model['finalYears'], size=player_count)
+    starts = offsets(lengths)
+    row_count = int(lengths.sum())
+    owners = np.repeat(np.arange(player_count), lengths)
+
+    # Year of each row: final year for the first row of a career, then one less per row
+    position_in_career = np.arange(row_count) - starts[owners]
+    years = final_years[owners] - position_in_career
+
+    talent = rng.multivariate_normal(model['talentMean'], model['talentCov'], size=player_count, method='eigh')
+    noise = rng.multivariate_normal(np.zeros(len(STAT_FIELDS)), model['seasonCov'], size=row_count, method='eigh')
+    stats = np.clip(talent[owners] + noise, model['statMin'], model['statMax'])
+
+    games = rng.choice(model['gamesPlayed'], size=row_count).astype('int64')
+    seasons = {
+        'season': np.array([season_label(year) for year in range(years.min(), years.max() + 1)])[years - years.min()],
+        'team': sample_teams(model, starts, row_count, rng),
+        'position': np.repeat(rng.choice(model['positions'][0], size=player_count, p=model['positions'][1]), lengths),
+        'gamesPlayed': games,
+    }
+    for index, field in enumerate(STAT_FIELDS):
+        values = stats[:, index]
+        if field in TOTAL_FIELDS:
+            values = np.round(values * games) / games
+        elif field in ROUNDED_FIELDS:
+            values = np.round(values, 3)
+        seasons[field] = values
+
+    first = rng.choice(model['firstNames'], size=player_count)
+    last = rng.choice(model['lastNames'], size=player_count)
+    players = {
+        'playerId': SYNTHETIC_ID_BASE + np.arange(player_count, dtype='int64'),
+        'name': np.char.add(np.char.add(first, ' '), last),
+        'hasExtendedFields': rng.random(player_count) < model['extendedShare'],
+        'seasonStart': starts,
+        'seasonCount': lengths,
+    }
+    return players, seasons
+
+def career_columns(players, seasons):
+    """Career fields per player, computed like the real dataset's"""
+    table = {column: seasons[column] for column in seasons}
+    table['playerId'] = np.repeat(players['playerId'], players['seasonCount'])
+    careers = aggregate_careers(table)
+    # Ids ascend and seasons are already newest first, so the careers line up with players
+    assert np.array_equal(careers['order'], np.arange(len(careers['order'])))
+
+    columns = {}
+    for field in CAREER_KEYS:
+        if field in EXTENDED_CAREER_FIELDS:
+            # Extended players carry their latest season's values, zero otherwise
+            latest = seasons[field][players['seasonStart']]
+            columns[field] = np.where(players['hasExtendedFields'], latest, 0.0)
+        else:
+            columns[field] = np.asarray(careers[field])
+    return columns
+
+def snapshot_arrays(players, seasons, careers, source_sha256=''):
+    """The player_snapshot arrays for the generated columns, built without player dicts"""
+    arrays = {
+        'version': np.array(SNAPSHOT_VERSION),
+        'sourceSha256': np.array(source_sha256),
+    }
+    for field in SEASON_KEYS:
+        arrays[f'seasons.{field}'] = seasons[field]
+    for field in ['playerId', 'name', 'hasExtendedFields']:
+        arrays[f'players.{field}'] = players[field]
+    for field in CAREER_KEYS:
+        arrays[f'players.{field}'] = careers[field]
+    arrays['players.seasonStart'] = players['seasonStart']
+    arrays['players.seasonCount'] = players['seasonCount']
+    # availableSeasons lists every season of the player, in the same order
+    arrays['availableSeasons'] = seasons['season']
+    arrays['players.availableStart'] = players['seasonStart']
+    arrays['players.availableCount'] = players['seasonCount']
+    return arrays
+
+def iter_players(players, seasons, careers, chunk=JSON_CHUNK_PLAYERS):
+    """Player dicts in the extended_players.json shape, converted a chunk at a time"""
+    for lo in range(0, len(players['playerId']), chunk):
+        hi = min(lo + chunk, len(players['playerId']))
+        row_lo = int(players['seasonStart'][lo])
+        row_hi = int(players['seasonStart'][hi - 1] + players['seasonCount'][hi - 1])
+        season_values = [seasons[field][row_lo:row_hi].tolist() for field in SEASON_KEYS]
+        season_dicts = [dict(zip(SEASON_KEYS, row)) for row in zip(*season_values)]
+        career_rows = zip(*[careers[field][lo:hi].tolist() for field in CAREER_KEYS])
+
+        for player_id, name, extended, start, count, career in zip(
+                players['playerId'][lo:hi].tolist(), players['name'][lo:hi].tolist(),
+                players['hasExtendedFields'][lo:hi].tolist(), players['seasonStart'][lo:hi].tolist(),
+                players['seasonCount'][lo:hi].tolist(), career_rows):
+            player_seasons = season_dicts[start - row_lo:start - row_lo + count]
+            player = {'playerId': player_id, 'name': name, 'seasons': player_seasons}
+            career = dict(zip(CAREER_KEYS, career))
+            keys = CAREER_KEYS if extended else BASE_CAREER_KEYS
+            player.update((key, career[key]) for key in keys)
+            player['availableSeasons'] = [season['season'] for season in player_seasons]
+            yield player
+
+def write_json(players, path):
+    """Stream players to path byte-for-byte as json.dumps(players, indent=2); returns its SHA-256"""
+    digest = hashlib.sha256()
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    try:
+        with open(tmp_path, 'wb') as f:
+            separator = b'[\n  '
+            for player in players:
+                chunk = separator + json.dumps(player, indent=2).replace('\n', '\n  ').encode('utf-8')
+                digest.update(chunk)
+                f.write(chunk)
+                separator = b',\n  '
+            tail = b'\n]' if separator != b'[\n  ' else b'[]'
+            digest.update(tail)
+            f.write(tail)
+        os.replace(tmp_path, path)
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+    return digest.hexdigest()
+
+def write_npz(arrays, path):
+    """Write snapshot arrays atomically"""
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    try:
+        with open(tmp_path, 'wb') as f:
+            np.savez(f, **arrays)
+        os.replace(tmp_path, path)
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+def synthetic_path(output_dir, scale):
+    """JSON path of one scale; its snapshot is snapshot_path() of it"""
+    return os.path.join(output_dir, f"extended_players.x{scale}.json")
+
+def generate_scale(model, player_count, scale, output_dir, formats, seed):
+    """Generate and write one scaled dataset; returns the number of player-seasons"""
+    start = time.perf_counter()
+    rng = np.random.default_rng([seed, scale])
+    players, seasons = generate_columns(model, player_count, rng)
+    careers = career_columns(players, seasons)
+    generated = time.perf_counter() - start
+
+    json_path = synthetic_path(output_dir, scale)
+    source_sha256 = ''
+    if 'json' in formats:
+        source_sha256 = write_json(iter_players(players, seasons, careers), json_path)
+    if 'npz' in formats:
+        arrays = snapshot_arrays(players, seasons, careers, source_sha256)
+        if 'json' in formats:
+            stamp_arrays(arrays, source_stamp(json_path))
+        write_npz(arrays, snapshot_path(json_path))
+
+    rows = len(seasons['season'])
+    print(f"x{scale}: {player_count} players, {rows} player-seasons "
+          f"(generated in {generated:.1f}s, written in {time.perf_counter() - start - generated:.1f}s)")
+    return rows
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate scaled synthetic player datasets")
+    parser.add_argument('--scales', type=int, nargs='+', default=DEFAULT_SCALES,
+                        help="Multiples of the real player count")
+    parser.add_argument('--formats', nargs='+', choices=['json', 'npz'], default=['json', 'npz'])
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--source', default=DATASET_PATH, help="Dataset the distributions are fitted to")
+    parser.add_argument('--output-dir', default=OUTPUT_DIR)
+    args = parser.parse_args()
+
+    real_players = load_players(args.source)
+    model = fit_model(real_players)
+    os.makedirs(args.output_dir, exist_ok=True)
+    print(f"Fitted {len(STAT_FIELDS)} stats on {len(real_players)} players "
+          f"({int(model['careerLengths'].sum())} player-seasons)")
+
+    for scale in args.scales:
+        generate_scale(model, len(real_players) * scale, scale, args.output_dir, args.formats, args.seed)
+
+if __name__ == "__main__":
+    run_profiled(main)
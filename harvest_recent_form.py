@@ -0,0 +1,184 @@
+#!/usr/bin/env python3
+"""Harvest last-N-games dashboards for every active player in the dataset.
+
+Runs PlayerDashboardByLastNGames concurrently for each player with a season
+matching the target season (the newest season in extended_players.json by
+default). Requests go through fetch_endpoint, so each player's response is
+kept in the nba_cache disk cache, sent under the shared nba_throttle rate
+limit and reuses the pooled keep-alive session. Responses are parsed in the
+endpoint's lean mode, straight into arrays of the needed columns.
+
+The six data sets of every player are flattened into one compact columnar
+table, server/recent_form.npz:
+
+- playerId (int64), dataSet (int8 index into dataSets), groupValue (str):
+  one row per data set row ("Last 5 Games", "1-10", ...)
+- stats: float32 matrix of the dashboard's stat columns (no *_RANK), named by columns
+- season, fetchedAt, failedPlayerIds and version metadata
+
+Usage: python harvest_recent_form.py [--season 2024-25] [--workers N] [--limit N] [--output path]
+"""
+
+import argparse
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), 'server'))
+
+try:
+    from nba_cache import fetch_endpoint
+    from player_snapshot import load_players
+    from playerdashboardbylastngames import LEAN_DEFAULT_COLUMNS, PlayerDashboardByLastNGames
+    from profiling import run_profiled
+    import numpy as np
+    NBA_API_AVAILABLE = True
+except ImportError:
+    NBA_API_AVAILABLE = False
+    print("NBA API not available")
+    sys.exit(1)
+
+RECENT_FORM_VERSION = 2
+
+DATASET_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'server', 'extended_players.json')
+OUTPUT_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'server', 'recent_form.npz')
+
+# Response data set names, in table code order
+DATA_SETS = [
+    'OverallPlayerDashboard',
+    'Last5PlayerDashboard',
+    'Last10PlayerDashboard',
+    'Last15PlayerDashboard',
+    'Last20PlayerDashboard',
+    'GameNumberPlayerDashboard',
+]
+
+# Counting and rate columns; the *_RANK, CFID and CFPARAMS columns are never parsed
+STAT_COLUMNS = LEAN_DEFAULT_COLUMNS
+
+def default_workers():
+    """Concurrent player requests; the shared rate limit still caps throughput"""
+    try:
+        return max(1, int(os.environ.get('NBA_FETCH_CONCURRENCY', 4)))
+    except ValueError:
+        return 4
+
+def active_players(players, season=None):
+    """(season, [(playerId, name)]) for players with a row in the target season"""
+    if season is None:
+        season = max(s['season'] for player in players for s in player['seasons'])
+    active = [(player['playerId'], player['name']) for player in players
+              if any(s['season'] == season for s in player['seasons'])]
+    return season, active
+
+def harvest_player(player_id, season):
+    """Flattened rows of all six dashboards for one player, parsed in lean mode"""
+    endpoint = fetch_endpoint(PlayerDashboardByLastNGames, player_id=player_id, season=season,
+                              columns=STAT_COLUMNS)
+    group_values = []
+    data_set_codes = []
+    matrices = []
+    for code, name in enumerate(DATA_SETS):
+        data_set = endpoint.lean_data_sets.get(name)
+        if data_set is None:
+            continue
+        groups = data_set['GROUP_VALUE'].tolist()
+        group_values.extend(groups)
+        data_set_codes.extend([code] * len(groups))
+        matrices.append(np.column_stack([data_set[column] for column in STAT_COLUMNS]).astype('float32'))
+    if not matrices:
+        return [], [], np.empty((0, len(STAT_COLUMNS)), dtype='float32')
+    return group_values, data_set_codes, np.vstack(matrices)
+
+def harvest_recent_form(players, season, workers=None):
+    """Fetch every player concurrently; returns the table arrays"""
+    workers = workers or default_workers()
+    results = {}
+    failed = []
+    start = time.perf_counter()
+
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        futures = {executor.submit(harvest_player, player_id, season): (player_id, name)
+                   for player_id, name in players}
+        for done, future in enumerate(as_completed(futures), 1):
+            player_id, name = futures[future]
+            try:
+                results[player_id] = future.result()
+            except Exception as e:
+                failed.append(player_id)
+                print(f"Error fetching recent form for {name} ({player_id}): {e}", file=sys.stderr)
+            if done % 50 == 0 or done == len(futures):
+                elapsed = time.perf_counter() - start
+                print(f"  {done}/{len(futures)} players in {elapsed:.1f}s", file=sys.stderr)
+
+    # Keep the dataset's player order so the table is stable between runs
+    player_ids = []
+    data_set_codes = []
+    group_values = []
+    matrices = []
+    for player_id, _ in players:
+        if player_id not in results:
+            continue
+        groups, codes, stats = results[player_id]
+        player_ids.extend([player_id] * len(groups))
+        data_set_codes.extend(codes)
+        group_values.extend(groups)
+        matrices.append(stats)
+
+    return {
+        'version': np.array(RECENT_FORM_VERSION),
+        'season': np.array(season),
+        'fetchedAt': np.array(time.time()),
+        'dataSets': np.array(DATA_SETS),
+        'columns': np.array(STAT_COLUMNS),
+        'playerId': np.array(player_ids, dtype='int64'),
+        'dataSet': np.array(data_set_codes, dtype='int8'),
+        'groupValue': np.array(group_values, dtype='U'),
+        'stats': np.vstack(matrices) if matrices else np.empty((0, len(STAT_COLUMNS)), dtype='float32'),
+        'failedPlayerIds': np.array(sorted(failed), dtype='int64'),
+    }
+
+def write_recent_form(arrays, path=OUTPUT_PATH):
+    """Write the table atomically"""
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    try:
+        with open(tmp_path, 'wb') as f:
+            np.savez(f, **arrays)
+        os.replace(tmp_path, path)
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+def load_recent_form(path=OUTPUT_PATH):
+    """Load the table as a dict of arrays"""
+    with np.load(path, allow_pickle=False) as table:
+        arrays = {name: table[name] for name in table.files}
+    if int(arrays['version']) != RECENT_FORM_VERSION:
+        raise ValueError(f"Unsupported recent form version {int(arrays['version'])} in {path}")
+    return arrays
+
+def main():
+    parser = argparse.ArgumentParser(description="Harvest last-N-games dashboards for active players")
+    parser.add_argument('--season', help="Season to harvest (default: newest season in the dataset)")
+    parser.add_argument('--workers', type=int, help="Concurrent requests (default NBA_FETCH_CONCURRENCY or 4)")
+    parser.add_argument('--limit', type=int, help="Only harvest the first N active players")
+    parser.add_argument('--output', default=OUTPUT_PATH, help="Table to write")
+    args = parser.parse_args()
+
+    season, players = active_players(load_players(DATASET_PATH), args.season)
+    if args.limit:
+        players = players[:args.limit]
+
+    print(f"Harvesting recent form for {len(players)} active players in {season}...")
+    start = time.perf_counter()
+    arrays = harvest_recent_form(players, season, args.workers)
+    write_recent_form(arrays, args.output)
+
+    harvested = len(np.unique(arrays['playerId']))
+    print(f"Wrote {args.output}: {harvested} players, {len(arrays['playerId'])} rows "
+          f"in {time.perf_counter() - start:.1f}s ({len(arrays['failedPlayerIds'])} failed)")
+    if len(arrays['failedPlayerIds']):
+        sys.exit(1)
+
+if __name__ == "__main__":
+    run_profiled(main)
@@ -1,8 +1,20 @@
 #!/usr/bin/env python3
 import csv
 import os
-import psycopg2
-from psycopg2.extras import execute_values
+import sys
+from psycopg2.pool import ThreadedConnectionPool
+
+from pg_bulk import replace_tables_contents
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), 'server'))
+from profiling import run_profiled
+
+PLAYER_AWARDS_CSV = 'attached_assets/Player Award Shares.csv'
+ALL_STAR_CSV = 'attached_assets/All-Star Selections.csv'
+END_OF_SEASON_TEAMS_CSV = 'attached_assets/End of Season Teams (Voting).csv'
+
+PLAYER_AWARDS_COLUMNS = ['player_id', 'player_name', 'season', 'award', 'winner', 'share', 'pts_won', 'pts_max', 'first', 'team', 'age']
+ALL_STAR_COLUMNS = ['player_name', 'team', 'conference', 'season', 'replaced']
+END_OF_SEASON_TEAMS_COLUMNS = ['season', 'type', 'team', 'position', 'player_name', 'age', 'team_abbr', 'pts_won', 'pts_max', 'share']
 
 def safe_float(value):
     """Safely convert value to float, handling 'NA' and empty values"""
@@ -22,128 +34,92 @@ def safe_int(value):
     except ValueError:
         return None
 
-def get_db_connection():
-    """Get database connection using environment variable"""
-    return psycopg2.connect(os.environ['DATABASE_URL'])
+def safe_text(value):
+    """Text value with 'NA' mapped to None"""
+    return value if value != 'NA' else None
 
-def import_player_awards():
-    """Import player awards data from CSV"""
-    print("Importing player awards data...")
-    
-    with get_db_connection() as conn:
-        with conn.cursor() as cur:
-            # Clear existing data
-            cur.execute("DELETE FROM player_awards")
-            
-            awards_data = []
-            with open('attached_assets/Player Award Shares.csv', 'r') as f:
-                reader = csv.DictReader(f)
-                for row in reader:
-                    awards_data.append((
-                        safe_int(row['player_id']),
-                        row['player'],
-                        row['season'],
-                        row['award'],
-                        row['winner'],
-                        safe_float(row['share']),
-                        safe_float(row['pts_won']),
-                        safe_float(row['pts_max']),
-                        safe_float(row['first']),
-                        row['tm'] if row['tm'] != 'NA' else None,
-                        safe_int(row['age'])
-                    ))
-            
-            # Insert awards data
-            execute_values(
-                cur,
-                """INSERT INTO player_awards 
-                   (player_id, player_name, season, award, winner, share, pts_won, pts_max, first, team, age)
-                   VALUES %s""",
-                awards_data
-            )
-            
-            print(f"Imported {len(awards_data)} player award records")
+def csv_records(path):
+    """Stream (row, column index) pairs from a CSV without loading the whole file"""
+    with open(path, 'r', newline='') as f:
+        reader = csv.reader(f)
+        index = {name: i for i, name in enumerate(next(reader))}
+        for row in reader:
+            yield row, index
 
-def import_all_star_selections():
-    """Import All-Star selections data from CSV"""
-    print("Importing All-Star selections data...")
-    
-    with get_db_connection() as conn:
-        with conn.cursor() as cur:
-            # Clear existing data
-            cur.execute("DELETE FROM all_star_selections")
-            
-            allstar_data = []
-            with open('attached_assets/All-Star Selections.csv', 'r') as f:
-                reader = csv.DictReader(f)
-                for row in reader:
-                    allstar_data.append((
-                        row['player'],
-                        row['team'],
-                        row['lg'],  # This appears to be conference/league
-                        row['season'],
-                        row['replaced']
-                    ))
-            
-            # Insert All-Star data
-            execute_values(
-                cur,
-                """INSERT INTO all_star_selections 
-                   (player_name, team, conference, season, replaced)
-                   VALUES %s""",
-                allstar_data
-            )
-            
-            print(f"Imported {len(allstar_data)} All-Star selection records")
+def player_award_rows(path=PLAYER_AWARDS_CSV):
+    """player_awards rows from the award shares CSV"""
+    for row, col in csv_records(path):
+        yield (
+            safe_int(row[col['player_id']]),
+            row[col['player']],
+            row[col['season']],
+            row[col['award']],
+            row[col['winner']],
+            safe_float(row[col['share']]),
+            safe_float(row[col['pts_won']]),
+            safe_float(row[col['pts_max']]),
+            safe_float(row[col['first']]),
+            safe_text(row[col['tm']]),
+            safe_int(row[col['age']])
+        )
+
+def all_star_rows(path=ALL_STAR_CSV):
+    """all_star_selections rows from the All-Star CSV"""
+    for row, col in csv_records(path):
+        yield (
+            row[col['player']],
+            row[col['team']],
+            row[col['lg']],  # This appears to be conference/league
+            row[col['season']],
+            row[col['replaced']]
+        )
 
-def import_end_of_season_teams():
-    """Import end of season teams data from CSV"""
-    print("Importing end of season teams data...")
+def end_of_season_team_rows(path=END_OF_SEASON_TEAMS_CSV):
+    """end_of_season_teams rows from the voting CSV"""
+    for row, col in csv_records(path):
+        # Map the CSV column names to our schema
+        yield (
+            row[col['season']],
+            row[col['type']],
+            row[col['number_tm']],  # This is the team (1st, 2nd, 3rd, etc.)
+            safe_text(row[col['position']]),
+            row[col['player']],
+            safe_int(row[col['age']]),
+            safe_text(row[col['tm']]),
+            safe_int(row[col['pts_won']]),  # integer columns; COPY won't cast "198.0"
+            safe_int(row[col['pts_max']]),
+            safe_float(row[col['share']])
+        )
+
+def get_db_pool():
+    """Connection pool with one connection per table loaded in parallel"""
+    return ThreadedConnectionPool(1, 3, os.environ['DATABASE_URL'])
+
+def import_awards(pool):
+    """Stream all three award CSVs into staging tables in parallel, then swap them in together"""
+    print("Importing player awards, All-Star selections and end of season teams...")
+    
+    counts = replace_tables_contents(pool, {
+        'player_awards': (PLAYER_AWARDS_COLUMNS, player_award_rows()),
+        'all_star_selections': (ALL_STAR_COLUMNS, all_star_rows()),
+        'end_of_season_teams': (END_OF_SEASON_TEAMS_COLUMNS, end_of_season_team_rows()),
+    })
     
-    with get_db_connection() as conn:
-        with conn.cursor() as cur:
-            # Clear existing data
-            cur.execute("DELETE FROM end_of_season_teams")
-            
-            teams_data = []
-            with open('attached_assets/End of Season Teams (Voting).csv', 'r') as f:
-                reader = csv.DictReader(f)
-                for row in reader:
-                    # Map the CSV column names to our schema
-                    teams_data.append((
-                        row['season'],
-                        row['type'],
-                        row['number_tm'],  # This is the team (1st, 2nd, 3rd, etc.)
-                        row['position'] if row['position'] != 'NA' else None,
-                        row['player'],
-                        safe_int(row['age']),
-                        row['tm'] if row['tm'] != 'NA' else None,
-                        safe_float(row['pts_won']),
-                        safe_float(row['pts_max']),
-                        safe_float(row['share'])
-                    ))
-            
-            # Insert teams data
-            execute_values(
-                cur,
-                """INSERT INTO end_of_season_teams 
-                   (season, type, team, position, player_name, age, team_abbr, pts_won, pts_max, share)
-                   VALUES %s""",
-                teams_data
-            )
-            
-            print(f"Imported {len(teams_data)} end of season team records")
+    print(f"Imported {counts['player_awards']} player award records")
+    print(f"Imported {counts['all_star_selections']} All-Star selection records")
+    print(f"Imported {counts['end_of_season_teams']} end of season team records")
+    return counts
 
 def main():
     """Import all awards data"""
+    pool = get_db_pool()
     try:
-        import_player_awards()
-        import_all_star_selections()
-        import_end_of_season_teams()
+        import_awards(pool)
         print("Successfully imported all awards data!")
         
         # Print some statistics
-        with get_db_connection() as conn:
+        conn = pool.getconn()
+        try:
             with conn.cursor() as cur:
                 cur.execute("SELECT COUNT(*) FROM player_awards")
                 award_count = cur.fetchone()[0]
@@ -153,15 +129,19 @@ def main():
                 
                 cur.execute("SELECT COUNT(*) FROM end_of_season_teams")
                 teams_count = cur.fetchone()[0]
-                
-                print(f"\nDatabase statistics:")
-                print(f"Player awards: {award_count}")
-                print(f"All-Star selections: {allstar_count}")
-                print(f"End of season teams: {teams_count}")
+        finally:
+            pool.putconn(conn)
+        
+        print(f"\nDatabase statistics:")
+        print(f"Player awards: {award_count}")
+        print(f"All-Star selections: {allstar_count}")
+        print(f"End of season teams: {teams_count}")
                 
     except Exception as e:
         print(f"Error importing awards data: {e}")
         raise
+    finally:
+        pool.closeall()
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    run_profiled(main)
@@ -0,0 +1,288 @@
+#!/usr/bin/env python3
+"""Local stand-in for stats.nba.com built from recorded responses.
+
+record  fetches real LeagueDashPlayerStats / LeagueDashTeamStats responses for
+        a list of seasons and PlayerDashboardByLastNGames for active players,
+        and stores each raw response as a gzip fixture under --fixtures.
+serve   replays the fixtures over HTTP at /stats/<endpoint>, with configurable
+        latency, random server errors and a 429 rate limit, so the fetch
+        paths can be benchmarked and load-tested with no network.
+
+Point the fetch layer at a running stand-in with
+NBA_STATS_BASE_URL=http://127.0.0.1:8765/stats (see server/nba_http.py).
+Set NBA_CACHE=off, or use a separate NBA_CACHE_DIR, so the disk cache does not
+answer for it.
+
+Usage:
+    python nba_stats_standin.py record [--seasons 2024-25 2023-24] [--players 50]
+    python nba_stats_standin.py serve [--port 8765] [--latency-ms 80] [--error-rate 0.02] [--rate-limit 10]
+"""
+
+import argparse
+import gzip
+import hashlib
+import json
+import os
+import random
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qsl, urlsplit
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), 'server'))
+
+FIXTURES_DIR = os.environ.get(
+    'NBA_FIXTURES_DIR',
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), 'server', 'nba_fixtures')
+)
+
+DEFAULT_SEASONS = ['2024-25', '2023-24', '2022-23']
+DEFAULT_PORT = 8765
+
+def fixture_key(endpoint, parameters):
+    """Fixture name for a request. Empty parameters are dropped because
+    requests leaves None-valued query parameters out of the URL."""
+    normalized = sorted((key, str(value)) for key, value in parameters.items()
+                        if value is not None and str(value) != '')
+    payload = json.dumps([endpoint.lower(), normalized])
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+def fixture_path(fixtures_dir, endpoint, parameters):
+    return os.path.join(fixtures_dir, endpoint.lower(), f"{fixture_key(endpoint, parameters)}.json.gz")
+
+def save_fixture(fixtures_dir, endpoint, parameters, raw_response):
+    """Store one raw response, plus its parameters in the endpoint's index"""
+    path = fixture_path(fixtures_dir, endpoint, parameters)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with gzip.open(path, 'wt', encoding='utf-8') as f:
+        f.write(raw_response)
+
+    index_path = os.path.join(os.path.dirname(path), 'index.json')
+    try:
+        with open(index_path, 'r') as f:
+            index = json.load(f)
+    except (FileNotFoundError, ValueError):
+        index = {}
+    index[os.path.basename(path)] = {key: value for key, value in parameters.items() if value not in (None, '')}
+    with open(index_path, 'w') as f:
+        json.dump(index, f, indent=2, sort_keys=True)
+    return path
+
+def load_fixtures(fixtures_dir):
+    """{endpoint: {fixture key: raw response bytes}} for every recorded response"""
+    fixtures = {}
+    if not os.path.isdir(fixtures_dir):
+        return fixtures
+    for endpoint in sorted(os.listdir(fixtures_dir)):
+        endpoint_dir = os.path.join(fixtures_dir, endpoint)
+        if not os.path.isdir(endpoint_dir):
+            continue
+        for name in os.listdir(endpoint_dir):
+            if name.endswith('.json.gz'):
+                with gzip.open(os.path.join(endpoint_dir, name), 'rb') as f:
+                    fixtures.setdefault(endpoint, {})[name[:-len('.json.gz')]] = f.read()
+    return fixtures
+
+def record(fixtures_dir, seasons, player_count):
+    """Fetch real responses through the fetch layer and save them as fixtures"""
+    from nba_api.stats.endpoints import leaguedashplayerstats, leaguedashteamstats
+    from nba_cache import fetch_endpoint
+    from player_snapshot import load_players
+    from playerdashboardbylastngames import PlayerDashboardByLastNGames
+
+    def capture(endpoint_class, **kwargs):
+        endpoint = fetch_endpoint(endpoint_class, **kwargs)
+        path = save_fixture(fixtures_dir, endpoint.endpoint, endpoint.parameters,
+                            endpoint.nba_response.get_response())
+        print(f"  {endpoint.endpoint} {kwargs} -> {os.path.relpath(path, fixtures_dir)}")
+
+    recorded = 0
+    failed = 0
+    for season in seasons:
+        for endpoint_class, kwargs in [
+            (leaguedashplayerstats.LeagueDashPlayerStats, {'season': season, 'season_type_all_star': 'Regular Season'}),
+            (leaguedashteamstats.LeagueDashTeamStats, {'season': season}),
+        ]:
+            try:
+                capture(endpoint_class, **kwargs)
+                recorded += 1
+            except Exception as e:
+                failed += 1
+                print(f"  Error recording {endpoint_class.__name__} {season}: {e}", file=sys.stderr)
+
+    if player_count:
+        players = load_players(os.path.join(os.path.dirname(os.path.abspath(__file__)), 'server', 'extended_players.json'))
+        season = seasons[0]
+        active = [player['playerId'] for player in players
+                  if any(s['season'] == season for s in player['seasons'])][:player_count]
+        for player_id in active:
+            try:
+                capture(PlayerDashboardByLastNGames, player_id=player_id, season=season)
+                recorded += 1
+            except Exception as e:
+                failed += 1
+                print(f"  Error recording dashboard for {player_id}: {e}", file=sys.stderr)
+
+    print(f"Recorded {recorded} responses into {fixtures_dir} ({failed} failed)")
+    return failed == 0
+
+class StandinState:
+    """Fixtures plus the fault-injection settings shared by all handler threads"""
+
+    def __init__(self, fixtures, latency_ms=0, jitter_ms=0, error_rate=0.0, rate_limit=0,
+                 fallback=False, seed=None):
+        self.fixtures = fixtures
+        self.latency = latency_ms / 1000.0
+        self.jitter = jitter_ms / 1000.0
+        self.error_rate = error_rate
+        self.rate_limit = rate_limit
+        self.fallback = fallback
+        self.random = random.Random(seed)
+        self.lock = threading.Lock()
+        self.tokens = float(max(1, rate_limit))
+        self.updated = time.monotonic()
+        self.counts = {'served': 0, 'missing': 0, 'errors': 0, 'throttled': 0}
+
+    def count(self, name):
+        with self.lock:
+            self.counts[name] += 1
+
+    def allow(self):
+        """In-memory token bucket; False means answer 429"""
+        if self.rate_limit <= 0:
+            return True
+        with self.lock:
+            now = time.monotonic()
+            self.tokens = min(self.rate_limit, self.tokens + (now - self.updated) * self.rate_limit)
+            self.updated = now
+            if self.tokens >= 1:
+                self.tokens -= 1
+                return True
+            return False
+
+    def delay(self):
+        with self.lock:
+            jitter = self.random.uniform(-self.jitter, self.jitter) if self.jitter else 0.0
+            fail = self.random.random() < self.error_rate
+        return max(0.0, self.latency + jitter), fail
+
+    def lookup(self, endpoint, parameters):
+        responses = self.fixtures.get(endpoint.lower(), {})
+        body = responses.get(fixture_key(endpoint, parameters))
+        if body is None and self.fallback and responses:
+            # Any recorded response for the endpoint, chosen stably per request
+            keys = sorted(responses)
+            body = responses[keys[int(fixture_key(endpoint, parameters), 16) % len(keys)]]
+        return body
+
+def make_handler(state):
+    class StandinHandler(BaseHTTPRequestHandler):
+        protocol_version = 'HTTP/1.1'
+
+        def log_message(self, format, *args):
+            pass
+
+        def send_body(self, status, body, content_type='application/json'):
+            if 'gzip' in self.headers.get('Accept-Encoding', ''):
+                body = gzip.compress(body, compresslevel=1)
+                encoding = 'gzip'
+            else:
+                encoding = None
+            self.send_response(status)
+            self.send_header('Content-Type', content_type)
+            self.send_header('Content-Length', str(len(body)))
+            if encoding:
+                self.send_header('Content-Encoding', encoding)
+            self.end_headers()
+            self.wfile.write(body)
+
+        def do_GET(self):
+            url = urlsplit(self.path)
+            parts = [part for part in url.path.split('/') if part]
+            if url.path == '/_standin/stats':
+                with state.lock:
+                    self.send_body(200, json.dumps(state.counts).encode('utf-8'))
+                return
+            if len(parts) != 2 or parts[0] != 'stats':
+                self.send_body(404, b'{"message": "unknown path"}')
+                return
+
+            if not state.allow():
+                state.count('throttled')
+                self.send_body(429, b'<html>Too Many Requests</html>', 'text/html')
+                return
+
+            delay, fail = state.delay()
+            if delay:
+                time.sleep(delay)
+            if fail:
+                state.count('errors')
+                self.send_body(500, b'<html>Internal Server Error</html>', 'text/html')
+                return
+
+            parameters = dict(parse_qsl(url.query, keep_blank_values=True))
+            body = state.lookup(parts[1], parameters)
+            if body is None:
+                state.count('missing')
+                self.send_body(404, json.dumps({'message': f"no fixture for {parts[1]}"}).encode('utf-8'))
+                return
+            state.count('served')
+            self.send_body(200, body)
+
+    return StandinHandler
+
+def start_server(state, host='127.0.0.1', port=DEFAULT_PORT):
+    """Start the stand-in in a background thread; returns the server (port 0 picks a free one)"""
+    server = ThreadingHTTPServer((host, port), make_handler(state))
+    server.daemon_threads = True
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    return server
+
+def base_url(server):
+    """NBA_STATS_BASE_URL value for a running stand-in"""
+    host, port = server.server_address[:2]
+    return f"http://{host}:{port}/stats"
+
+def main():
+    parser = argparse.ArgumentParser(description="Record and replay NBA stats API responses")
+    parser.add_argument('--fixtures', default=FIXTURES_DIR, help="Fixture directory")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    record_parser = subparsers.add_parser('record', help="Record real responses as fixtures")
+    record_parser.add_argument('--seasons', nargs='+', default=DEFAULT_SEASONS)
+    record_parser.add_argument('--players', type=int, default=25,
+                               help="Dashboards to record for active players of the first season")
+
+    serve_parser = subparsers.add_parser('serve', help="Replay fixtures over HTTP")
+    serve_parser.add_argument('--host', default='127.0.0.1')
+    serve_parser.add_argument('--port', type=int, default=DEFAULT_PORT)
+    serve_parser.add_argument('--latency-ms', type=float, default=0)
+    serve_parser.add_argument('--jitter-ms', type=float, default=0)
+    serve_parser.add_argument('--error-rate', type=float, default=0.0, help="Fraction of requests answered 500")
+    serve_parser.add_argument('--rate-limit', type=float, default=0, help="Requests/second before 429s (0 = off)")
+    serve_parser.add_argument('--fallback', action='store_true',
+                              help="Answer unknown parameters with another fixture of the same endpoint")
+    serve_parser.add_argument('--seed', type=int)
+
+    args = parser.parse_args()
+
+    if args.command == 'record':
+        sys.exit(0 if record(args.fixtures, args.seasons, args.players) else 1)
+
+    fixtures = load_fixtures(args.fixtures)
+    total = sum(len(responses) for responses in fixtures.values())
+    state = StandinState(fixtures, args.latency_ms, args.jitter_ms, args.error_rate,
+                         args.rate_limit, args.fallback, args.seed)
+    server = ThreadingHTTPServer((args.host, args.port), make_handler(state))
+    server.daemon_threads = True
+    print(f"Serving {total} fixtures from {args.fixtures} at {base_url(server)}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,202 @@
+#!/usr/bin/env python3
+"""Bulk table loading for the restore/import scripts.
+
+Rows are streamed as CSV through COPY ... FROM STDIN into a temporary staging
+table, then swapped into the target table (DELETE + INSERT ... SELECT) in the
+same transaction. Readers keep seeing the old rows until the commit, so the
+table is never half-empty, and nothing is sent row by row.
+"""
+
+import io
+import json
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+# Rows encoded per chunk handed to COPY
+COPY_CHUNK_ROWS = 1000
+
+def pg_array(values):
+    """Postgres array literal for a list of strings, e.g. {"2024-25","2023-24"}"""
+    if values is None:
+        return None
+    escaped = ('"' + str(value).replace('\\', '\\\\').replace('"', '\\"') + '"' for value in values)
+    return '{' + ','.join(escaped) + '}'
+
+def pg_json(value):
+    """JSON text for a jsonb column"""
+    return None if value is None else json.dumps(value)
+
+def csv_field(value):
+    """One COPY csv field: None is an unquoted empty field (NULL), strings are always quoted"""
+    if value is None:
+        return ''
+    if isinstance(value, bool):
+        return 'true' if value else 'false'
+    if isinstance(value, (int, float)):
+        return repr(value)
+    return '"' + str(value).replace('"', '""') + '"'
+
+class CsvStream(io.RawIOBase):
+    """Read-only file object producing CSV text for COPY from an iterable of rows.
+
+    Rows are encoded lazily in chunks, so the full CSV never exists in memory.
+    None becomes NULL and strings are always quoted, so '' stays an empty string.
+    """
+
+    def __init__(self, rows, chunk_rows=COPY_CHUNK_ROWS):
+        self.rows = iter(rows)
+        self.chunk_rows = chunk_rows
+        self.pending = b''
+        self.row_count = 0
+
+    def readable(self):
+        return True
+
+    def next_chunk(self):
+        lines = []
+        for row in self.rows:
+            lines.append(','.join(map(csv_field, row)) + '\n')
+            self.row_count += 1
+            if len(lines) == self.chunk_rows:
+                break
+        return ''.join(lines).encode('utf-8')
+
+    def read(self, size=-1):
+        while size < 0 or len(self.pending) < size:
+            chunk = self.next_chunk()
+            if not chunk:
+                break
+            self.pending += chunk
+        if size < 0:
+            size = len(self.pending)
+        data, self.pending = self.pending[:size], self.pending[size:]
+        return data
+
+def copy_rows(cur, table, columns, rows):
+    """Stream rows into table with COPY FROM STDIN; returns the number of rows"""
+    stream = CsvStream(rows)
+    cur.copy_expert(
+        f"COPY {table} ({', '.join(columns)}) FROM STDIN WITH (FORMAT csv)",
+        stream
+    )
+    return stream.row_count
+
+def staging_table_name(table):
+    """Name of the staging table used while reloading table"""
+    return f"{table}_staging"
+
+def create_staging_table(cur, table, unlogged=False):
+    """Create an empty copy of table to load into; returns its name.
+
+    By default it is a temporary table dropped at commit. With unlogged=True it
+    is a regular UNLOGGED table that outlives the loading transaction, so other
+    connections can see it; drop it with drop_staging_table.
+    """
+    staging_table = staging_table_name(table)
+    if unlogged:
+        cur.execute(f"DROP TABLE IF EXISTS {staging_table}")
+        cur.execute(f"CREATE UNLOGGED TABLE {staging_table} (LIKE {table} INCLUDING DEFAULTS)")
+    else:
+        cur.execute(f"CREATE TEMP TABLE {staging_table} (LIKE {table} INCLUDING DEFAULTS) ON COMMIT DROP")
+    return staging_table
+
+def drop_staging_table(cur, staging_table):
+    """Drop an unlogged staging table if it exists"""
+    cur.execute(f"DROP TABLE IF EXISTS {staging_table}")
+
+def swap_in_staging(cur, table, staging_table, columns):
+    """Replace table's rows with the staging table's rows (caller owns the transaction)"""
+    column_list = ', '.join(columns)
+    cur.execute(f"DELETE FROM {table}")
+    cur.execute(f"INSERT INTO {table} ({column_list}) SELECT {column_list} FROM {staging_table}")
+
+def report_load(table, row_count, elapsed):
+    """Print the load size and throughput"""
+    rate = row_count / elapsed if elapsed > 0 else float(row_count)
+    print(f"Loaded {row_count} rows into {table} in {elapsed:.2f}s ({rate:,.0f} rows/sec)")
+
+def replace_table_contents(conn, table, columns, rows):
+    """Atomically replace every row of table with rows, loading through COPY.
+
+    Everything runs in one transaction: COPY into a temporary staging table,
+    then DELETE + INSERT ... SELECT into the real table. On any error the
+    transaction is rolled back and the old rows are untouched.
+    Returns the number of rows loaded.
+    """
+    start = time.perf_counter()
+    try:
+        with conn.cursor() as cur:
+            staging_table = create_staging_table(cur, table)
+            row_count = copy_rows(cur, staging_table, columns, rows)
+            swap_in_staging(cur, table, staging_table, columns)
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+
+    report_load(table, row_count, time.perf_counter() - start)
+    return row_count
+
+def load_staging_table(pool, table, columns, rows):
+    """COPY rows into an unlogged staging table on a pooled connection; returns (name, row count)"""
+    start = time.perf_counter()
+    conn = pool.getconn()
+    try:
+        with conn.cursor() as cur:
+            staging_table = create_staging_table(cur, table, unlogged=True)
+            row_count = copy_rows(cur, staging_table, columns, rows)
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+    finally:
+        pool.putconn(conn)
+
+    report_load(staging_table, row_count, time.perf_counter() - start)
+    return staging_table, row_count
+
+def replace_tables_contents(pool, loads):
+    """Atomically replace the rows of several tables, loading them in parallel.
+
+    loads maps table name -> (columns, rows). Each table is streamed through
+    COPY into its own unlogged staging table on a separate pooled connection
+    (the pool needs one connection per table). All tables are then swapped in
+    and the staging tables dropped in a single transaction, so readers see
+    either every old table or every new one. Returns {table: row count}.
+    """
+    staged = {}
+    try:
+        with ThreadPoolExecutor(max_workers=len(loads)) as executor:
+            futures = {
+                table: executor.submit(load_staging_table, pool, table, columns, rows)
+                for table, (columns, rows) in loads.items()
+            }
+            for table, future in futures.items():
+                staged[table] = future.result()
+
+        conn = pool.getconn()
+        try:
+            with conn.cursor() as cur:
+                for table, (columns, _) in loads.items():
+                    staging_table, _ = staged[table]
+                    swap_in_staging(cur, table, staging_table, columns)
+                    drop_staging_table(cur, staging_table)
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+        finally:
+            pool.putconn(conn)
+    except Exception:
+        # Leave no staging tables behind after a failed load or swap
+        conn = pool.getconn()
+        try:
+            with conn.cursor() as cur:
+                for table in loads:
+                    drop_staging_table(cur, staging_table_name(table))
+            conn.commit()
+        finally:
+            pool.putconn(conn)
+        raise
+
+    return {table: row_count for table, (_, row_count) in staged.items()}
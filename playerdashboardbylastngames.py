@@ -1,3 +1,5 @@
+from operator import itemgetter
+
 from nba_api.stats.endpoints._base import Endpoint
 from nba_api.stats.library.http import NBAStatsHTTP
 from nba_api.stats.library.parameters import (
@@ -416,6 +418,9 @@ class PlayerDashboardByLastNGames(Endpoint):
     player_stats = None
     team_stats = None
     headers = None
+    session = None
+    lean_columns = None
+    lean_data_sets = None
 
     def __init__(
         self,
@@ -446,11 +451,19 @@ class PlayerDashboardByLastNGames(Endpoint):
         headers=None,
         timeout=30,
         get_request=True,
+        session=None,
+        lean=False,
+        columns=None,
     ):
         self.proxy = proxy
         if headers is not None:
             self.headers = headers
         self.timeout = timeout
+        # Optional pooled requests.Session; None uses NBAStatsHTTP's shared session
+        self.session = session
+        # Lean mode: parse only these columns into arrays, skip DataSet/DataFrame wrappers
+        if lean or columns is not None:
+            self.lean_columns = list(columns) if columns is not None else LEAN_DEFAULT_COLUMNS
         self.parameters = {
             "PlayerID": player_id,
             "LastNGames": last_n_games,
@@ -480,7 +493,10 @@ class PlayerDashboardByLastNGames(Endpoint):
             self.get_request()
 
     def get_request(self):
-        self.nba_response = NBAStatsHTTP().send_api_request(
+        http = NBAStatsHTTP()
+        if self.session is not None:
+            http.get_session = lambda: self.session
+        self.nba_response = http.send_api_request(
             endpoint=self.endpoint,
             parameters=self.parameters,
             proxy=self.proxy,
@@ -490,6 +506,9 @@ class PlayerDashboardByLastNGames(Endpoint):
         self.load_response()
 
     def load_response(self):
+        if self.lean_columns is not None:
+            self.lean_data_sets = parse_lean_data_sets(self.nba_response.get_dict(), self.lean_columns)
+            return
         data_sets = self.nba_response.get_data_sets()
         self.data_sets = [
             Endpoint.DataSet(data=data_set)
@@ -513,3 +532,54 @@ class PlayerDashboardByLastNGames(Endpoint):
         self.overall_player_dashboard = Endpoint.DataSet(
             data=data_sets["OverallPlayerDashboard"]
         )
+
+
+# Stat columns without the *_RANK duplicates and the opaque CFID/CFPARAMS fields
+LEAN_DEFAULT_COLUMNS = [
+    column
+    for column in PlayerDashboardByLastNGames.expected_data["OverallPlayerDashboard"]
+    if not column.endswith("_RANK")
+    and column not in ("GROUP_SET", "GROUP_VALUE", "CFID", "CFPARAMS")
+]
+
+
+def parse_lean_data_sets(raw_dict, columns):
+    """Project each result set onto the requested columns in one pass.
+
+    Returns {data set name: {"GROUP_VALUE": str array, column: float64 array}}.
+    Missing values and columns become NaN; every other header is ignored.
+    """
+    import numpy as np
+
+    results = raw_dict.get("resultSets", raw_dict.get("resultSet", []))
+    if isinstance(results, dict):
+        results = [results]
+
+    lean_data_sets = {}
+    for result_set in results:
+        headers = result_set["headers"]
+        rows = result_set["rowSet"]
+        index = {header: position for position, header in enumerate(headers)}
+        present = [column for column in columns if column in index]
+
+        data_set = {}
+        if "GROUP_VALUE" in index:
+            group_index = index["GROUP_VALUE"]
+            data_set["GROUP_VALUE"] = np.array([str(row[group_index]) for row in rows], dtype="U")
+
+        if present and rows:
+            if len(present) == 1:
+                picked = [[row[index[present[0]]]] for row in rows]
+            else:
+                picked = list(map(itemgetter(*[index[column] for column in present]), rows))
+            matrix = np.array(picked, dtype="float64")
+        else:
+            matrix = np.empty((len(rows), len(present)), dtype="float64")
+        for position, column in enumerate(present):
+            data_set[column] = matrix[:, position]
+        for column in columns:
+            if column not in index:
+                data_set[column] = np.full(len(rows), np.nan)
+
+        lean_data_sets[result_set["name"]] = data_set
+    return lean_data_sets
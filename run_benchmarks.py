@@ -0,0 +1,435 @@
+#!/usr/bin/env python3
+"""Offline benchmarks for the fetch -> convert -> aggregate -> serialize path.
+
+Every benchmark runs without network access:
+
+- API frames come from the recorded fixtures of nba_stats_standin.py when
+  there are any, otherwise they are derived from extended_players.json in the
+  LeagueDashPlayerStats / LeagueDashTeamStats column layout.
+- Scaled data is generated in memory with the generate_synthetic_dataset
+  model (--scale multiples of the real dataset, 10 by default).
+
+Stages timed:
+
+    fetch.standin            fetch_endpoint round trips against a local stand-in
+    convert.*                stat_rows frame -> column / record conversion
+    aggregate.*              career_stats on the flat table and on player dicts
+    snapshot.*               JSON and .npz snapshot dump and load
+    formula.*                formula_engine leaderboards over the season store
+    team.possession_columns  team possession / pace / rating columns
+    startup.*                importing nba_data / team_stats_data in a fresh interpreter
+
+Each benchmark is repeated and its median and best times are written as JSON
+(.benchmarks/latest.json). With a baseline (.benchmarks/baseline.json, or
+--baseline) every median is compared against it and the script exits with
+status 1 when any benchmark is slower by more than --threshold. A --baseline
+that does not exist is an error (status 2) rather than a skipped comparison;
+only the default local baseline may be absent. The startup
+benchmarks also have absolute budgets (STARTUP_BUDGETS, scaled by
+--budget-scale) and fail when a fresh import pulls in pandas, nba_api or
+requests, since the Node server pays that import on every request.
+
+Usage: python run_benchmarks.py [--scale 10] [--repeat 5] [--only convert formula]
+                                [--baseline path] [--save-baseline] [--threshold 0.25]
+                                [--budget-scale 1.0]
+"""
+
+import argparse
+import gc
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), 'server'))
+
+try:
+    import numpy as np
+    import pandas as pd
+    from career_stats import aggregate_careers, update_career_stats
+    from formula_engine import compile_formula, formula_leaderboard
+    from player_snapshot import load_players, load_snapshot, players_from_snapshot, write_snapshot
+    from season_store import build_store
+    from stat_rows import player_stat_columns, season_records, team_possession_columns
+    from generate_synthetic_dataset import career_columns, fit_model, generate_columns, iter_players
+    from nba_stats_standin import FIXTURES_DIR, load_fixtures
+except ImportError as e:
+    print(f"Benchmark dependencies not available: {e}")
+    sys.exit(1)
+
+BENCHMARK_VERSION = 1
+
+DATASET_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'server', 'extended_players.json')
+BENCH_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '.benchmarks')
+RESULTS_PATH = os.path.join(BENCH_DIR, 'latest.json')
+BASELINE_PATH = os.path.join(BENCH_DIR, 'baseline.json')
+
+DEFAULT_SCALE = 10
+DEFAULT_REPEAT = 5
+
+# A benchmark regresses when its median is this much slower than the baseline...
+DEFAULT_THRESHOLD = 0.25
+# ...and at least this many seconds slower, so timer noise on tiny stages is ignored
+MIN_REGRESSION_SECONDS = 0.002
+
+# Formulas evaluated by the formula benchmarks, from cheap to function-heavy
+FORMULAS = [
+    'PTS + AST + REB',
+    '(PTS + REB + AST + STL + BLK - TOV) / MIN',
+    'SQRT(PTS * FG_PCT) + LOG(1 + AST) * FT_PCT',
+]
+
+STANDIN_REQUESTS = 20
+
+SERVER_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'server')
+
+# Median seconds allowed to start an interpreter and import each CLI module
+STARTUP_BUDGETS = {
+    'startup.nba_data': 0.4,
+    'startup.team_stats_data': 0.25,
+}
+
+# Modules the CLIs must only import once they actually fetch from the API
+LAZY_MODULES = ['pandas', 'nba_api', 'requests']
+
+# Per-game dataset field -> season total column of the API frames
+TOTAL_COLUMNS = {
+    'MIN': 'minutesPerGame', 'PTS': 'points', 'AST': 'assists', 'REB': 'rebounds',
+    'STL': 'steals', 'BLK': 'blocks', 'TOV': 'turnovers', 'FGA': 'fieldGoalAttempts',
+    'FG3A': 'threePointAttempts', 'FTA': 'freeThrowAttempts', 'PLUS_MINUS': 'plusMinus',
+}
+RATE_COLUMNS = {
+    'FG_PCT': 'fieldGoalPercentage', 'FG3_PCT': 'threePointPercentage',
+    'FT_PCT': 'freeThrowPercentage', 'W_PCT': 'winPercentage',
+}
+
+def fixture_frames(fixtures, endpoint):
+    """The first result set of every recorded response of an endpoint, concatenated"""
+    frames = []
+    for raw in fixtures.get(endpoint, {}).values():
+        result_set = json.loads(raw)['resultSets'][0]
+        frames.append(pd.DataFrame(result_set['rowSet'], columns=result_set['headers']))
+    return pd.concat(frames, ignore_index=True) if frames else None
+
+def derived_player_frame(players):
+    """LeagueDashPlayerStats-shaped season totals rebuilt from the dataset's season rows"""
+    rows = [(player['playerId'], player['name'], season)
+            for player in players for season in player['seasons']]
+    games = np.array([season['gamesPlayed'] for _, _, season in rows], dtype='float64')
+    frame = {
+        'PLAYER_ID': [player_id for player_id, _, _ in rows],
+        'PLAYER_NAME': [name for _, name, _ in rows],
+        'TEAM_ABBREVIATION': [season['team'] for _, _, season in rows],
+        'GP': games.astype('int64'),
+    }
+    for column, field in TOTAL_COLUMNS.items():
+        frame[column] = np.array([season[field] for _, _, season in rows]) * games
+    for column, field in RATE_COLUMNS.items():
+        frame[column] = [season[field] for _, _, season in rows]
+    return pd.DataFrame(frame)
+
+def derived_team_frame(player_frame):
+    """LeagueDashTeamStats-shaped totals: player totals summed per team"""
+    totals = player_frame.groupby('TEAM_ABBREVIATION', sort=True)
+    frame = totals[['PTS', 'FGA', 'FTA', 'TOV', 'MIN', 'AST', 'REB', 'STL', 'BLK', 'PLUS_MINUS']].sum()
+    frame['OREB'] = frame['REB'] * 0.25
+    frame['GP'] = totals['GP'].max()
+    frame['W_PCT'] = totals['W_PCT'].mean()
+    frame['W'] = (frame['GP'] * frame['W_PCT']).round().astype('int64')
+    frame['L'] = frame['GP'] - frame['W']
+    for column in ['FG_PCT', 'FG3_PCT', 'FT_PCT']:
+        frame[column] = totals[column].mean()
+    frame = frame.reset_index()
+    frame['TEAM_ID'] = np.arange(len(frame), dtype='int64') + 1610612737
+    frame['TEAM_NAME'] = frame['TEAM_ABBREVIATION']
+    return frame
+
+def tile_frame(frame, rows):
+    """Repeat a frame's rows until it has at least `rows` rows"""
+    copies = max(1, -(-rows // max(1, len(frame))))
+    return pd.concat([frame] * copies, ignore_index=True)
+
+def raw_response(frame, name):
+    """A stats API JSON body carrying one result set"""
+    return json.dumps({
+        'resource': name,
+        'parameters': {},
+        'resultSets': [{'name': name, 'headers': list(frame.columns),
+                        'rowSet': frame.astype(object).values.tolist()}],
+    }).encode('utf-8')
+
+class Inputs:
+    """Data shared by the benchmarks, built once"""
+
+    def __init__(self, scale):
+        self.scale = scale
+        real_players = load_players(DATASET_PATH)
+
+        fixtures = load_fixtures(FIXTURES_DIR)
+        recorded = fixture_frames(fixtures, 'leaguedashplayerstats')
+        self.fixture_source = 'recorded' if recorded is not None else 'derived'
+        self.player_frame = recorded if recorded is not None else derived_player_frame(real_players)
+        recorded_teams = fixture_frames(fixtures, 'leaguedashteamstats')
+        self.team_frame = recorded_teams if recorded_teams is not None else derived_team_frame(self.player_frame)
+        self.fixtures = fixtures
+
+        # Synthetic players at the requested scale, as columns and as dicts
+        model = fit_model(real_players)
+        rng = np.random.default_rng([0, scale])
+        players, seasons = generate_columns(model, len(real_players) * scale, rng)
+        careers = career_columns(players, seasons)
+        self.players = list(iter_players(players, seasons, careers))
+        self.table = dict(seasons)
+        self.table['playerId'] = np.repeat(players['playerId'], players['seasonCount'])
+        self.season_count = len(seasons['season'])
+
+        self.scaled_player_frame = tile_frame(self.player_frame, self.season_count)
+        self.scaled_team_frame = tile_frame(self.team_frame, len(self.team_frame) * scale)
+        self.store = build_store(self.players)
+        self.latest_season = max(self.table['season'].tolist())
+
+def benchmarks(inputs, workdir):
+    """{name: (rows processed, setup or None, function)}"""
+    json_path = os.path.join(workdir, 'players.json')
+    npz_path = os.path.join(workdir, 'players.npz')
+
+    def dump_json():
+        with open(json_path, 'wb') as f:
+            f.write(json.dumps(inputs.players, indent=2).encode('utf-8'))
+
+    def load_json():
+        with open(json_path, 'rb') as f:
+            json.loads(f.read())
+
+    def copy_players():
+        # update_career_stats works in place, so every run gets fresh season lists
+        return [dict(player, seasons=list(player['seasons'])) for player in inputs.players]
+
+    def leaderboards(season=None):
+        for formula in FORMULAS:
+            formula_leaderboard(compile_formula(formula), inputs.store, season)
+
+    frame = inputs.scaled_player_frame
+    rows = inputs.season_count
+    return {
+        'convert.player_stat_columns': (len(frame), None, lambda: player_stat_columns(frame, '2024-25')),
+        'convert.season_records': (len(frame), None, lambda: season_records(frame, '2024-25')),
+        'aggregate.aggregate_careers': (rows, None, lambda: aggregate_careers(inputs.table)),
+        'aggregate.update_career_stats': (rows, copy_players, update_career_stats),
+        'snapshot.json_dump': (rows, None, dump_json),
+        'snapshot.json_load': (rows, dump_json, lambda _: load_json()),
+        'snapshot.npz_dump': (rows, None, lambda: write_snapshot(inputs.players, npz_path)),
+        'snapshot.npz_load': (rows, lambda: write_snapshot(inputs.players, npz_path),
+                              lambda _: players_from_snapshot(load_snapshot(npz_path))),
+        'formula.all_time': (rows * len(FORMULAS), None, leaderboards),
+        'formula.season': (rows * len(FORMULAS), None, lambda: leaderboards(inputs.latest_season)),
+        'team.possession_columns': (len(inputs.scaled_team_frame), None,
+                                    lambda: team_possession_columns(inputs.scaled_team_frame)),
+    }
+
+def standin_benchmark(inputs):
+    """fetch_endpoint round trips (HTTP, JSON parse, frame build) against a local stand-in"""
+    from nba_api.stats.endpoints import leaguedashplayerstats
+    from nba_cache import fetch_endpoint
+    from nba_stats_standin import StandinState, base_url, start_server
+
+    fixtures = inputs.fixtures
+    if 'leaguedashplayerstats' not in fixtures:
+        fixtures = {'leaguedashplayerstats': {'derived': raw_response(inputs.player_frame, 'LeagueDashPlayerStats')}}
+    server = start_server(StandinState(fixtures, fallback=True), port=0)
+    settings = {'NBA_STATS_BASE_URL': base_url(server), 'NBA_CACHE': 'off', 'NBA_RATE_LIMIT': '0'}
+    saved = {name: os.environ.get(name) for name in settings}
+    os.environ.update(settings)
+
+    def fetch():
+        for _ in range(STANDIN_REQUESTS):
+            fetch_endpoint(leaguedashplayerstats.LeagueDashPlayerStats, season='2024-25').get_data_frames()
+
+    def restore():
+        server.shutdown()
+        server.server_close()
+        for name, value in saved.items():
+            if value is None:
+                os.environ.pop(name, None)
+            else:
+                os.environ[name] = value
+
+    return STANDIN_REQUESTS, fetch, restore
+
+def import_module_fresh(module):
+    """Import a server module in a new interpreter; returns the lazy modules it loaded"""
+    code = (f"import sys; sys.path.insert(0, {SERVER_DIR!r}); import {module}; "
+            f"print(' '.join(name for name in {LAZY_MODULES!r} if name in sys.modules))")
+    result = subprocess.run([sys.executable, '-c', code], capture_output=True, text=True, check=True)
+    return result.stdout.split()
+
+def startup_benchmarks():
+    """{name: (rows, setup, function)} timing a fresh import of each CLI module"""
+    return {name: (1, None, lambda module=name.split('.', 1)[1]: import_module_fresh(module))
+            for name in STARTUP_BUDGETS}
+
+def check_startup(results, budget_scale):
+    """Budget and lazy-import failures of the startup benchmarks"""
+    failures = []
+    for name, budget in STARTUP_BUDGETS.items():
+        result = results.get(name)
+        if result is None:
+            continue
+        budget *= budget_scale
+        if result['median'] > budget:
+            failures.append(f"{name} took {result['median'] * 1000:.0f} ms (budget {budget * 1000:.0f} ms)")
+        loaded = import_module_fresh(name.split('.', 1)[1])
+        if loaded:
+            failures.append(f"{name} imported {', '.join(loaded)} at startup")
+    return failures
+
+def time_benchmark(setup, function, repeat):
+    """Run function `repeat` times (after setup, outside the timing); returns the durations"""
+    durations = []
+    for _ in range(repeat):
+        argument = setup() if setup else None
+        gc.collect()
+        start = time.perf_counter()
+        if setup:
+            function(argument)
+        else:
+            function()
+        durations.append(time.perf_counter() - start)
+    return durations
+
+def summarize(rows, durations):
+    median = statistics.median(durations)
+    return {
+        'rows': rows,
+        'repeat': len(durations),
+        'median': median,
+        'best': min(durations),
+        'rowsPerSecond': rows / median if median > 0 else None,
+    }
+
+def run_benchmarks(scale, repeat, only=None):
+    """Build the inputs and time every selected benchmark; returns the results document"""
+    def selected(name):
+        return not only or any(name == prefix or name.startswith(prefix + '.') for prefix in only)
+
+    start = time.perf_counter()
+    inputs = Inputs(scale)
+    print(f"Inputs ready in {time.perf_counter() - start:.1f}s: {inputs.season_count} synthetic player-seasons "
+          f"(x{scale}), {len(inputs.player_frame)} {inputs.fixture_source} fixture rows", file=sys.stderr)
+
+    results = {}
+    with tempfile.TemporaryDirectory(prefix='nba_bench_') as workdir:
+        for name, (rows, setup, function) in benchmarks(inputs, workdir).items():
+            if selected(name):
+                results[name] = summarize(rows, time_benchmark(setup, function, repeat))
+                print(f"  {name:32s} {results[name]['median'] * 1000:10.2f} ms", file=sys.stderr)
+
+    for name, (rows, setup, function) in startup_benchmarks().items():
+        if selected(name):
+            results[name] = summarize(rows, time_benchmark(setup, function, repeat))
+            print(f"  {name:32s} {results[name]['median'] * 1000:10.2f} ms", file=sys.stderr)
+
+    if selected('fetch.standin'):
+        rows, function, restore = standin_benchmark(inputs)
+        try:
+            results['fetch.standin'] = summarize(rows, time_benchmark(None, function, repeat))
+        finally:
+            restore()
+        print(f"  {'fetch.standin':32s} {results['fetch.standin']['median'] * 1000:10.2f} ms", file=sys.stderr)
+
+    return {
+        'version': BENCHMARK_VERSION,
+        'createdAt': time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime()),
+        'python': platform.python_version(),
+        'numpy': np.__version__,
+        'pandas': pd.__version__,
+        'machine': platform.machine(),
+        'scale': scale,
+        'seasonRows': inputs.season_count,
+        'fixtureSource': inputs.fixture_source,
+        'results': results,
+    }
+
+def compare(current, baseline, threshold):
+    """Names of benchmarks whose median regressed against the baseline, with a report line each"""
+    regressions = []
+    if baseline.get('scale') != current['scale']:
+        print(f"Baseline was run at x{baseline.get('scale')}, not x{current['scale']}; not comparing",
+              file=sys.stderr)
+        return regressions
+
+    for name, result in sorted(current['results'].items()):
+        previous = baseline.get('results', {}).get(name)
+        if previous is None:
+            continue
+        change = result['median'] / previous['median'] - 1 if previous['median'] > 0 else 0.0
+        slower = result['median'] - previous['median']
+        regressed = change > threshold and slower > MIN_REGRESSION_SECONDS
+        marker = 'REGRESSION' if regressed else ''
+        print(f"  {name:32s} {previous['median'] * 1000:10.2f} -> {result['median'] * 1000:10.2f} ms "
+              f"({change:+.0%}) {marker}", file=sys.stderr)
+        if regressed:
+            regressions.append(name)
+    return regressions
+
+def write_results(document, path):
+    """Write a results document atomically"""
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, 'w') as f:
+        json.dump(document, f, indent=2, sort_keys=True)
+    os.replace(tmp_path, path)
+
+def main():
+    parser = argparse.ArgumentParser(description="Offline performance benchmarks")
+    parser.add_argument('--scale', type=int, default=DEFAULT_SCALE, help="Synthetic data size, x the real dataset")
+    parser.add_argument('--repeat', type=int, default=DEFAULT_REPEAT)
+    parser.add_argument('--only', nargs='+', help="Benchmark names or prefixes (convert, formula.season, ...)")
+    parser.add_argument('--output', default=RESULTS_PATH)
+    parser.add_argument('--baseline', help=f"Results to compare against; must exist unless --save-baseline "
+                                           f"(default {os.path.relpath(BASELINE_PATH)}, if present)")
+    parser.add_argument('--save-baseline', action='store_true', help="Also write the results as the baseline")
+    parser.add_argument('--budget-scale', type=float, default=1.0,
+                        help="Multiplier for the startup time budgets (slower machines)")
+    parser.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD,
+                        help="Allowed slowdown of a median before it counts as a regression")
+    args = parser.parse_args()
+
+    # An explicit baseline that is missing would otherwise pass without comparing anything
+    baseline_path = args.baseline or BASELINE_PATH
+    if args.baseline and not args.save_baseline and not os.path.exists(args.baseline):
+        print(f"Baseline {args.baseline} does not exist; run with --save-baseline to create it", file=sys.stderr)
+        sys.exit(2)
+
+    document = run_benchmarks(args.scale, max(1, args.repeat), args.only)
+    write_results(document, args.output)
+    print(f"Wrote {args.output}")
+
+    failures = check_startup(document['results'], args.budget_scale)
+    for failure in failures:
+        print(f"Startup budget exceeded: {failure}")
+
+    if args.save_baseline:
+        write_results(document, baseline_path)
+        print(f"Saved baseline {baseline_path}")
+    elif not os.path.exists(baseline_path):
+        print(f"No baseline at {baseline_path}; not comparing (run with --save-baseline to create one)")
+    else:
+        with open(baseline_path, 'r') as f:
+            baseline = json.load(f)
+        regressions = compare(document, baseline, args.threshold)
+        if regressions:
+            print(f"{len(regressions)} benchmark(s) regressed by more than {args.threshold:.0%}: "
+                  f"{', '.join(regressions)}")
+            failures.extend(regressions)
+        else:
+            print("No regressions against the baseline")
+
+    if failures:
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
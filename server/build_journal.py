@@ -0,0 +1,170 @@
+#!/usr/bin/env python3
+"""Checkpoint journal for long, multi-season dataset builds.
+
+A build is split into units, such as one LeagueDashPlayerStats fetch for one
+season. Each finished unit is appended to a JSONL journal together with the
+rows it converted. Failed units are appended too. When a crashed or partially
+failed build is re-run, finished units are replayed from the journal instead
+of being fetched again. Only the failed or missing units touch the API. Once
+the build has saved its output the journal is removed.
+
+Stored rows depend on more than the unit (the players a build targets, its
+filters), so a build passes those as params. Their fingerprint is the
+journal's first line, and a journal written with different params is
+discarded instead of replayed.
+
+A journal may be shared by the threads of one build's fetch pool.
+"""
+
+import hashlib
+import json
+import os
+import sys
+import threading
+import time
+
+JOURNAL_DIR = os.environ.get(
+    'NBA_JOURNAL_DIR',
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), '.build_journal')
+)
+
+# Attempts per unit within one run, and the base delay between them in seconds.
+# Units usually wrap nba_cache.fetch_endpoint, whose requests nba_throttle
+# already retries with backoff, so a unit is not retried again by default.
+DEFAULT_UNIT_ATTEMPTS = 1
+DEFAULT_RETRY_DELAY = 2.0
+
+def journal_path(build_name):
+    """Location of the journal for a named build"""
+    return os.path.join(JOURNAL_DIR, f"{build_name}.jsonl")
+
+def unit_key(endpoint, season):
+    """Journal key of one (endpoint, season) unit"""
+    return f"{endpoint.lower()}/{season}"
+
+def params_fingerprint(params):
+    """Short stable hash of a build's JSON-serializable params"""
+    encoded = json.dumps(params, sort_keys=True, separators=(',', ':'))
+    return hashlib.sha256(encoded.encode('utf-8')).hexdigest()[:16]
+
+class BuildJournal:
+    """Append-only record of finished and failed units for one build"""
+
+    def __init__(self, build_name, path=None, params=None):
+        self.build_name = build_name
+        self.path = path or journal_path(build_name)
+        self.fingerprint = params_fingerprint(params)
+        self.entries = {}
+        self.failed = set()
+        self.resumed = 0
+        self.torn_tail = False
+        self.lock = threading.Lock()
+        self.load()
+
+    def load(self):
+        """Read earlier entries; the last entry for a unit wins"""
+        if not os.path.exists(self.path):
+            return
+        fingerprint = None
+        with open(self.path, 'r') as f:
+            for line in f:
+                self.torn_tail = not line.endswith('\n')
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    # A run killed mid-write leaves a truncated last line
+                    continue
+                if 'params' in entry:
+                    fingerprint = entry['params']
+                    continue
+                self.entries[entry['unit']] = entry
+
+        if fingerprint != self.fingerprint:
+            print(f"Discarding {self.path}: it was written with different build params", file=sys.stderr)
+            os.remove(self.path)
+            self.entries = {}
+            self.torn_tail = False
+            return
+        done = sum(1 for entry in self.entries.values() if entry['status'] == 'done')
+        if self.entries:
+            print(f"Resuming {self.build_name}: {done} finished units in {self.path}", file=sys.stderr)
+
+    def append(self, entry):
+        """Durably append one entry, after the params header when the journal is new"""
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        with self.lock, open(self.path, 'a') as f:
+            if f.tell() == 0:
+                f.write(json.dumps({'params': self.fingerprint, 'build': self.build_name}) + '\n')
+            if self.torn_tail:
+                # Start a fresh line after a truncated one
+                f.write('\n')
+                self.torn_tail = False
+            f.write(json.dumps(entry) + '\n')
+            f.flush()
+            os.fsync(f.fileno())
+            self.entries[entry['unit']] = entry
+
+    def is_done(self, unit):
+        """Whether a unit finished in this or an earlier run"""
+        entry = self.entries.get(unit)
+        return entry is not None and entry['status'] == 'done'
+
+    def record_done(self, unit, rows):
+        """Checkpoint a finished unit and its converted rows"""
+        with self.lock:
+            self.failed.discard(unit)
+        self.append({'unit': unit, 'status': 'done', 'rows': rows, 'time': time.time()})
+
+    def record_failure(self, unit, error):
+        """Checkpoint a unit that failed so the next run retries it"""
+        with self.lock:
+            self.failed.add(unit)
+        self.append({'unit': unit, 'status': 'failed', 'error': str(error), 'time': time.time()})
+
+    def run(self, unit, convert, attempts=DEFAULT_UNIT_ATTEMPTS, retry_delay=DEFAULT_RETRY_DELAY,
+            checkpoint=True):
+        """Rows of a unit, from the journal if it finished before, else from convert().
+
+        convert() must return JSON-serializable rows. Failures are retried with
+        exponential backoff. Returns None when every attempt failed. With
+        checkpoint=False (a unit whose rows change between runs) the unit is
+        never replayed or recorded as done, but its failures still are.
+        """
+        if checkpoint and self.is_done(unit):
+            with self.lock:
+                self.resumed += 1
+            return self.entries[unit]['rows']
+
+        for attempt in range(1, attempts + 1):
+            try:
+                rows = convert()
+            except Exception as e:
+                print(f"  {unit} failed (attempt {attempt}/{attempts}): {e}", file=sys.stderr)
+                if attempt == attempts:
+                    self.record_failure(unit, e)
+                    return None
+                time.sleep(retry_delay * 2 ** (attempt - 1))
+            else:
+                if checkpoint:
+                    self.record_done(unit, rows)
+                else:
+                    with self.lock:
+                        self.failed.discard(unit)
+                return rows
+
+    def complete(self):
+        """Whether every unit attempted in this run finished"""
+        return not self.failed
+
+    def finish(self):
+        """Remove the journal once the build's output has been saved"""
+        if os.path.exists(self.path):
+            os.remove(self.path)
+        self.entries = {}
+
+    def summary(self):
+        """One-line progress report for the end of a run"""
+        if self.failed:
+            return (f"{len(self.failed)} units failed ({', '.join(sorted(self.failed))}); "
+                    f"re-run to retry only those, finished units are kept in {self.path}")
+        return f"All units finished ({self.resumed} replayed from the journal)"
@@ -0,0 +1,159 @@
+#!/usr/bin/env python3
+"""Opt-in timing spans and counters for dataset builds and exports.
+
+Set NBA_METRICS to turn it on:
+
+- summary: one block per process on exit, with each span's count, wall time,
+  CPU time and maximum, plus every counter
+- jsonl:   one JSON line per finished span as it happens, then one line with
+  the counters on exit
+
+Output goes to NBA_METRICS_FILE (appended to) or stderr, never stdout,
+which carries the scripts' JSON payloads. Spans record wall and thread CPU
+time, so a span with much more wall than CPU time was waiting on the network
+or disk. While disabled, span() hands back one shared no-op object and
+count() returns immediately.
+"""
+
+import atexit
+import json
+import os
+import sys
+import threading
+import time
+
+_recorder = None
+
+class NullSpan:
+    """Stand-in returned by span() while metrics are disabled"""
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        return False
+
+    def set(self, **fields):
+        pass
+
+_NULL_SPAN = NullSpan()
+
+class Span:
+    """Times a block in wall and thread CPU seconds; extra fields go in the JSON line"""
+
+    def __init__(self, recorder, name, fields):
+        self.recorder = recorder
+        self.name = name
+        self.fields = fields
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        self.cpu_start = time.thread_time()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        seconds = time.perf_counter() - self.start
+        cpu_seconds = time.thread_time() - self.cpu_start
+        if exc_type is not None:
+            self.fields['error'] = exc_type.__name__
+        self.recorder.record_span(self.name, seconds, cpu_seconds, self.fields)
+        return False
+
+    def set(self, **fields):
+        """Attach fields known only inside the block (row counts, sizes, ...)"""
+        self.fields.update(fields)
+
+class Recorder:
+    """Collects spans and counters for one process"""
+
+    def __init__(self, mode, path=None):
+        self.mode = mode
+        self.path = path
+        self.lock = threading.Lock()
+        self.spans = {}
+        self.counters = {}
+        self.started = time.perf_counter()
+        self.flushed = False
+
+    def write(self, text):
+        if self.path:
+            with open(self.path, 'a') as f:
+                f.write(text)
+        else:
+            sys.stderr.write(text)
+
+    def record_span(self, name, seconds, cpu_seconds, fields):
+        with self.lock:
+            totals = self.spans.setdefault(name, [0, 0.0, 0.0, 0.0])
+            totals[0] += 1
+            totals[1] += seconds
+            totals[2] += cpu_seconds
+            totals[3] = max(totals[3], seconds)
+            if self.mode == 'jsonl':
+                event = {'event': 'span', 'name': name, 'seconds': round(seconds, 6),
+                         'cpuSeconds': round(cpu_seconds, 6), 'time': time.time()}
+                event.update(fields)
+                self.write(json.dumps(event, default=str) + '\n')
+
+    def count(self, name, value):
+        with self.lock:
+            self.counters[name] = self.counters.get(name, 0) + value
+
+    def flush(self):
+        """Write the counters (jsonl) or the summary block, once"""
+        with self.lock:
+            if self.flushed:
+                return
+            self.flushed = True
+            elapsed = time.perf_counter() - self.started
+            if self.mode == 'jsonl':
+                event = {'event': 'counters', 'pid': os.getpid(), 'seconds': round(elapsed, 6),
+                         'counters': self.counters, 'time': time.time()}
+                self.write(json.dumps(event) + '\n')
+                return
+
+            lines = [f"Build metrics (pid {os.getpid()}, {elapsed:.2f}s):"]
+            for name, (spans, seconds, cpu_seconds, longest) in sorted(self.spans.items()):
+                lines.append(f"  {name:24s} {spans:6d}x  wall {seconds:9.3f}s  cpu {cpu_seconds:9.3f}s  "
+                             f"max {longest:8.3f}s")
+            for name, value in sorted(self.counters.items()):
+                lines.append(f"  {name:24s} {value}")
+            self.write('\n'.join(lines) + '\n')
+
+def configure(mode=None, path=None):
+    """(Re)configure metrics; mode is 'summary', 'jsonl' or None/'off' to disable"""
+    global _recorder
+    if _recorder is not None:
+        _recorder.flush()
+    mode = (mode or 'off').lower()
+    if mode in ('off', '0', 'false', 'no', ''):
+        _recorder = None
+        return None
+    if mode not in ('summary', 'jsonl'):
+        mode = 'summary'
+    _recorder = Recorder(mode, path)
+    return _recorder
+
+def enabled():
+    return _recorder is not None
+
+def span(name, **fields):
+    """Context manager timing a block as span `name`"""
+    recorder = _recorder
+    if recorder is None:
+        return _NULL_SPAN
+    return Span(recorder, name, fields)
+
+def count(name, value=1):
+    """Add value to counter `name`"""
+    recorder = _recorder
+    if recorder is not None:
+        recorder.count(name, value)
+
+def flush():
+    """Emit the summary/counters now instead of at exit"""
+    if _recorder is not None:
+        _recorder.flush()
+
+configure(os.environ.get('NBA_METRICS'), os.environ.get('NBA_METRICS_FILE'))
+atexit.register(flush)
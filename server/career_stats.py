@@ -0,0 +1,165 @@
+#!/usr/bin/env python3
+"""Career aggregation shared by nba_data.py and the dataset scripts.
+
+Career averages are computed for every player at once from a flat
+player-season table: rows are ordered by (player, season descending) in a
+single sort and each per-player segment is reduced with NumPy. Segments are
+reduced season-by-season (one vector operation per career year rather than
+per player), which keeps the additions in the same order as the original
+per-player Python loops, so the results are bit-for-bit identical to them.
+"""
+
+from operator import itemgetter
+
+import numpy as np
+
+# Per-game stats averaged over the career weighted by games played
+WEIGHTED_FIELDS = [
+    'minutesPerGame', 'points', 'assists', 'rebounds', 'steals', 'blocks',
+    'turnovers', 'plusMinus'
+]
+
+# Percentages averaged over the seasons where they are non-zero
+PERCENTAGE_FIELDS = ['fieldGoalPercentage', 'threePointPercentage', 'freeThrowPercentage']
+
+# Columns the engine reads from a player-season table
+TABLE_COLUMNS = ['season', 'team', 'position', 'gamesPlayed'] + WEIGHTED_FIELDS + PERCENTAGE_FIELDS
+
+def position_blocks(starts, lengths):
+    """Row indices grouped by position within their segment (first rows, second rows, ...)"""
+    positions = np.arange(lengths.sum()) - np.repeat(starts, lengths)
+    by_position = np.argsort(positions, kind='stable')
+    bounds = np.cumsum(np.bincount(positions)).tolist()
+    return [by_position[lo:hi] for lo, hi in zip([0] + bounds[:-1], bounds)]
+
+def segment_sum(values, segment_ids, blocks, segment_count):
+    """Sum the rows of values per segment, adding each segment's rows in order"""
+    totals = np.zeros((segment_count,) + values.shape[1:], dtype=values.dtype)
+    for rows in blocks:
+        totals[segment_ids[rows]] += values[rows]
+    return totals
+
+def safe_divide(numerator, denominator):
+    """Elementwise numerator / denominator with 0.0 wherever the denominator is 0"""
+    result = np.zeros(numerator.shape, dtype='float64')
+    nonzero = np.broadcast_to(denominator > 0, numerator.shape)
+    result[nonzero] = (numerator / np.where(denominator > 0, denominator, 1))[nonzero]
+    return result
+
+def season_codes(seasons):
+    """Sorted unique season labels and each row's integer code into them"""
+    labels = sorted(set(seasons))
+    lookup = {season: code for code, season in enumerate(labels)}
+    return labels, np.fromiter(map(lookup.__getitem__, seasons), dtype='int64', count=len(seasons))
+
+def aggregate_careers(table, key='playerId'):
+    """Career averages for every player in a flat player-season table.
+
+    `table` maps column names to equal-length sequences (one entry per
+    player-season) and must contain `key` plus TABLE_COLUMNS. Returns a dict
+    of per-player columns: the key, currentSeason/team/position from the latest
+    season, gamesPlayed and the career averages, plus `order`/`starts`/`lengths`
+    describing the rows sorted by player and most recent season first.
+    """
+    keys = np.asarray(table[key])
+    labels, codes = season_codes(table['season'])
+
+    # One stable sort: by player, then most recent season first
+    order = np.lexsort((-codes, keys))
+    sorted_keys = keys[order]
+
+    boundaries = np.flatnonzero(sorted_keys[1:] != sorted_keys[:-1]) + 1
+    starts = np.concatenate(([0], boundaries)).astype('int64') if len(order) else np.zeros(0, dtype='int64')
+    lengths = np.diff(np.append(starts, len(order)))
+    segment_ids = np.repeat(np.arange(len(starts)), lengths)
+    blocks = position_blocks(starts, lengths)
+
+    games = np.asarray(table['gamesPlayed'], dtype='int64')[order]
+    total_games = segment_sum(games, segment_ids, blocks, len(starts))
+
+    # Games-weighted stats, percentage sums and percentage season counts in one pass
+    weighted = np.column_stack([np.asarray(table[field], dtype='float64') for field in WEIGHTED_FIELDS])[order]
+    percentages = np.column_stack([np.asarray(table[field], dtype='float64') for field in PERCENTAGE_FIELDS])[order]
+    counted = percentages > 0
+    stacked = np.hstack([weighted * games[:, None], np.where(counted, percentages, 0.0), counted])
+    totals = segment_sum(stacked, segment_ids, blocks, len(starts))
+
+    field_count = len(WEIGHTED_FIELDS)
+    pct_count = len(PERCENTAGE_FIELDS)
+    averages = safe_divide(totals[:, :field_count], total_games[:, None])
+    pct_averages = safe_divide(totals[:, field_count:field_count + pct_count], totals[:, field_count + pct_count:])
+
+    latest_rows = order[starts].tolist()
+    careers = {
+        key: sorted_keys[starts],
+        'currentSeason': [labels[code] for code in codes[latest_rows].tolist()],
+        'team': [table['team'][row] for row in latest_rows],
+        'position': [table['position'][row] for row in latest_rows],
+        'gamesPlayed': total_games,
+    }
+    for index, field in enumerate(WEIGHTED_FIELDS):
+        careers[field] = averages[:, index]
+    for index, field in enumerate(PERCENTAGE_FIELDS):
+        careers[field] = pct_averages[:, index]
+    careers['order'] = order
+    careers['starts'] = starts
+    careers['lengths'] = lengths
+    return careers
+
+def update_career_stats(players, min_seasons=1):
+    """Recompute career averages in place for player dicts with nested seasons.
+
+    Players with at least `min_seasons` seasons get their seasons sorted most
+    recent first and their career fields (currentSeason, team, gamesPlayed,
+    averages, availableSeasons, ...) overwritten. Returns the updated players.
+    """
+    eligible = [player for player in players
+                if len(player.get('seasons') or []) >= max(min_seasons, 1)]
+
+    owners = []
+    flat_seasons = []
+    for index, player in enumerate(eligible):
+        owners.extend([index] * len(player['seasons']))
+        flat_seasons.extend(player['seasons'])
+
+    table = dict(zip(TABLE_COLUMNS, zip(*map(itemgetter(*TABLE_COLUMNS), flat_seasons))))
+    if not flat_seasons:
+        table = {column: [] for column in TABLE_COLUMNS}
+    table['owner'] = owners
+
+    careers = aggregate_careers(table, key='owner')
+
+    ordered_seasons = [flat_seasons[row] for row in careers['order'].tolist()]
+    columns = [careers['owner'].tolist(), careers['starts'].tolist(), careers['lengths'].tolist(),
+               careers['currentSeason'], careers['team'], careers['position'],
+               careers['gamesPlayed'].tolist()]
+    columns += [careers[field].tolist() for field in ['minutesPerGame', 'points', 'assists',
+                                                      'rebounds', 'steals', 'blocks', 'turnovers']]
+    columns += [careers[field].tolist() for field in PERCENTAGE_FIELDS]
+    columns += [careers['plusMinus'].tolist()]
+
+    for (owner, start, length, current_season, team, position, games, minutes, points,
+         assists, rebounds, steals, blocks, turnovers, fg_pct, three_pct, ft_pct,
+         plus_minus) in zip(*columns):
+        player = eligible[owner]
+        player['seasons'][:] = ordered_seasons[start:start + length]
+        player.update({
+            'currentSeason': current_season,
+            'team': team,
+            'position': position,
+            'gamesPlayed': games,
+            'minutesPerGame': minutes,
+            'points': points,
+            'assists': assists,
+            'rebounds': rebounds,
+            'steals': steals,
+            'blocks': blocks,
+            'turnovers': turnovers,
+            'fieldGoalPercentage': fg_pct,
+            'threePointPercentage': three_pct,
+            'freeThrowPercentage': ft_pct,
+            'plusMinus': plus_minus,
+            'availableSeasons': [season['season'] for season in player['seasons']]
+        })
+
+    return players
@@ -0,0 +1,43 @@
+import { createHash } from 'crypto';
+import path from 'path';
+import { PythonWorker, PythonWorkerError, INVALID_PARAMS } from './python-worker';
+
+export interface FormulaLeaderboardRow {
+  playerId: number;
+  season: string;
+  team: string;
+  customStat: number;
+  rank: number;
+}
+
+// Code formula_engine.py answers when it does not hold the requested dataset
+// version (DATASET_NOT_LOADED there)
+const DATASET_NOT_LOADED = -32001;
+
+// Long-lived `formula_engine.py --worker` process. It evaluates formulas over
+// the player-season table of the players it was given with loadDataset and
+// caches leaderboards by canonical formula, season and dataset version.
+const formulaWorker = new PythonWorker(path.join(__dirname, 'formula_engine.py'), 'Formula worker');
+
+// Ranks the given players (rows of nba_players, seasons included). The worker
+// keeps one copy of them keyed on a hash of their content, so they are only
+// sent again after the database changes or the worker restarts.
+export async function calculateFormula(formula: string, season: string | undefined,
+                                       players: unknown[]): Promise<FormulaLeaderboardRow[]> {
+  const version = createHash('sha1').update(JSON.stringify(players)).digest('hex');
+  const params = { formula, season: season || null, version };
+  try {
+    return await formulaWorker.call('calculateFormula', params);
+  } catch (error) {
+    if (!(error instanceof PythonWorkerError && error.code === DATASET_NOT_LOADED)) {
+      throw error;
+    }
+  }
+  await formulaWorker.call('loadDataset', { version, players });
+  return formulaWorker.call('calculateFormula', params);
+}
+
+// True when the worker rejected the formula itself (syntax, unknown stat)
+export function isFormulaError(error: unknown): error is PythonWorkerError {
+  return error instanceof PythonWorkerError && error.code === INVALID_PARAMS;
+}
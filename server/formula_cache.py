@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+"""LRU cache for formula leaderboards.
+
+Community stats are evaluated over and over against the same dataset, so the
+formula worker keeps encoded leaderboards keyed on (canonical formula, season,
+dataset content hash). The canonical form is the parsed AST with the operands
+of + and * chains flattened and sorted, so "AST + PTS" and "pts+ast" share an
+entry. A new dataset has a new hash, so stale leaderboards can never be
+served; the cache is bounded by the total size of the encoded results.
+"""
+
+import ast
+import os
+from collections import OrderedDict
+
+# Default memory budget for cached leaderboards
+DEFAULT_CACHE_MB = 64
+
+COMMUTATIVE_OPERATORS = (ast.Add, ast.Mult)
+
+def cache_budget():
+    """Cache size limit in bytes (env NBA_FORMULA_CACHE_MB, 0 disables caching)"""
+    try:
+        return int(float(os.environ.get('NBA_FORMULA_CACHE_MB', DEFAULT_CACHE_MB)) * 1024 * 1024)
+    except ValueError:
+        return DEFAULT_CACHE_MB * 1024 * 1024
+
+def commutative_operands(node, operator):
+    """Operands of a chain of the same commutative operator, e.g. a + (b + c) -> [a, b, c]"""
+    if isinstance(node, ast.BinOp) and isinstance(node.op, operator):
+        return commutative_operands(node.left, operator) + commutative_operands(node.right, operator)
+    return [node]
+
+def canonical_formula(node):
+    """Canonical text for a formula AST; equal for formulas that differ only in
+    operand order of + and *, spacing, case or int/float literals"""
+    if isinstance(node, ast.Expression):
+        return canonical_formula(node.body)
+    if isinstance(node, ast.BinOp) and isinstance(node.op, COMMUTATIVE_OPERATORS):
+        operator = type(node.op)
+        operands = sorted(canonical_formula(operand) for operand in commutative_operands(node, operator))
+        return f"{operator.__name__}({', '.join(operands)})"
+    if isinstance(node, ast.BinOp):
+        return f"{type(node.op).__name__}({canonical_formula(node.left)}, {canonical_formula(node.right)})"
+    if isinstance(node, ast.UnaryOp):
+        return f"{type(node.op).__name__}({canonical_formula(node.operand)})"
+    if isinstance(node, ast.Call):
+        arguments = ', '.join(canonical_formula(argument) for argument in node.args)
+        return f"{node.func.id}({arguments})"
+    if isinstance(node, ast.Constant):
+        return repr(float(node.value))
+    if isinstance(node, ast.Name):
+        return node.id
+    raise ValueError(f"Cannot canonicalize {type(node).__name__}")
+
+def cache_key(tree, season, dataset_version):
+    """Cache key for a formula evaluated for a season against a dataset version"""
+    return (canonical_formula(tree), season or 'all-time', dataset_version)
+
+class FormulaCache:
+    """Least-recently-used cache of encoded results, bounded by their total size"""
+
+    def __init__(self, max_bytes=None):
+        self.max_bytes = cache_budget() if max_bytes is None else max_bytes
+        self.entries = OrderedDict()
+        self.size = 0
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key):
+        """Cached value for key (marking it most recently used), or None"""
+        value = self.entries.get(key)
+        if value is None:
+            self.misses += 1
+            return None
+        self.entries.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def put(self, key, value):
+        """Store an encoded value, evicting least recently used entries to stay in budget"""
+        if len(value) > self.max_bytes:
+            return
+        if key in self.entries:
+            self.size -= len(self.entries.pop(key))
+        self.entries[key] = value
+        self.size += len(value)
+        while self.size > self.max_bytes:
+            _, evicted = self.entries.popitem(last=False)
+            self.size -= len(evicted)
+
+    def clear(self):
+        """Drop every entry"""
+        self.entries.clear()
+        self.size = 0
+
+    def stats(self):
+        """Entry count, size and hit/miss counters"""
+        return {'entries': len(self.entries), 'bytes': self.size, 'maxBytes': self.max_bytes,
+                'hits': self.hits, 'misses': self.misses}
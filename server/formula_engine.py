@@ -0,0 +1,435 @@
+#!/usr/bin/env python3
+"""Vectorized custom-formula evaluation over the player-season table.
+
+/api/nba/calculate used to rewrite the formula string once per player-season
+(regex-substituting every NBA_STAT_MAPPINGS key with that row's value) and
+hand the result to mathjs. Here the formula is tokenized and parsed once into
+a Python AST, checked against the stat vocabulary and compiled; evaluating it
+is then a single NumPy expression over whole columns. The minimum-games rule
+for percentage stats and the "finite and non-zero" rule are applied as masks.
+
+The worker ranks the players the server holds in its database, which Node
+loads into it with loadDataset; the CLI ranks the season store built from
+extended_players.json.
+"""
+
+import ast
+import json
+import os
+import re
+import sys
+from collections import namedtuple
+from decimal import Context, Decimal, ROUND_HALF_UP
+
+import numpy as np
+
+# Mirrors NBA_STAT_MAPPINGS in shared/schema.ts
+STAT_FIELDS = {
+    'PTS': 'points',
+    'AST': 'assists',
+    'REB': 'rebounds',
+    'TOV': 'turnovers',
+    'PLUS_MINUS': 'plusMinus',
+    'FG_PCT': 'fieldGoalPercentage',
+    'FGA': 'fieldGoalAttempts',
+    'FGM': 'fieldGoalsMade',
+    'FT_PCT': 'freeThrowPercentage',
+    'FTA': 'freeThrowAttempts',
+    'FTM': 'freeThrowsMade',
+    'THREE_PCT': 'threePointPercentage',
+    '3PA': 'threePointAttempts',
+    '3PM': 'threePointersMade',
+    'MIN': 'minutesPerGame',
+    'STL': 'steals',
+    'BLK': 'blocks',
+    'GP': 'gamesPlayed',
+    'W_PCT': 'winPercentage',
+}
+
+# Dataset the CLI evaluates against
+DATASET_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'extended_players.json')
+
+# Formulas mentioning any of these only rank seasons with enough games
+PERCENTAGE_STATS = ['W_PCT', 'FG_PCT', 'FG%', '3P_PCT', '3P%', 'FT_PCT', 'FT%']
+MIN_GAMES_FOR_PERCENTAGES = 10
+
+# Season label of the career row for a player without seasons and without a
+# current season, as /api/nba/calculate labels it
+DEFAULT_CAREER_SEASON = '2024-25'
+
+# JSON-RPC error code for a calculateFormula whose dataset version the worker
+# does not hold; the caller answers with loadDataset and retries
+DATASET_NOT_LOADED = -32001
+
+# Math functions formulas may call, as NumPy equivalents. MIN is the minutes
+# stat, so there is no min()/max().
+FUNCTIONS = {
+    'ABS': np.abs,
+    'SQRT': np.sqrt,
+    'CBRT': np.cbrt,
+    'EXP': np.exp,
+    'LOG': lambda value, base=None: np.log(value) if base is None else np.log(value) / np.log(base),
+    'LOG10': np.log10,
+    'LOG2': np.log2,
+    'POW': np.power,
+    'FLOOR': np.floor,
+    'CEIL': np.ceil,
+    'ROUND': lambda value, digits=0: mathjs_round(value, int(digits)),
+}
+
+# (fewest, most) arguments of each function, as mathjs accepts them
+FUNCTION_ARITY = {
+    'ABS': (1, 1),
+    'SQRT': (1, 1),
+    'CBRT': (1, 1),
+    'EXP': (1, 1),
+    'LOG': (1, 2),
+    'LOG10': (1, 1),
+    'LOG2': (1, 1),
+    'POW': (2, 2),
+    'FLOOR': (1, 1),
+    'CEIL': (1, 1),
+    'ROUND': (1, 2),
+}
+
+# mathjs only rounds to a constant, whole number of decimals in this range
+MAX_ROUND_DIGITS = 15
+
+# Constants mathjs defines under upper-case names
+CONSTANTS = {'PI': np.pi, 'E': np.e}
+
+ALLOWED_NODES = (
+    ast.Expression, ast.BinOp, ast.UnaryOp, ast.Call, ast.Name, ast.Load, ast.Constant,
+    ast.Add, ast.Sub, ast.Mult, ast.Div, ast.Mod, ast.Pow, ast.UAdd, ast.USub
+)
+
+TOKEN_PATTERN = re.compile(r'''
+    \s*(?:
+        (?P<name>(?:3PA|3PM)(?![A-Z0-9_])|[A-Z_][A-Z0-9_]*)
+      | (?P<number>(?:\d+\.?\d*|\.\d+)(?:E[+-]?\d+)?)
+      | (?P<op>\*\*|[-+*/^%(),])
+    )''', re.VERBOSE)
+
+# Enough precision to quantize any finite float64 exactly
+DECIMAL_CONTEXT = Context(prec=400)
+
+# mathjs' relTol / absTol: ROUND first snaps values this close to 12 decimals
+ROUND_EPSILON_DIGITS = 12
+ROUND_RELATIVE_TOLERANCE = 1e-12
+ROUND_ABSOLUTE_TOLERANCE = 1e-15
+
+CompiledFormula = namedtuple('CompiledFormula', ['formula', 'tree', 'code', 'fields', 'uses_percentages'])
+
+class FormulaError(ValueError):
+    """Raised when a formula cannot be parsed or uses unknown names"""
+
+def tokenize(formula):
+    """Split an upper-cased formula into (kind, text) tokens"""
+    tokens = []
+    position = 0
+    formula = formula.rstrip()
+    while position < len(formula):
+        match = TOKEN_PATTERN.match(formula, position)
+        if not match:
+            raise FormulaError(f"Unexpected character '{formula[position:].strip()[:1]}' in formula")
+        kind = match.lastgroup
+        tokens.append((kind, match.group(kind)))
+        position = match.end()
+    return tokens
+
+def python_source(tokens):
+    """Translate formula tokens into Python expression source.
+
+    Stats become their field names, functions their lower-case names, '^' is
+    power, and a number or ')' directly before '(' or a name multiplies, as
+    mathjs implicit multiplication does.
+    """
+    parts = []
+    previous = None
+    for kind, text in tokens:
+        if previous is not None and (previous[0] == 'number' or previous[1] == ')') \
+                and (kind == 'name' or text == '('):
+            parts.append('*')
+        if kind == 'name':
+            if text in STAT_FIELDS:
+                parts.append(STAT_FIELDS[text])
+            elif text in FUNCTIONS:
+                parts.append(text.lower())
+            elif text in CONSTANTS:
+                parts.append(repr(CONSTANTS[text]))
+            else:
+                raise FormulaError(f"Unknown stat '{text}'. Valid stats: {', '.join(STAT_FIELDS)}")
+        elif text == '^':
+            parts.append('**')
+        else:
+            parts.append(text)
+        previous = (kind, text)
+    return ' '.join(parts)
+
+def constant_value(node):
+    """Value of a numeric literal, optionally signed, or None for anything else"""
+    if isinstance(node, ast.UnaryOp) and isinstance(node.op, (ast.UAdd, ast.USub)):
+        value = constant_value(node.operand)
+        return None if value is None else (-value if isinstance(node.op, ast.USub) else value)
+    if isinstance(node, ast.Constant) and isinstance(node.value, (int, float)):
+        return node.value
+    return None
+
+def validate_call(node, name):
+    """Check a function call's argument count and constant arguments"""
+    fewest, most = FUNCTION_ARITY[name]
+    if not fewest <= len(node.args) <= most:
+        expected = str(fewest) if fewest == most else f"{fewest} or {most}"
+        plural = '' if expected == '1' else 's'
+        raise FormulaError(f"{name} takes {expected} argument{plural}, got {len(node.args)}")
+    if name == 'ROUND' and len(node.args) == 2:
+        digits = constant_value(node.args[1])
+        if digits is None or digits != int(digits) or not 0 <= digits <= MAX_ROUND_DIGITS:
+            raise FormulaError(f"ROUND decimals must be a whole number from 0 to {MAX_ROUND_DIGITS}")
+
+def validate_tree(tree):
+    """Reject anything but arithmetic on stats, numbers and known functions called correctly"""
+    functions = {name.lower(): name for name in FUNCTIONS}
+    called = set()
+    # ast.walk visits a call before the name it calls
+    for node in ast.walk(tree):
+        if not isinstance(node, ALLOWED_NODES):
+            raise FormulaError(f"Unsupported syntax in formula: {type(node).__name__}")
+        if isinstance(node, ast.Call):
+            if not isinstance(node.func, ast.Name) or node.func.id not in functions or node.keywords:
+                raise FormulaError("Only built-in math functions can be called in a formula")
+            validate_call(node, functions[node.func.id])
+            called.add(id(node.func))
+        if isinstance(node, ast.Name) and node.id in functions and id(node) not in called:
+            raise FormulaError(f"{functions[node.id]} is a function and needs arguments, e.g. {functions[node.id]}(PTS)")
+        if isinstance(node, ast.Constant) and not isinstance(node.value, (int, float)):
+            raise FormulaError("Formulas may only contain numbers, stats and operators")
+
+def compile_formula(formula):
+    """Parse, validate and compile a formula once for column-wise evaluation"""
+    formula_upper = formula.upper()
+    source = python_source(tokenize(formula_upper))
+    try:
+        tree = ast.parse(source, mode='eval')
+    except SyntaxError:
+        raise FormulaError("Invalid formula syntax. Please check your mathematical expression.")
+    validate_tree(tree)
+
+    fields = sorted({node.id for node in ast.walk(tree)
+                     if isinstance(node, ast.Name) and node.id in STAT_FIELDS.values()})
+    if not fields:
+        raise FormulaError(f"Formula must contain at least one valid NBA stat: {', '.join(STAT_FIELDS)}")
+
+    uses_percentages = any(stat in formula_upper for stat in PERCENTAGE_STATS)
+    code_tree = ast.fix_missing_locations(ModuloCalls().visit(ast.parse(source, mode='eval')))
+    code = compile(code_tree, '<formula>', 'eval')
+    return CompiledFormula(formula, tree, code, fields, uses_percentages)
+
+def evaluate_compiled(compiled, columns, size):
+    """Evaluate a compiled formula over whole columns; missing stats count as 0"""
+    namespace = {name.lower(): function for name, function in FUNCTIONS.items()}
+    namespace['modulo'] = mathjs_mod
+    available = columns.dtype.names if isinstance(columns, np.ndarray) else columns
+    for field in compiled.fields:
+        if field in available:
+            values = np.asarray(columns[field], dtype='float64')
+            namespace[field] = np.nan_to_num(values, nan=0.0)
+        else:
+            namespace[field] = np.zeros(size)
+
+    with np.errstate(all='ignore'):
+        values = eval(compiled.code, {'__builtins__': {}}, namespace)
+    return np.broadcast_to(np.asarray(values, dtype='float64'), (size,))
+
+def mathjs_round_value(value, digits):
+    """mathjs round(value, digits) of one float, computed on its shortest decimal form"""
+    exact = Decimal(repr(value))
+    if digits < ROUND_EPSILON_DIGITS:
+        snapped = exact.quantize(Decimal(1).scaleb(-ROUND_EPSILON_DIGITS), rounding=ROUND_HALF_UP,
+                                 context=DECIMAL_CONTEXT)
+        tolerance = max(ROUND_RELATIVE_TOLERANCE * max(abs(value), abs(float(snapped))), ROUND_ABSOLUTE_TOLERANCE)
+        if abs(value - float(snapped)) <= tolerance:
+            exact = snapped
+    return float(exact.quantize(Decimal(1).scaleb(-digits), rounding=ROUND_HALF_UP, context=DECIMAL_CONTEXT))
+
+def mathjs_round(values, digits=0):
+    """ROUND as mathjs computes it: ties away from zero on the decimal value users see
+    (ROUND(2.5) = 3, ROUND(2.675, 2) = 2.68), not NumPy's round-half-to-even"""
+    values = np.asarray(values, dtype='float64')
+    flat = values.reshape(-1)
+    scale = 10.0 ** digits
+    scaled = flat * scale
+    rounded = np.sign(scaled) * np.floor(np.abs(scaled) + 0.5) / scale
+    # Near-ties and values too large to scale exactly are settled in decimal
+    fraction = np.abs(scaled - np.trunc(scaled))
+    ambiguous = np.isfinite(scaled) & (
+        (np.abs(fraction - 0.5) <= 1e-7 * np.maximum(np.abs(scaled), 1))
+        | (np.abs(scaled) >= 2 ** 52) | (digits >= ROUND_EPSILON_DIGITS - 4))
+    for row in np.flatnonzero(ambiguous).tolist():
+        rounded[row] = mathjs_round_value(float(flat[row]), digits)
+    return rounded.reshape(values.shape)
+
+def mathjs_mod(left, right):
+    """x % y as mathjs computes it: floored, and x itself when y is 0"""
+    left, right = np.broadcast_arrays(np.asarray(left, dtype='float64'), np.asarray(right, dtype='float64'))
+    return np.where(right == 0, left, left - right * np.floor(left / np.where(right == 0, 1, right)))
+
+class ModuloCalls(ast.NodeTransformer):
+    """Rewrite a % b into modulo(a, b) so it follows mathjs for a zero divisor"""
+
+    def visit_BinOp(self, node):
+        self.generic_visit(node)
+        if isinstance(node.op, ast.Mod):
+            return ast.copy_location(ast.Call(ast.Name('modulo', ast.Load()), [node.left, node.right], []), node)
+        return node
+
+def round_half_up(values):
+    """Round to 2 decimals exactly like JavaScript's Number(x.toFixed(2))"""
+    scaled = values * 100
+    rounded = np.rint(scaled) / 100
+    # Values whose scaled form sits within rounding error of .5 (including exact
+    # ties, which toFixed rounds away from zero) or is too large to scale exactly
+    fraction = np.abs(scaled - np.trunc(scaled))
+    ambiguous = (np.abs(fraction - 0.5) <= 1e-9 * np.maximum(np.abs(scaled), 1)) | (np.abs(scaled) >= 2 ** 52)
+    for row in np.flatnonzero(ambiguous).tolist():
+        exact = DECIMAL_CONTEXT.create_decimal(float(values[row]))
+        rounded[row] = float(exact.quantize(Decimal('0.01'), rounding=ROUND_HALF_UP, context=DECIMAL_CONTEXT))
+    return rounded
+
+def player_columns(players):
+    """Columnar player-season table of player dicts as the database holds them.
+
+    Every entry of a player's seasons is a row. A player whose seasons are
+    missing gets one row of their career averages instead, marked in the
+    careerRow column, which only all-time leaderboards rank.
+    """
+    rows = []
+    for player in players:
+        seasons = player.get('seasons')
+        if isinstance(seasons, list):
+            rows.extend((player['playerId'], season.get('season'), season.get('team'), False, season)
+                        for season in seasons)
+        else:
+            rows.append((player['playerId'], player.get('currentSeason') or DEFAULT_CAREER_SEASON,
+                         player.get('team'), True, player))
+
+    columns = {
+        'playerId': np.array([row[0] for row in rows], dtype='int64'),
+        'season': np.array([row[1] for row in rows], dtype=object),
+        'team': np.array([row[2] for row in rows], dtype=object),
+        'careerRow': np.array([row[3] for row in rows], dtype=bool),
+    }
+    for field in STAT_FIELDS.values():
+        columns[field] = np.array([float(row[4].get(field) or 0) for row in rows], dtype='float64')
+    return columns
+
+def formula_rows(compiled, columns, season=None):
+    """Rows that take part in a leaderboard and their unrounded formula values.
+
+    With a season, each player contributes their first row for that season
+    (never a career row); otherwise every player-season counts.
+    """
+    size = len(columns['playerId'])
+    candidates = np.ones(size, dtype=bool)
+
+    if season and season != 'all-time':
+        candidates = np.asarray(columns['season']) == season
+        if 'careerRow' in columns:
+            candidates &= ~np.asarray(columns['careerRow'])
+        first_rows = np.flatnonzero(candidates)
+        _, first_index = np.unique(np.asarray(columns['playerId'])[first_rows], return_index=True)
+        candidates = np.zeros(size, dtype=bool)
+        candidates[first_rows[first_index]] = True
+
+    if compiled.uses_percentages:
+        candidates &= np.asarray(columns['gamesPlayed']) >= MIN_GAMES_FOR_PERCENTAGES
+
+    values = evaluate_compiled(compiled, columns, size)
+    candidates &= np.isfinite(values) & (values != 0)
+    rows = np.flatnonzero(candidates)
+    return rows, values[rows]
+
+def formula_leaderboard(formula, columns, season=None):
+    """Rank player-seasons by a formula, highest first.
+
+    `columns` is the columnar player-season table (the season store,
+    player_columns() or any dict of arrays with playerId, season, team,
+    gamesPlayed and stat fields).
+    Returns [{'playerId', 'season', 'team', 'customStat', 'rank'}, ...].
+    """
+    compiled = formula if isinstance(formula, CompiledFormula) else compile_formula(formula)
+    rows, values = formula_rows(compiled, columns, season)
+
+    custom_stats = round_half_up(values)
+    order = np.argsort(-custom_stats, kind='stable')
+    rows = rows[order]
+
+    return [
+        {'playerId': player_id, 'season': row_season, 'team': team, 'customStat': custom_stat, 'rank': rank}
+        for rank, (player_id, row_season, team, custom_stat) in enumerate(zip(
+            np.asarray(columns['playerId'])[rows].tolist(),
+            np.asarray(columns['season'])[rows].tolist(),
+            np.asarray(columns['team'])[rows].tolist(),
+            custom_stats[order].tolist()), start=1)
+    ]
+
+def run_worker():
+    """Serve formula leaderboards over line-delimited JSON-RPC on stdin/stdout.
+
+    The players come from the caller: loadDataset(version, players) replaces
+    the table with the given player dicts under the caller's content version,
+    and calculateFormula answers DATASET_NOT_LOADED for any other version, so
+    a leaderboard is always computed from the rows the caller holds.
+    Leaderboards are cached already encoded, keyed on the canonical formula,
+    the season and the dataset version; loading a new version drops them.
+    """
+    from formula_cache import FormulaCache, cache_key
+    from rpc_worker import EncodedResult, RpcError, serve
+
+    cache = FormulaCache()
+    dataset = {}
+
+    def load_dataset(version, players):
+        columns = player_columns(players)
+        if dataset.get('version') != version:
+            cache.clear()
+        dataset.update(version=version, columns=columns)
+        return len(columns['playerId'])
+
+    def calculate_formula(formula, season=None, version=None):
+        if version is None or dataset.get('version') != version:
+            raise RpcError(DATASET_NOT_LOADED, f"Dataset version {version} is not loaded")
+        compiled = compile_formula(formula)
+        key = cache_key(compiled.tree, season, version)
+        encoded = cache.get(key)
+        if encoded is None:
+            encoded = EncodedResult(json.dumps(formula_leaderboard(compiled, dataset['columns'], season)))
+            cache.put(key, encoded)
+        return encoded
+
+    serve({
+        'loadDataset': load_dataset,
+        'calculateFormula': calculate_formula,
+        'cacheStats': cache.stats,
+        'ping': lambda: 'pong'
+    }, invalid_params_errors=FormulaError)
+
+if __name__ == "__main__":
+    # Usage: formula_engine.py "<formula>" [season|all-time], or --worker
+    if len(sys.argv) > 1 and sys.argv[1] == '--worker':
+        run_worker()
+        sys.exit(0)
+
+    from season_store import open_season_store
+
+    if len(sys.argv) < 2:
+        print("Usage: formula_engine.py \"<formula>\" [season]", file=sys.stderr)
+        sys.exit(1)
+
+    try:
+        store = open_season_store(DATASET_PATH)
+        results = formula_leaderboard(sys.argv[1], store, sys.argv[2] if len(sys.argv) > 2 else None)
+    except FormulaError as e:
+        print(json.dumps({'error': str(e)}))
+        sys.exit(1)
+    print(json.dumps(results))
@@ -0,0 +1,139 @@
+#!/usr/bin/env python3
+"""Shared on-disk cache for raw NBA stats API responses.
+
+Responses are keyed by endpoint name plus the normalized request parameters
+and stored gzip-compressed under NBA_CACHE_DIR (default server/.nba_cache).
+Past seasons never change, so their entries never expire; the current season
+and season-less requests are refetched once NBA_CACHE_TTL seconds have passed.
+Set NBA_CACHE=off to bypass the cache entirely. Requests that do reach the
+API go through nba_throttle (shared rate limit, retries, circuit breaker)
+over nba_http's pooled keep-alive session. Hits and misses are counted in
+build_metrics when NBA_METRICS is set.
+"""
+
+import gzip
+import hashlib
+import json
+import os
+import sys
+import threading
+import time
+from datetime import date
+
+from build_metrics import count, span
+from nba_http import install_shared_session
+from nba_throttle import HTTPStatusError, execute
+
+CACHE_DIR = os.environ.get(
+    'NBA_CACHE_DIR',
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), '.nba_cache')
+)
+
+# Six hours keeps nightly and ad-hoc rebuilds cheap while the live season moves
+DEFAULT_CURRENT_SEASON_TTL = 6 * 60 * 60
+
+def cache_enabled():
+    """Whether responses should be read from and written to the disk cache"""
+    return os.environ.get('NBA_CACHE', 'on').lower() not in ('off', '0', 'false', 'no')
+
+def current_season_ttl():
+    """Read the current-season TTL in seconds from NBA_CACHE_TTL"""
+    try:
+        return int(os.environ.get('NBA_CACHE_TTL', DEFAULT_CURRENT_SEASON_TTL))
+    except ValueError:
+        return DEFAULT_CURRENT_SEASON_TTL
+
+def current_season(today=None):
+    """Season string (e.g. '2024-25') of the season in progress on the given day"""
+    today = today or date.today()
+    start_year = today.year if today.month >= 10 else today.year - 1
+    return f"{start_year}-{str(start_year + 1)[-2:]}"
+
+def normalize_parameters(parameters):
+    """Stringify parameter values so equivalent requests share one cache entry"""
+    return {key: '' if value is None else str(value) for key, value in sorted(parameters.items())}
+
+def cache_path(endpoint, parameters):
+    """Location of the cache file for an endpoint request"""
+    endpoint = endpoint.lower()
+    normalized = json.dumps(normalize_parameters(parameters), sort_keys=True)
+    digest = hashlib.sha256(f"{endpoint}?{normalized}".encode('utf-8')).hexdigest()
+    return os.path.join(CACHE_DIR, endpoint, f"{digest}.json.gz")
+
+def is_immutable(parameters):
+    """Requests pinned to a finished season can be cached forever"""
+    season = parameters.get('Season')
+    return bool(season) and season != current_season()
+
+def read_cached_response(endpoint, parameters):
+    """Return the cached raw response text, or None when missing or expired"""
+    if not cache_enabled():
+        return None
+
+    path = cache_path(endpoint, parameters)
+    try:
+        if not is_immutable(parameters):
+            age = time.time() - os.path.getmtime(path)
+            if age > current_season_ttl():
+                return None
+        with gzip.open(path, 'rt', encoding='utf-8') as f:
+            return f.read()
+    except FileNotFoundError:
+        return None
+    except (OSError, EOFError) as e:
+        print(f"Ignoring unreadable cache entry {path}: {e}", file=sys.stderr)
+        return None
+
+def write_cached_response(endpoint, parameters, raw_response):
+    """Atomically store a raw response text in the cache"""
+    if not cache_enabled():
+        return
+
+    path = cache_path(endpoint, parameters)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    with gzip.open(tmp_path, 'wt', encoding='utf-8') as f:
+        f.write(raw_response)
+    os.replace(tmp_path, path)
+
+def send_request(endpoint, timeout):
+    """One network request for an endpoint, raising HTTPStatusError on error statuses"""
+    install_shared_session()
+    endpoint.timeout = timeout
+    endpoint.nba_response = None
+    try:
+        endpoint.get_request()
+    except Exception:
+        # Throttled requests come back as error pages that fail to parse
+        status_code = getattr(endpoint.nba_response, '_status_code', None)
+        if status_code is not None and status_code >= 400:
+            raise HTTPStatusError(status_code)
+        raise
+    return endpoint
+
+def fetch_endpoint(endpoint_class, refresh=False, **kwargs):
+    """Build an nba_api endpoint, loading its response from the cache when possible.
+
+    The returned object behaves exactly like `endpoint_class(**kwargs)`, so
+    callers keep using get_data_frames() and friends unchanged. With
+    refresh=True the cached entry is skipped and replaced by a fresh response.
+    """
+    from nba_api.stats.library.http import NBAStatsResponse
+
+    endpoint = endpoint_class(get_request=False, **kwargs)
+    raw_response = None if refresh else read_cached_response(endpoint.endpoint, endpoint.parameters)
+
+    if raw_response is None:
+        count('cache.misses')
+        with span('request', endpoint=endpoint.endpoint):
+            execute(endpoint.endpoint, lambda timeout: send_request(endpoint, timeout))
+        if endpoint.nba_response.valid_json():
+            write_cached_response(endpoint.endpoint, endpoint.parameters,
+                                  endpoint.nba_response.get_response())
+        return endpoint
+
+    count('cache.hits')
+    endpoint.nba_response = NBAStatsResponse(response=raw_response, status_code=200,
+                                             url=None)
+    endpoint.load_response()
+    return endpoint
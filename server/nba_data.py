@@ -1,14 +1,75 @@
 #!/usr/bin/env python3
 
 import json
+import os
 import sys
+from importlib.util import find_spec
+from build_metrics import count, span
+from profiling import run_profiled
 try:
-    from nba_api.stats.static import players, teams
-    from nba_api.stats.endpoints import leaguedashplayerstats
-    import pandas as pd
-    NBA_API_AVAILABLE = True
+    from career_stats import update_career_stats
+    from player_snapshot import load_players, save_players, snapshot_path
+    DATASET_AVAILABLE = True
 except ImportError:
-    NBA_API_AVAILABLE = False
+    DATASET_AVAILABLE = False
+
+# nba_api, pandas and the HTTP stack are imported only when a season is fetched;
+# serving the extended dataset needs none of them
+NBA_API_AVAILABLE = DATASET_AVAILABLE and all(find_spec(name) is not None for name in ('nba_api', 'pandas'))
+
+# Number of seasons fetched at once when building unified profiles (1 = sequential)
+DEFAULT_FETCH_CONCURRENCY = 4
+
+def get_fetch_concurrency():
+    """Read the season fetch concurrency limit from NBA_FETCH_CONCURRENCY"""
+    try:
+        return max(1, int(os.environ.get('NBA_FETCH_CONCURRENCY', DEFAULT_FETCH_CONCURRENCY)))
+    except ValueError:
+        return DEFAULT_FETCH_CONCURRENCY
+
+def fetch_season_player_stats(season, refresh=False):
+    """Fetch the raw regular season LeagueDashPlayerStats frame for one season"""
+    from nba_api.stats.endpoints import leaguedashplayerstats
+    from nba_cache import fetch_endpoint
+    
+    with span('fetch', season=season) as fetch_span:
+        player_stats = fetch_endpoint(
+            leaguedashplayerstats.LeagueDashPlayerStats,
+            refresh=refresh,
+            season=season,
+            season_type_all_star='Regular Season'
+        )
+        df = player_stats.get_data_frames()[0]
+        fetch_span.set(rows=len(df))
+    return df
+
+def iter_season_frames(seasons, max_workers=None):
+    """Yield (season, frame, error) for each season in the given order.
+
+    With max_workers > 1 up to that many season requests are in flight at once,
+    but results are still handed back in season order so callers merge them
+    exactly as the sequential path would.
+    """
+    if max_workers is None:
+        max_workers = get_fetch_concurrency()
+    
+    if max_workers <= 1:
+        for season in seasons:
+            try:
+                yield season, fetch_season_player_stats(season), None
+            except Exception as e:
+                yield season, None, e
+        return
+    
+    from concurrent.futures import ThreadPoolExecutor
+    
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = [executor.submit(fetch_season_player_stats, season) for season in seasons]
+        for season, future in zip(seasons, futures):
+            try:
+                yield season, future.result(), None
+            except Exception as e:
+                yield season, None, e
 
 def get_nba_players_from_api(season='2024-25'):
     """Get NBA players using the official NBA API"""
@@ -17,14 +78,10 @@ def get_nba_players_from_api(season='2024-25'):
         if season == 'all-time':
             return get_all_time_leaders()
         
-        # Get season player stats
-        player_stats = leaguedashplayerstats.LeagueDashPlayerStats(
-            season=season,
-            season_type_all_star='Regular Season'
-        )
+        from stat_rows import player_records
         
-        # Get the data and convert to dataframe
-        df = player_stats.get_data_frames()[0]
+        # Get season player stats as a dataframe
+        df = fetch_season_player_stats(season)
         
         # Filter for players with at least 5 games played to include more players
         df = df[df['GP'] >= 5]
@@ -35,33 +92,7 @@ def get_nba_players_from_api(season='2024-25'):
         # Take top 200 players instead of 100
         df = df.head(200)
         
-        players_data = []
-        for _, row in df.iterrows():
-            games_played = int(row['GP']) if row['GP'] > 0 else 1  # Avoid division by zero
-            
-            player_data = {
-                'playerId': int(row['PLAYER_ID']),
-                'name': row['PLAYER_NAME'],
-                'team': row['TEAM_ABBREVIATION'],
-                'position': 'G',  # Default, NBA API doesn't provide position in this endpoint
-                'gamesPlayed': games_played,
-                'minutesPerGame': float(row['MIN']) / games_played,
-                'points': float(row['PTS']) / games_played,
-                'assists': float(row['AST']) / games_played,
-                'rebounds': float(row['REB']) / games_played,
-                'steals': float(row['STL']) / games_played,
-                'blocks': float(row['BLK']) / games_played,
-                'turnovers': float(row['TOV']) / games_played,
-                'fieldGoalPercentage': float(row['FG_PCT']) if row['FG_PCT'] else 0.0,
-                'fieldGoalAttempts': float(row['FGA']) / games_played if row['FGA'] else 0.0,
-                'threePointPercentage': float(row['FG3_PCT']) if row['FG3_PCT'] else 0.0,
-                'threePointAttempts': float(row['FG3A']) / games_played if row['FG3A'] else 0.0,
-                'freeThrowPercentage': float(row['FT_PCT']) if row['FT_PCT'] else 0.0,
-                'freeThrowAttempts': float(row['FTA']) / games_played if row['FTA'] else 0.0,
-                'plusMinus': float(row['PLUS_MINUS']) / games_played if row['PLUS_MINUS'] else 0.0,
-                'winPercentage': float(row['W_PCT']) if row['W_PCT'] else 0.0
-            }
-            players_data.append(player_data)
+        players_data = player_records(df)
         
         return players_data
     except Exception as e:
@@ -71,6 +102,8 @@ def get_nba_players_from_api(season='2024-25'):
 def get_historical_legends():
     """Get top 100 historical players from 1996-2010"""
     try:
+        from stat_rows import season_records
+        
         # Sample key historical seasons to identify legends
         historical_sample_seasons = ['2009-10', '2007-08', '2005-06', '2002-03', '1999-00', '1996-97']
         
@@ -79,12 +112,7 @@ def get_historical_legends():
         
         for season in historical_sample_seasons:
             try:
-                player_stats = leaguedashplayerstats.LeagueDashPlayerStats(
-                    season=season,
-                    season_type_all_star='Regular Season'
-                )
-                
-                df = player_stats.get_data_frames()[0]
+                df = fetch_season_player_stats(season)
                 df = df[(df['GP'] >= 20) & (df['PTS'] >= 10)]  # Meaningful players only
                 df = df.sort_values('PTS', ascending=False).head(25)  # Top 25 per season
                 
@@ -117,47 +145,16 @@ def get_historical_legends():
                              '2003-04', '2002-03', '2001-02', '2000-01', '1999-00', '1998-99', '1997-98', '1996-97']
         
         legends_with_careers = {}
+        top_legend_ids = {legend['playerId'] for legend in top_legends}
         
         for season in historical_seasons:
             try:
-                player_stats = leaguedashplayerstats.LeagueDashPlayerStats(
-                    season=season,
-                    season_type_all_star='Regular Season'
-                )
-                
-                df = player_stats.get_data_frames()[0]
+                df = fetch_season_player_stats(season)
                 df = df[df['GP'] >= 5]
                 
-                for _, row in df.iterrows():
-                    player_id = int(row['PLAYER_ID'])
-                    player_name = row['PLAYER_NAME']
-                    
+                for player_id, player_name, season_stats in season_records(df, season):
                     # Only process if this player is in our top 100 legends
-                    if any(legend['playerId'] == player_id for legend in top_legends):
-                        games_played = int(row['GP']) if row['GP'] > 0 else 1
-                        
-                        season_stats = {
-                            'season': season,
-                            'team': row['TEAM_ABBREVIATION'],
-                            'position': 'G',
-                            'gamesPlayed': games_played,
-                            'minutesPerGame': float(row['MIN']) / games_played,
-                            'points': float(row['PTS']) / games_played,
-                            'assists': float(row['AST']) / games_played,
-                            'rebounds': float(row['REB']) / games_played,
-                            'steals': float(row['STL']) / games_played,
-                            'blocks': float(row['BLK']) / games_played,
-                            'turnovers': float(row['TOV']) / games_played,
-                            'fieldGoalPercentage': float(row['FG_PCT']) if row['FG_PCT'] else 0.0,
-                            'fieldGoalAttempts': float(row['FGA']) / games_played if row['FGA'] else 0.0,
-                            'threePointPercentage': float(row['FG3_PCT']) if row['FG3_PCT'] else 0.0,
-                            'threePointAttempts': float(row['FG3A']) / games_played if row['FG3A'] else 0.0,
-                            'freeThrowPercentage': float(row['FT_PCT']) if row['FT_PCT'] else 0.0,
-                            'freeThrowAttempts': float(row['FTA']) / games_played if row['FTA'] else 0.0,
-                            'plusMinus': float(row['PLUS_MINUS']) / games_played if row['PLUS_MINUS'] else 0.0,
-                            'winPercentage': float(row['W_PCT']) if row['W_PCT'] else 0.0
-                        }
-                        
+                    if player_id in top_legend_ids:
                         if player_name not in legends_with_careers:
                             legends_with_careers[player_name] = {
                                 'playerId': player_id,
@@ -182,21 +179,35 @@ def get_historical_legends():
         print(f"Error fetching historical legends: {e}", file=sys.stderr)
         return []
 
-def get_all_players_with_seasons():
+def get_all_players_with_seasons(max_workers=None):
     """Get all unique players with all their seasons"""
     try:
         # Check if we have extended historical data available
-        import os
         extended_data_path = 'server/extended_players.json'
         
-        if os.path.exists(extended_data_path):
+        if DATASET_AVAILABLE and (os.path.exists(extended_data_path)
+                                  or os.path.exists(snapshot_path(extended_data_path))):
             print("Using extended historical dataset...", file=sys.stderr)
+            with span('load', path=extended_data_path):
+                extended_players = load_players(extended_data_path)
+            print(f"Loaded {len(extended_players)} players with extended historical data", file=sys.stderr)
+            return extended_players
+        
+        if os.path.exists(extended_data_path):
+            # Without the snapshot module (NumPy missing, say) read the JSON itself
+            print("Using extended historical dataset (JSON only)...", file=sys.stderr)
             with open(extended_data_path, 'r') as f:
                 extended_players = json.load(f)
             print(f"Loaded {len(extended_players)} players with extended historical data", file=sys.stderr)
             return extended_players
         
         # Fallback to modern seasons only if extended data not available
+        if not NBA_API_AVAILABLE:
+            print("Extended data not found and NBA API not available", file=sys.stderr)
+            return None
+        
+        from stat_rows import season_records
+        
         print("Extended data not found, using all available seasons including historical...", file=sys.stderr)
         # Include historical seasons from 1996-2025 to capture all NBA legends
         modern_seasons = ['2024-25', '2023-24', '2022-23', '2021-22', '2020-21', '2019-20', 
@@ -210,114 +221,51 @@ def get_all_players_with_seasons():
         
         print(f"Fetching players from {len(modern_seasons)} seasons...", file=sys.stderr)
         
-        for season in modern_seasons:
+        for season, df, fetch_error in iter_season_frames(modern_seasons, max_workers):
+            if fetch_error is not None:
+                count('seasons.failed')
+                print(f"Error processing season {season}: {fetch_error}", file=sys.stderr)
+                continue
+            
             try:
-                player_stats = leaguedashplayerstats.LeagueDashPlayerStats(
-                    season=season,
-                    season_type_all_star='Regular Season'
-                )
-                
-                df = player_stats.get_data_frames()[0]
-                df = df[df['GP'] >= 5]  # Include players with at least 5 games
-                
-                for _, row in df.iterrows():
-                    games_played = int(row['GP']) if row['GP'] > 0 else 1
-                    player_id = int(row['PLAYER_ID'])
-                    player_name = row['PLAYER_NAME']
-                    
-                    season_stats = {
-                        'season': season,
-                        'team': row['TEAM_ABBREVIATION'],
-                        'position': 'G',
-                        'gamesPlayed': games_played,
-                        'minutesPerGame': float(row['MIN']) / games_played,
-                        'points': float(row['PTS']) / games_played,
-                        'assists': float(row['AST']) / games_played,
-                        'rebounds': float(row['REB']) / games_played,
-                        'steals': float(row['STL']) / games_played,
-                        'blocks': float(row['BLK']) / games_played,
-                        'turnovers': float(row['TOV']) / games_played,
-                        'fieldGoalPercentage': float(row['FG_PCT']) if row['FG_PCT'] else 0.0,
-                        'fieldGoalAttempts': float(row['FGA']) / games_played if row['FGA'] else 0.0,
-                        'threePointPercentage': float(row['FG3_PCT']) if row['FG3_PCT'] else 0.0,
-                        'threePointAttempts': float(row['FG3A']) / games_played if row['FG3A'] else 0.0,
-                        'freeThrowPercentage': float(row['FT_PCT']) if row['FT_PCT'] else 0.0,
-                        'freeThrowAttempts': float(row['FTA']) / games_played if row['FTA'] else 0.0,
-                        'plusMinus': float(row['PLUS_MINUS']) / games_played if row['PLUS_MINUS'] else 0.0,
-                        'winPercentage': float(row['W_PCT']) if row['W_PCT'] else 0.0
-                    }
+                with span('convert', season=season) as convert_span:
+                    fetched_rows = len(df)
+                    df = df[df['GP'] >= 5]  # Include players with at least 5 games
                     
-                    if player_id not in all_players:
-                        all_players[player_id] = {
-                            'playerId': player_id,
-                            'name': player_name,
-                            'seasons': []
-                        }
+                    for player_id, player_name, season_stats in season_records(df, season):
+                        if player_id not in all_players:
+                            all_players[player_id] = {
+                                'playerId': player_id,
+                                'name': player_name,
+                                'seasons': []
+                            }
+                        
+                        all_players[player_id]['seasons'].append(season_stats)
                     
-                    all_players[player_id]['seasons'].append(season_stats)
+                    convert_span.set(kept=len(df), dropped=fetched_rows - len(df))
+                count('rows.kept', len(df))
+                count('rows.dropped_min_games', fetched_rows - len(df))
                 
                 print(f"Processed {season}: {len(df)} players", file=sys.stderr)
                 
             except Exception as e:
+                count('seasons.failed')
                 print(f"Error processing season {season}: {e}", file=sys.stderr)
                 continue
         
-        # Convert to list and filter to players with at least one season
-        players_list = []
-        for player_data in all_players.values():
-            if len(player_data['seasons']) > 0:
-                # Sort seasons by year (most recent first)
-                player_data['seasons'].sort(key=lambda x: x['season'], reverse=True)
-                
-                # Calculate career totals across all seasons
-                total_games = sum(s['gamesPlayed'] for s in player_data['seasons'])
-                total_minutes = sum(s['minutesPerGame'] * s['gamesPlayed'] for s in player_data['seasons'])
-                total_points = sum(s['points'] * s['gamesPlayed'] for s in player_data['seasons'])
-                total_assists = sum(s['assists'] * s['gamesPlayed'] for s in player_data['seasons'])
-                total_rebounds = sum(s['rebounds'] * s['gamesPlayed'] for s in player_data['seasons'])
-                total_steals = sum(s['steals'] * s['gamesPlayed'] for s in player_data['seasons'])
-                total_blocks = sum(s['blocks'] * s['gamesPlayed'] for s in player_data['seasons'])
-                total_turnovers = sum(s['turnovers'] * s['gamesPlayed'] for s in player_data['seasons'])
-                total_plus_minus = sum(s['plusMinus'] * s['gamesPlayed'] for s in player_data['seasons'])
-                
-                # Calculate weighted averages for percentages
-                fg_pct_seasons = [s for s in player_data['seasons'] if s['fieldGoalPercentage'] > 0]
-                three_pct_seasons = [s for s in player_data['seasons'] if s['threePointPercentage'] > 0]
-                ft_pct_seasons = [s for s in player_data['seasons'] if s['freeThrowPercentage'] > 0]
-                
-                avg_fg_pct = sum(s['fieldGoalPercentage'] for s in fg_pct_seasons) / len(fg_pct_seasons) if fg_pct_seasons else 0.0
-                avg_three_pct = sum(s['threePointPercentage'] for s in three_pct_seasons) / len(three_pct_seasons) if three_pct_seasons else 0.0
-                avg_ft_pct = sum(s['freeThrowPercentage'] for s in ft_pct_seasons) / len(ft_pct_seasons) if ft_pct_seasons else 0.0
-                
-                # Get latest season info for team/position
-                latest_season = player_data['seasons'][0]
-                
-                # Set career averages as main stats
-                player_data.update({
-                    'currentSeason': latest_season['season'],
-                    'team': latest_season['team'],
-                    'position': latest_season['position'],
-                    'gamesPlayed': total_games,
-                    'minutesPerGame': total_minutes / total_games if total_games > 0 else 0.0,
-                    'points': total_points / total_games if total_games > 0 else 0.0,
-                    'assists': total_assists / total_games if total_games > 0 else 0.0,
-                    'rebounds': total_rebounds / total_games if total_games > 0 else 0.0,
-                    'steals': total_steals / total_games if total_games > 0 else 0.0,
-                    'blocks': total_blocks / total_games if total_games > 0 else 0.0,
-                    'turnovers': total_turnovers / total_games if total_games > 0 else 0.0,
-                    'fieldGoalPercentage': avg_fg_pct,
-                    'threePointPercentage': avg_three_pct,
-                    'freeThrowPercentage': avg_ft_pct,
-                    'plusMinus': total_plus_minus / total_games if total_games > 0 else 0.0,
-                    'availableSeasons': [s['season'] for s in player_data['seasons']]
-                })
-                players_list.append(player_data)
-        
-        # Sort by most recent season points
-        players_list.sort(key=lambda x: x['points'], reverse=True)
-        
-        # Take top 500 unique players
-        players_list = players_list[:500]
+        with span('aggregate') as aggregate_span:
+            # Convert to list and filter to players with at least one season
+            players_list = [player_data for player_data in all_players.values() if len(player_data['seasons']) > 0]
+            
+            # Career averages across all seasons become the main stats
+            update_career_stats(players_list)
+            
+            # Sort by most recent season points
+            players_list.sort(key=lambda x: x['points'], reverse=True)
+            
+            # Take top 500 unique players
+            aggregate_span.set(players=len(players_list), kept=min(len(players_list), 500))
+            players_list = players_list[:500]
         
         print(f"Unique players compiled: {len(players_list)} players", file=sys.stderr)
         return players_list
@@ -326,6 +274,62 @@ def get_all_players_with_seasons():
         print(f"Error creating player profiles: {e}", file=sys.stderr)
         return None
 
+def merge_season_records(players_list, records, season):
+    """Merge one season's records into the dataset in place.
+
+    Only players already in the dataset are touched, and only when their
+    stored row for the season is missing or differs. Returns (changed players,
+    number of records for players not in the dataset).
+    """
+    players_by_id = {player['playerId']: player for player in players_list}
+    changed = []
+    skipped = 0
+    
+    for player_id, player_name, season_stats in records:
+        player = players_by_id.get(player_id)
+        if player is None:
+            skipped += 1
+            continue
+        
+        seasons = player['seasons']
+        index = next((i for i, stored in enumerate(seasons) if stored['season'] == season), None)
+        if index is None:
+            seasons.insert(0, season_stats)
+        elif seasons[index] != season_stats:
+            seasons[index] = season_stats
+        else:
+            continue
+        changed.append(player)
+    
+    return changed, skipped
+
+def refresh_current_season(json_path='server/extended_players.json', season=None):
+    """Refetch only the live season and merge it into the stored dataset.
+
+    The season is fetched bypassing the response cache, diffed against the
+    stored rows, and only players whose row changed get their career
+    aggregates recomputed. The JSON and its snapshot are rewritten only when
+    something changed. Returns a summary dict.
+    """
+    from nba_cache import current_season
+    from stat_rows import season_records
+    
+    season = season or current_season()
+    players_list = load_players(json_path)
+    
+    df = fetch_season_player_stats(season, refresh=True)
+    df = df[df['GP'] >= 5]  # Same cutoff as the unified profiles
+    
+    changed, skipped = merge_season_records(players_list, season_records(df, season), season)
+    
+    if changed:
+        update_career_stats(changed)
+        save_players(players_list, json_path)
+    
+    print(f"Refreshed {season}: {len(changed)} of {len(players_list)} players changed, "
+          f"{skipped} players not in the dataset skipped", file=sys.stderr)
+    return {'season': season, 'players': len(players_list), 'updated': len(changed), 'skipped': skipped}
+
 def get_all_time_leaders():
     """Get all-time leaders by combining data from multiple seasons"""
     try:
@@ -593,37 +597,47 @@ def get_sample_nba_players():
     ]
     return players
 
-if __name__ == "__main__":
+def main():
     # Get season from command line argument, default to unified profiles
     season = sys.argv[1] if len(sys.argv) > 1 else 'unified'
     
-    if NBA_API_AVAILABLE:
-        if season == 'unified':
-            # Get unified player profiles with all seasons
-            api_data = get_all_players_with_seasons()
-            if api_data:
-                print(json.dumps(api_data))
-            else:
-                # Fallback to curated data
-                players_data = get_sample_nba_players()
-                print(json.dumps(players_data))
-        elif season == 'all-time':
-            # Get all-time leaders (legacy format)
-            api_data = get_all_time_leaders()
-            if api_data:
-                print(json.dumps(api_data))
-            else:
-                players_data = get_sample_nba_players()
-                print(json.dumps(players_data))
+    if season == 'refresh' and NBA_API_AVAILABLE:
+        # Merge the live season into the extended dataset, optionally for a given season
+        summary = refresh_current_season(season=sys.argv[2] if len(sys.argv) > 2 else None)
+        print(json.dumps(summary))
+    elif season == 'unified':
+        # Get unified player profiles with all seasons (the extended dataset needs no NBA API)
+        api_data = get_all_players_with_seasons()
+        if api_data:
+            with span('serialize') as serialize_span:
+                payload = json.dumps(api_data)
+                serialize_span.set(bytes=len(payload))
+            count('bytes.serialized', len(payload))
+            print(payload)
+        else:
+            # Fallback to curated data
+            players_data = get_sample_nba_players()
+            print(json.dumps(players_data))
+    elif season == 'all-time':
+        # Get all-time leaders (legacy format)
+        api_data = get_all_time_leaders()
+        if api_data:
+            print(json.dumps(api_data))
+        else:
+            players_data = get_sample_nba_players()
+            print(json.dumps(players_data))
+    elif NBA_API_AVAILABLE:
+        # Get specific season data (legacy format)
+        api_data = get_nba_players_from_api(season)
+        if api_data:
+            print(json.dumps(api_data))
         else:
-            # Get specific season data (legacy format)
-            api_data = get_nba_players_from_api(season)
-            if api_data:
-                print(json.dumps(api_data))
-            else:
-                players_data = get_sample_nba_players()
-                print(json.dumps(players_data))
+            players_data = get_sample_nba_players()
+            print(json.dumps(players_data))
     else:
         # Use curated data when NBA API not available
         players_data = get_sample_nba_players()
-        print(json.dumps(players_data))
\ No newline at end of file
+        print(json.dumps(players_data))
+
+if __name__ == "__main__":
+    run_profiled(main)
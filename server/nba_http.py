@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+"""One pooled, keep-alive HTTP session for every nba_api request.
+
+Without it each endpoint call can open a new connection to stats.nba.com and
+pay a fresh TCP + TLS handshake. On multi-season and per-player sweeps that
+setup is a large share of the total latency. The shared session keeps up to
+NBA_HTTP_POOL_SIZE connections alive (at least NBA_FETCH_CONCURRENCY), and
+asks for gzip responses. Retries are left to nba_throttle.
+
+NBA_STATS_BASE_URL points every request at another host serving the same
+/stats/<endpoint> API, e.g. the local stand-in from nba_stats_standin.py.
+"""
+
+import os
+import threading
+
+import requests
+from requests.adapters import HTTPAdapter
+
+DEFAULT_POOL_SIZE = 8
+DEFAULT_BASE_URL = 'https://stats.nba.com/stats'
+
+_session = None
+_session_lock = threading.Lock()
+
+def pool_size():
+    """Keep-alive connections per host, enough for every concurrent fetch"""
+    try:
+        size = int(os.environ.get('NBA_HTTP_POOL_SIZE', DEFAULT_POOL_SIZE))
+        concurrency = int(os.environ.get('NBA_FETCH_CONCURRENCY', 1))
+    except ValueError:
+        return DEFAULT_POOL_SIZE
+    return max(1, size, concurrency)
+
+def create_session(size=None):
+    """A requests.Session with a keep-alive connection pool and gzip enabled"""
+    size = size or pool_size()
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=4, pool_maxsize=size, max_retries=0)
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+    session.headers.update({
+        'Accept-Encoding': 'gzip, deflate',
+        'Connection': 'keep-alive',
+    })
+    return session
+
+def shared_session():
+    """The process-wide pooled session, created on first use"""
+    global _session
+    with _session_lock:
+        if _session is None:
+            _session = create_session()
+        return _session
+
+def install_shared_session():
+    """Make nba_api's stats HTTP client send every request through the shared session"""
+    from nba_api.stats.library.http import NBAStatsHTTP
+
+    session = shared_session()
+    # nba_api >= 1.5 keeps one class-level session; older versions have no hook
+    if hasattr(NBAStatsHTTP, 'set_session') and getattr(NBAStatsHTTP, '_session', None) is not session:
+        NBAStatsHTTP.set_session(session)
+    NBAStatsHTTP.base_url = stats_base_url() + '/{endpoint}'
+    return session
+
+def stats_base_url():
+    """Root of the stats API, without the trailing /<endpoint>"""
+    return os.environ.get('NBA_STATS_BASE_URL', DEFAULT_BASE_URL).rstrip('/')
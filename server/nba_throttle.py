@@ -0,0 +1,251 @@
+#!/usr/bin/env python3
+"""Shared request executor for NBA stats API calls.
+
+stats.nba.com throttles and eventually blocks clients that send requests too
+fast. Every network request made through nba_cache.fetch_endpoint goes
+through execute(), which adds:
+
+- a token-bucket rate limit (NBA_RATE_LIMIT requests/second, bursts of
+  NBA_RATE_BURST). The bucket state lives in a small file guarded by fcntl
+  locks, so the limit holds across threads and across processes on one host.
+  Set NBA_RATE_LIMIT=0 to disable it.
+- retries with exponential backoff and full jitter for transport errors
+  (timeouts, connection errors) and 429/5xx responses. Anything else, such
+  as a bug in the response handling, is raised at once.
+- a per-endpoint circuit breaker. After NBA_BREAKER_THRESHOLD consecutive
+  failures the endpoint fails fast for NBA_BREAKER_COOLDOWN seconds, then
+  one trial request is let through while every other caller keeps failing
+  fast until that trial succeeds or fails.
+- adaptive timeouts from an exponentially weighted average of each
+  endpoint's response time. The timeout grows after a timeout and shrinks
+  back as responses come in fast.
+"""
+
+import fcntl
+import json
+import os
+import random
+import sys
+import threading
+import time
+
+from build_metrics import count
+
+STATE_DIR = os.environ.get(
+    'NBA_THROTTLE_DIR',
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), '.nba_throttle')
+)
+
+DEFAULT_RATE_LIMIT = 1.0
+DEFAULT_RATE_BURST = 4
+DEFAULT_MAX_ATTEMPTS = 5
+
+# Backoff before retry n is uniform in [0, min(BACKOFF_CAP, BACKOFF_BASE * 2**n)]
+BACKOFF_BASE = 1.0
+BACKOFF_CAP = 60.0
+
+DEFAULT_BREAKER_THRESHOLD = 5
+DEFAULT_BREAKER_COOLDOWN = 120.0
+
+# Timeouts are TIMEOUT_MULTIPLIER x the average response time, within these bounds
+DEFAULT_TIMEOUT = 30.0
+MIN_TIMEOUT = 10.0
+MAX_TIMEOUT = 90.0
+TIMEOUT_MULTIPLIER = 4.0
+LATENCY_SMOOTHING = 0.2
+
+def env_number(name, default):
+    """Read a numeric setting from the environment"""
+    try:
+        return float(os.environ.get(name, default))
+    except ValueError:
+        return default
+
+class HTTPStatusError(Exception):
+    """A response with an error status code"""
+
+    def __init__(self, status_code, message=None):
+        super().__init__(message or f"HTTP {status_code}")
+        self.status_code = status_code
+
+class CircuitOpenError(RuntimeError):
+    """Raised instead of calling an endpoint whose circuit is open"""
+
+def is_retryable(error):
+    """Whether a failed request is worth repeating: transport errors, 429 and 5xx"""
+    if isinstance(error, HTTPStatusError):
+        return error.status_code == 429 or error.status_code >= 500
+    requests = sys.modules.get('requests')
+    if requests is not None and isinstance(error, requests.RequestException):
+        # Only the transport failures; InvalidURL and the like will not get better
+        return isinstance(error, (requests.ConnectionError, requests.Timeout))
+    return isinstance(error, OSError)
+
+def is_timeout(error):
+    """Whether an error is a request timeout"""
+    return isinstance(error, TimeoutError) or 'timeout' in type(error).__name__.lower()
+
+def backoff_delay(attempt):
+    """Full-jitter exponential backoff for the given retry (0-based)"""
+    return random.uniform(0, min(BACKOFF_CAP, BACKOFF_BASE * 2 ** attempt))
+
+class TokenBucket:
+    """Token bucket whose state is shared through a locked file"""
+
+    def __init__(self, path, rate, burst):
+        self.path = path
+        self.rate = rate
+        self.burst = max(1.0, burst)
+        self.lock = threading.Lock()
+
+    def take(self):
+        """Take a token if one is available; returns seconds to wait otherwise"""
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        with open(self.path, 'a+') as f:
+            fcntl.flock(f, fcntl.LOCK_EX)
+            f.seek(0)
+            try:
+                state = json.loads(f.read() or '{}')
+            except ValueError:
+                state = {}
+            now = time.time()
+            elapsed = max(0.0, now - state.get('updated', now))
+            tokens = min(self.burst, state.get('tokens', self.burst) + elapsed * self.rate)
+            wait = 0.0
+            if tokens >= 1:
+                tokens -= 1
+            else:
+                wait = (1 - tokens) / self.rate
+            f.seek(0)
+            f.truncate()
+            json.dump({'tokens': tokens, 'updated': now}, f)
+        return wait
+
+    def acquire(self):
+        """Block until a request may be sent"""
+        with self.lock:
+            while True:
+                wait = self.take()
+                if wait <= 0:
+                    return
+                time.sleep(wait)
+
+class EndpointState:
+    """Circuit breaker and response-time tracking for one endpoint"""
+
+    def __init__(self, name, threshold, cooldown):
+        self.name = name
+        self.threshold = threshold
+        self.cooldown = cooldown
+        self.failures = 0
+        self.opened_at = None
+        self.latency = None
+        self.half_open_trial = False
+        self.lock = threading.Lock()
+
+    def check_circuit(self):
+        """Raise CircuitOpenError while the endpoint is cooling down or its trial request is out"""
+        with self.lock:
+            if self.half_open_trial:
+                raise CircuitOpenError(f"{self.name} circuit half-open, waiting for its trial request")
+            if self.opened_at is None:
+                return
+            remaining = self.cooldown - (time.monotonic() - self.opened_at)
+            if remaining > 0:
+                raise CircuitOpenError(f"{self.name} circuit open for another {remaining:.0f}s "
+                                       f"after {self.failures} consecutive failures")
+            # Half-open: this caller sends the one trial request; a failure reopens it
+            self.half_open_trial = True
+            self.opened_at = None
+            self.failures = self.threshold - 1
+
+    def timeout(self):
+        """Request timeout based on the recent response times"""
+        with self.lock:
+            if self.latency is None:
+                return DEFAULT_TIMEOUT
+            return min(MAX_TIMEOUT, max(MIN_TIMEOUT, self.latency * TIMEOUT_MULTIPLIER))
+
+    def record_success(self, elapsed):
+        with self.lock:
+            self.failures = 0
+            self.opened_at = None
+            self.half_open_trial = False
+            if self.latency is None:
+                self.latency = elapsed
+            else:
+                self.latency += LATENCY_SMOOTHING * (elapsed - self.latency)
+
+    def record_failure(self, timed_out, timeout):
+        with self.lock:
+            self.failures += 1
+            self.half_open_trial = False
+            if timed_out:
+                # Wait longer next time, up to MAX_TIMEOUT
+                self.latency = max(self.latency or 0.0, timeout)
+            if self.failures >= self.threshold:
+                self.opened_at = time.monotonic()
+                print(f"{self.name}: {self.failures} consecutive failures, "
+                      f"pausing requests for {self.cooldown:.0f}s", file=sys.stderr)
+
+_bucket = None
+_endpoint_states = {}
+_state_lock = threading.Lock()
+
+def rate_limiter():
+    """The host-wide token bucket, or None when rate limiting is disabled"""
+    global _bucket
+    rate = env_number('NBA_RATE_LIMIT', DEFAULT_RATE_LIMIT)
+    if rate <= 0:
+        return None
+    with _state_lock:
+        if _bucket is None or _bucket.rate != rate:
+            burst = env_number('NBA_RATE_BURST', DEFAULT_RATE_BURST)
+            _bucket = TokenBucket(os.path.join(STATE_DIR, 'token_bucket.json'), rate, burst)
+        return _bucket
+
+def endpoint_state(endpoint):
+    """Breaker and timing state for an endpoint, shared by this process's threads"""
+    key = endpoint.lower()
+    with _state_lock:
+        if key not in _endpoint_states:
+            _endpoint_states[key] = EndpointState(
+                endpoint,
+                int(env_number('NBA_BREAKER_THRESHOLD', DEFAULT_BREAKER_THRESHOLD)),
+                env_number('NBA_BREAKER_COOLDOWN', DEFAULT_BREAKER_COOLDOWN)
+            )
+        return _endpoint_states[key]
+
+def execute(endpoint, send):
+    """Call send(timeout) for an endpoint under the shared limits.
+
+    Retries retryable failures with jittered backoff and returns send's
+    result. Raises the last error, or CircuitOpenError while the endpoint's
+    circuit is open.
+    """
+    state = endpoint_state(endpoint)
+    max_attempts = max(1, int(env_number('NBA_MAX_ATTEMPTS', DEFAULT_MAX_ATTEMPTS)))
+
+    for attempt in range(max_attempts):
+        state.check_circuit()
+        limiter = rate_limiter()
+        if limiter is not None:
+            limiter.acquire()
+
+        timeout = state.timeout()
+        start = time.monotonic()
+        try:
+            result = send(timeout)
+        except Exception as e:
+            timed_out = is_timeout(e)
+            state.record_failure(timed_out, timeout)
+            if not is_retryable(e) or attempt == max_attempts - 1:
+                raise
+            delay = backoff_delay(attempt)
+            count('request.retries')
+            print(f"{endpoint} attempt {attempt + 1}/{max_attempts} failed ({e}); "
+                  f"retrying in {delay:.1f}s", file=sys.stderr)
+            time.sleep(delay)
+        else:
+            state.record_success(time.monotonic() - start)
+            return result
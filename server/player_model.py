@@ -0,0 +1,212 @@
+#!/usr/bin/env python3
+"""Compact in-memory model of the extended player dataset.
+
+A season dict from extended_players.json holds 19 keys plus 15 separate float
+objects, and its season, team and position strings are fresh copies, so it
+takes about 1.2 KB. PlayerSeason is a slotted dataclass that keeps the three
+strings interned (one shared object per distinct value) and packs the 15
+per-game stats into one array('d'). Measured on the real dataset with
+tracemalloc, that comes to about 0.37 KB per player-season including the
+player records, roughly 3x less.
+
+This is a library for a process that has to keep the dataset resident as
+player objects; nothing in the server imports it today. The formula worker,
+the only long-running one, maps its columns from the season store
+(season_store.py) instead, and nba_data.py runs once per request, so
+neither holds player dicts long enough for the saving to matter.
+
+Models read like the dicts (season['points'], player['seasons']) and
+to_dict() returns the exact JSON shape, key order included, so
+json.dumps(players_to_dicts(players), indent=2) reproduces the dataset file
+(test_player_model.py checks both the JSON and snapshot round trips).
+"""
+
+import sys
+from array import array
+from dataclasses import dataclass, field
+from operator import itemgetter
+
+import numpy as np
+
+from player_snapshot import (
+    SEASON_KEYS, SEASON_STRING_FIELDS, SEASON_INT_FIELDS, CAREER_KEYS, CAREER_STRING_FIELDS,
+    CAREER_INT_FIELDS, EXTENDED_CAREER_FIELDS, BASE_CAREER_KEYS, EXTENDED_PLAYER_KEYS,
+    load_current_snapshot, read_players_json, save_players
+)
+
+# Float fields packed into the stats arrays, in JSON key order
+SEASON_STAT_KEYS = [key for key in SEASON_KEYS if key not in SEASON_STRING_FIELDS + SEASON_INT_FIELDS]
+CAREER_STAT_KEYS = [key for key in CAREER_KEYS if key not in CAREER_STRING_FIELDS + CAREER_INT_FIELDS]
+
+SEASON_STAT_INDEX = {key: index for index, key in enumerate(SEASON_STAT_KEYS)}
+CAREER_STAT_INDEX = {key: index for index, key in enumerate(CAREER_STAT_KEYS)}
+
+BASE_CAREER_STAT_KEYS = [key for key in CAREER_STAT_KEYS if key in BASE_CAREER_KEYS]
+base_career_stats = itemgetter(*[CAREER_STAT_INDEX[key] for key in BASE_CAREER_STAT_KEYS])
+
+season_stat_values = itemgetter(*SEASON_STAT_KEYS)
+
+SEASON_ATTRIBUTES = {'season': 'season', 'team': 'team', 'position': 'position', 'gamesPlayed': 'games_played'}
+PLAYER_ATTRIBUTES = {
+    'playerId': 'player_id', 'name': 'name', 'seasons': 'seasons', 'currentSeason': 'current_season',
+    'team': 'team', 'position': 'position', 'gamesPlayed': 'games_played',
+}
+
+intern = sys.intern
+
+@dataclass(slots=True)
+class PlayerSeason:
+    """One player-season; stats holds SEASON_STAT_KEYS in order"""
+    season: str
+    team: str
+    position: str
+    games_played: int
+    stats: array
+
+    @classmethod
+    def from_dict(cls, record):
+        return cls(intern(record['season']), intern(record['team']), intern(record['position']),
+                   record['gamesPlayed'], array('d', season_stat_values(record)))
+
+    def __getitem__(self, key):
+        index = SEASON_STAT_INDEX.get(key)
+        if index is not None:
+            return self.stats[index]
+        return getattr(self, SEASON_ATTRIBUTES[key])
+
+    def get(self, key, default=None):
+        try:
+            return self[key]
+        except KeyError:
+            return default
+
+    def to_dict(self):
+        record = {
+            'season': self.season,
+            'team': self.team,
+            'position': self.position,
+            'gamesPlayed': self.games_played,
+        }
+        record.update(zip(SEASON_STAT_KEYS, self.stats.tolist()))
+        return record
+
+@dataclass(slots=True)
+class Player:
+    """A player with their seasons (most recent first) and career averages.
+
+    career holds CAREER_STAT_KEYS in order; the extended fields
+    (fieldGoalAttempts, ..., winPercentage) are 0.0 and left out of to_dict()
+    unless has_extended_fields is set, as in the JSON.
+    """
+    player_id: int
+    name: str
+    seasons: list
+    current_season: str
+    team: str
+    position: str
+    games_played: int
+    career: array
+    has_extended_fields: bool = False
+    available_seasons: tuple = field(default_factory=tuple)
+
+    @classmethod
+    def from_dict(cls, player):
+        extended = set(player) == EXTENDED_PLAYER_KEYS
+        career = array('d', [player[key] if extended or key not in EXTENDED_CAREER_FIELDS else 0.0
+                             for key in CAREER_STAT_KEYS])
+        return cls(player['playerId'], player['name'],
+                   [PlayerSeason.from_dict(season) for season in player['seasons']],
+                   intern(player['currentSeason']), intern(player['team']), intern(player['position']),
+                   player['gamesPlayed'], career, extended,
+                   tuple(map(intern, player['availableSeasons'])))
+
+    def __getitem__(self, key):
+        index = CAREER_STAT_INDEX.get(key)
+        if index is not None:
+            if key in EXTENDED_CAREER_FIELDS and not self.has_extended_fields:
+                raise KeyError(key)
+            return self.career[index]
+        if key == 'availableSeasons':
+            return list(self.available_seasons)
+        return getattr(self, PLAYER_ATTRIBUTES[key])
+
+    def get(self, key, default=None):
+        try:
+            return self[key]
+        except KeyError:
+            return default
+
+    def to_dict(self):
+        player = {
+            'playerId': self.player_id,
+            'name': self.name,
+            'seasons': [season.to_dict() for season in self.seasons],
+            'currentSeason': self.current_season,
+            'team': self.team,
+            'position': self.position,
+            'gamesPlayed': self.games_played,
+        }
+        career = self.career.tolist()
+        if self.has_extended_fields:
+            player.update(zip(CAREER_STAT_KEYS, career))
+        else:
+            player.update(zip(BASE_CAREER_STAT_KEYS, base_career_stats(career)))
+        player['availableSeasons'] = list(self.available_seasons)
+        return player
+
+def players_from_dicts(players):
+    """Models for player dicts in the extended_players.json shape"""
+    return [Player.from_dict(player) for player in players]
+
+def players_to_dicts(players):
+    """Player dicts in the extended_players.json shape"""
+    return [player.to_dict() for player in players]
+
+def packed_rows(arrays, prefix, keys):
+    """Row-major float64 bytes of the given snapshot columns and the size of one row"""
+    matrix = np.column_stack([arrays[f'{prefix}.{key}'] for key in keys]).astype('float64', order='C')
+    return memoryview(matrix.tobytes()), 8 * len(keys)
+
+def players_from_snapshot_arrays(arrays):
+    """Models straight from snapshot arrays, without building the dicts first"""
+    season_bytes, season_width = packed_rows(arrays, 'seasons', SEASON_STAT_KEYS)
+    seasons = []
+    for row, (label, team, position, games) in enumerate(zip(
+            arrays['seasons.season'].tolist(), arrays['seasons.team'].tolist(),
+            arrays['seasons.position'].tolist(), arrays['seasons.gamesPlayed'].tolist())):
+        stats = array('d')
+        stats.frombytes(season_bytes[row * season_width:(row + 1) * season_width])
+        seasons.append(PlayerSeason(intern(label), intern(team), intern(position), games, stats))
+
+    available = [intern(label) for label in arrays['availableSeasons'].tolist()]
+    career_bytes, career_width = packed_rows(arrays, 'players', CAREER_STAT_KEYS)
+
+    players = []
+    for row, (player_id, name, extended, current_season, team, position, games, season_start,
+              season_count, available_start, available_count) in enumerate(zip(
+            arrays['players.playerId'].tolist(), arrays['players.name'].tolist(),
+            arrays['players.hasExtendedFields'].tolist(), arrays['players.currentSeason'].tolist(),
+            arrays['players.team'].tolist(), arrays['players.position'].tolist(),
+            arrays['players.gamesPlayed'].tolist(),
+            arrays['players.seasonStart'].tolist(), arrays['players.seasonCount'].tolist(),
+            arrays['players.availableStart'].tolist(), arrays['players.availableCount'].tolist())):
+        career = array('d')
+        career.frombytes(career_bytes[row * career_width:(row + 1) * career_width])
+        if not extended:
+            for key in EXTENDED_CAREER_FIELDS:
+                career[CAREER_STAT_INDEX[key]] = 0.0
+        players.append(Player(player_id, name, seasons[season_start:season_start + season_count],
+                              intern(current_season), intern(team), intern(position), games, career,
+                              extended, tuple(available[available_start:available_start + available_count])))
+    return players
+
+def load_player_models(json_path):
+    """Load the dataset as models, from the snapshot while it matches the JSON"""
+    arrays = load_current_snapshot(json_path)
+    if arrays is not None:
+        return players_from_snapshot_arrays(arrays)
+    return players_from_dicts(read_players_json(json_path))
+
+def save_player_models(players, json_path):
+    """Write models as the dataset JSON plus its snapshot"""
+    save_players(players_to_dicts(players), json_path)
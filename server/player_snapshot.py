@@ -0,0 +1,269 @@
+#!/usr/bin/env python3
+"""Columnar binary snapshot of the extended player dataset.
+
+extended_players.json nests every season inside its player and is written
+with indent=2, so every load parses ~3 MB of text into thousands of dicts.
+The snapshot keeps the same data as typed NumPy arrays in an uncompressed
+.npz next to the JSON file:
+
+- seasons.*: one row per player-season, in the same order as the JSON
+- players.*: one row per player with its career fields and the offset and
+  count of its rows in the seasons table (availableSeasons the same way)
+
+Strings are stored as fixed-width unicode arrays so the file loads without
+pickle. The snapshot records the SHA-256, size and modification time of the
+JSON it was written with and is only used while that JSON is unchanged. The
+size and mtime are checked first; the JSON is only hashed when they differ
+(after a checkout or copy, say), so a normal load never reads the JSON. The
+snapshot is derived data: load_players() writes it on the first load without
+one.
+"""
+
+import hashlib
+import json
+import os
+import sys
+import time
+from operator import itemgetter
+
+import numpy as np
+
+SNAPSHOT_VERSION = 1
+
+# Season record keys in JSON order, grouped by storage type
+SEASON_KEYS = [
+    'season', 'team', 'position', 'gamesPlayed', 'minutesPerGame', 'points',
+    'assists', 'rebounds', 'steals', 'blocks', 'turnovers', 'fieldGoalPercentage',
+    'fieldGoalAttempts', 'threePointPercentage', 'threePointAttempts',
+    'freeThrowPercentage', 'freeThrowAttempts', 'plusMinus', 'winPercentage'
+]
+SEASON_STRING_FIELDS = ['season', 'team', 'position']
+SEASON_INT_FIELDS = ['gamesPlayed']
+
+# Career keys in JSON order (between 'seasons' and 'availableSeasons')
+CAREER_KEYS = [
+    'currentSeason', 'team', 'position', 'gamesPlayed', 'minutesPerGame', 'points',
+    'assists', 'rebounds', 'steals', 'blocks', 'turnovers', 'fieldGoalPercentage',
+    'fieldGoalAttempts', 'threePointPercentage', 'threePointAttempts',
+    'freeThrowPercentage', 'freeThrowAttempts', 'plusMinus', 'winPercentage'
+]
+CAREER_STRING_FIELDS = ['currentSeason', 'team', 'position']
+CAREER_INT_FIELDS = ['gamesPlayed']
+
+# Career fields only some players carry (flagged by players.hasExtendedFields)
+EXTENDED_CAREER_FIELDS = ['fieldGoalAttempts', 'threePointAttempts', 'freeThrowAttempts', 'winPercentage']
+BASE_CAREER_KEYS = [key for key in CAREER_KEYS if key not in EXTENDED_CAREER_FIELDS]
+
+PLAYER_KEYS = set(['playerId', 'name', 'seasons', 'availableSeasons'] + BASE_CAREER_KEYS)
+EXTENDED_PLAYER_KEYS = PLAYER_KEYS | set(EXTENDED_CAREER_FIELDS)
+
+def snapshot_path(json_path):
+    """Snapshot file stored next to a player dataset JSON file"""
+    return os.path.splitext(json_path)[0] + '.npz'
+
+def column_dtype(field, string_fields, int_fields):
+    """NumPy dtype used to store a field"""
+    if field in string_fields:
+        return str
+    if field in int_fields:
+        return 'int64'
+    return 'float64'
+
+def offsets(lengths):
+    """Start offset of each run given the run lengths"""
+    starts = np.zeros(len(lengths), dtype='int64')
+    np.cumsum(lengths[:-1], out=starts[1:])
+    return starts
+
+def source_stamp(json_path):
+    """(size, mtime in ns) of a dataset JSON file, compared before falling back to its hash"""
+    stat = os.stat(json_path)
+    return stat.st_size, stat.st_mtime_ns
+
+def stamp_arrays(arrays, stamp):
+    """Record the source JSON's (size, mtime) in snapshot arrays"""
+    arrays['sourceSize'] = np.array(stamp[0], dtype='int64')
+    arrays['sourceMtimeNs'] = np.array(stamp[1], dtype='int64')
+    return arrays
+
+def snapshot_arrays(players, source_sha256=''):
+    """Convert player dicts (the JSON shape) into the snapshot's named arrays"""
+    extended = []
+    for player in players:
+        keys = set(player)
+        if keys == EXTENDED_PLAYER_KEYS:
+            extended.append(True)
+        elif keys == PLAYER_KEYS:
+            extended.append(False)
+        else:
+            layout = EXTENDED_PLAYER_KEYS if keys & set(EXTENDED_CAREER_FIELDS) else PLAYER_KEYS
+            raise ValueError(f"Player {player.get('playerId')} does not match the snapshot layout: "
+                             f"{sorted(keys ^ layout)}")
+
+    seasons = [season for player in players for season in player['seasons']]
+    season_rows = list(map(itemgetter(*SEASON_KEYS), seasons))
+    season_columns = list(zip(*season_rows)) if season_rows else [()] * len(SEASON_KEYS)
+
+    arrays = {
+        'version': np.array(SNAPSHOT_VERSION),
+        'sourceSha256': np.array(source_sha256),
+    }
+    for field, values in zip(SEASON_KEYS, season_columns):
+        dtype = column_dtype(field, SEASON_STRING_FIELDS, SEASON_INT_FIELDS)
+        arrays[f'seasons.{field}'] = np.array(values, dtype=dtype)
+
+    arrays['players.playerId'] = np.array([player['playerId'] for player in players], dtype='int64')
+    arrays['players.name'] = np.array([player['name'] for player in players], dtype=str)
+    arrays['players.hasExtendedFields'] = np.array(extended, dtype=bool)
+    for field in CAREER_KEYS:
+        dtype = column_dtype(field, CAREER_STRING_FIELDS, CAREER_INT_FIELDS)
+        arrays[f'players.{field}'] = np.array([player.get(field, 0.0) for player in players], dtype=dtype)
+
+    season_counts = np.array([len(player['seasons']) for player in players], dtype='int64')
+    arrays['players.seasonStart'] = offsets(season_counts)
+    arrays['players.seasonCount'] = season_counts
+
+    available = [season for player in players for season in player['availableSeasons']]
+    available_counts = np.array([len(player['availableSeasons']) for player in players], dtype='int64')
+    arrays['availableSeasons'] = np.array(available, dtype=str)
+    arrays['players.availableStart'] = offsets(available_counts)
+    arrays['players.availableCount'] = available_counts
+    return arrays
+
+def write_snapshot(players, path, source_sha256='', stamp=None):
+    """Write players to a snapshot file atomically"""
+    arrays = snapshot_arrays(players, source_sha256)
+    if stamp is not None:
+        stamp_arrays(arrays, stamp)
+    write_snapshot_arrays(arrays, path)
+
+def write_atomically(path, write):
+    """Call write(f) on a temporary file, then move it over path in one step"""
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    try:
+        with open(tmp_path, 'wb') as f:
+            write(f)
+        os.replace(tmp_path, path)
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+def write_snapshot_arrays(arrays, path):
+    """Write snapshot arrays to a file atomically"""
+    write_atomically(path, lambda f: np.savez(f, **arrays))
+
+def load_snapshot(path):
+    """Load a snapshot as a dict of column arrays ({'players.points': ..., 'seasons.points': ...})"""
+    with np.load(path, allow_pickle=False) as snapshot:
+        arrays = {name: snapshot[name] for name in snapshot.files}
+    if int(arrays['version']) != SNAPSHOT_VERSION:
+        raise ValueError(f"Unsupported snapshot version {int(arrays['version'])} in {path}")
+    return arrays
+
+def players_from_snapshot(arrays):
+    """Rebuild player dicts in the extended_players.json shape from snapshot arrays"""
+    season_values = [arrays[f'seasons.{field}'].tolist() for field in SEASON_KEYS]
+    seasons = [dict(zip(SEASON_KEYS, row)) for row in zip(*season_values)]
+    available = arrays['availableSeasons'].tolist()
+
+    base_positions = [CAREER_KEYS.index(key) for key in BASE_CAREER_KEYS]
+    base_values = itemgetter(*base_positions)
+    career_rows = zip(*[arrays[f'players.{field}'].tolist() for field in CAREER_KEYS])
+
+    players = []
+    for (player_id, name, extended, season_start, season_count, available_start,
+         available_count, career) in zip(
+            arrays['players.playerId'].tolist(), arrays['players.name'].tolist(),
+            arrays['players.hasExtendedFields'].tolist(),
+            arrays['players.seasonStart'].tolist(), arrays['players.seasonCount'].tolist(),
+            arrays['players.availableStart'].tolist(), arrays['players.availableCount'].tolist(),
+            career_rows):
+        player = {
+            'playerId': player_id,
+            'name': name,
+            'seasons': seasons[season_start:season_start + season_count]
+        }
+        if extended:
+            player.update(zip(CAREER_KEYS, career))
+        else:
+            player.update(zip(BASE_CAREER_KEYS, base_values(career)))
+        player['availableSeasons'] = available[available_start:available_start + available_count]
+        players.append(player)
+    return players
+
+def file_sha256(path):
+    """SHA-256 hex digest of a file's contents"""
+    with open(path, 'rb') as f:
+        return hashlib.sha256(f.read()).hexdigest()
+
+def save_players(players, json_path):
+    """Write the player dataset as indented JSON plus its columnar snapshot.
+
+    The JSON is replaced atomically, so readers never see a half-written file.
+    """
+    payload = json.dumps(players, indent=2).encode('utf-8')
+    write_atomically(json_path, lambda f: f.write(payload))
+    write_snapshot_for(players, json_path, hashlib.sha256(payload).hexdigest())
+
+def write_snapshot_for(players, json_path, source_sha256):
+    """Write the snapshot of a dataset JSON file, keeping the JSON authoritative if that fails"""
+    try:
+        write_snapshot(players, snapshot_path(json_path), source_sha256, source_stamp(json_path))
+    except (OSError, ValueError) as e:
+        # A missing or stale snapshot is ignored by load_players
+        print(f"Snapshot not written for {json_path}: {e}", file=sys.stderr)
+
+def snapshot_is_current(arrays, path, json_path):
+    """Whether snapshot arrays still match their JSON: by size and mtime, else by hash"""
+    if not os.path.exists(json_path):
+        return True
+    stamp = source_stamp(json_path)
+    if 'sourceMtimeNs' in arrays and (int(arrays['sourceSize']), int(arrays['sourceMtimeNs'])) == stamp:
+        return True
+    if str(arrays['sourceSha256']) != file_sha256(json_path):
+        return False
+    # Same contents with a new mtime (a checkout, a copy): restamp so the next load skips the hash
+    try:
+        write_snapshot_arrays(stamp_arrays(arrays, stamp), path)
+    except OSError as e:
+        print(f"Could not restamp snapshot {path}: {e}", file=sys.stderr)
+    return True
+
+def load_current_snapshot(json_path):
+    """Snapshot arrays for a dataset while they match its JSON, otherwise None"""
+    path = snapshot_path(json_path)
+    if os.path.exists(path):
+        try:
+            arrays = load_snapshot(path)
+            if snapshot_is_current(arrays, path, json_path):
+                return arrays
+            print(f"Snapshot {path} is out of date, reading {json_path}", file=sys.stderr)
+        except Exception as e:
+            print(f"Error reading snapshot {path}: {e}", file=sys.stderr)
+    return None
+
+def load_players(json_path):
+    """Load the player dataset, preferring the snapshot while it matches the JSON"""
+    arrays = load_current_snapshot(json_path)
+    if arrays is not None:
+        return players_from_snapshot(arrays)
+    return read_players_json(json_path)
+
+def read_players_json(json_path):
+    """Parse a dataset JSON file and (re)write its snapshot for the next load"""
+    with open(json_path, 'rb') as f:
+        payload = f.read()
+    players = json.loads(payload)
+    write_snapshot_for(players, json_path, hashlib.sha256(payload).hexdigest())
+    return players
+
+if __name__ == "__main__":
+    # Convert an existing dataset JSON file into its snapshot
+    json_path = sys.argv[1] if len(sys.argv) > 1 else 'server/extended_players.json'
+    start = time.perf_counter()
+    with open(json_path, 'r') as f:
+        players_data = json.load(f)
+    write_snapshot(players_data, snapshot_path(json_path), file_sha256(json_path), source_stamp(json_path))
+    season_total = sum(len(player['seasons']) for player in players_data)
+    print(f"Wrote {snapshot_path(json_path)}: {len(players_data)} players, {season_total} seasons "
+          f"in {time.perf_counter() - start:.2f}s")
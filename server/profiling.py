@@ -0,0 +1,253 @@
+#!/usr/bin/env python3
+"""Opt-in profiling of a script's entry point.
+
+Scripts call run_profiled(main) instead of main(). Nothing changes unless
+profiling is requested with the --profile flag (removed from sys.argv before
+the entry point parses it) or the NBA_PROFILE environment variable:
+
+    NBA_PROFILE=1 | all   cProfile and tracemalloc
+    NBA_PROFILE=cpu       cProfile only
+    NBA_PROFILE=memory    tracemalloc only (it slows Python code down noticeably)
+
+Each run writes a report directory under NBA_PROFILE_DIR (default
+server/.profiles/<script>-<timestamp>-<pid>) holding:
+
+- profile.pstats:  the raw cProfile stats (load with pstats or snakeviz)
+- profile.txt:     the top functions by cumulative and by internal time
+- allocations.txt: the top NBA_PROFILE_TOP (default 25) allocation sites live
+  at the traced peak, and the peak itself
+- summary.json:    wall time, CPU time, peak RSS and traced peak memory
+
+cProfile.Profile.enable() only hooks the calling thread, while the builds fan
+their fetches out to ThreadPoolExecutor workers. While profiling, every new
+thread runs under its own profiler and the stats of the threads that finished
+are merged into the main thread's. Allocation sites come from a tracemalloc
+snapshot taken by a sampling thread whenever traced memory reaches a new high,
+not from what is left at exit.
+
+The report is written even when the entry point raises or calls sys.exit().
+"""
+
+import json
+import os
+import resource
+import sys
+import threading
+import time
+
+# cProfile, pstats and tracemalloc are imported only when profiling is
+# requested: the per-request scripts (nba_data.py) call run_profiled too
+
+PROFILE_DIR = os.environ.get(
+    'NBA_PROFILE_DIR',
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), '.profiles')
+)
+
+DEFAULT_TOP = 25
+
+# Stack depth kept per allocation; deeper is slower but groups sites better
+TRACEMALLOC_FRAMES = 5
+
+# Seconds between traced memory samples, and the growth over the kept
+# snapshot that takes a new one (each snapshot copies every live trace)
+SAMPLE_INTERVAL = 0.05
+SNAPSHOT_GROWTH = 0.05
+
+MODES = {
+    '1': ('cpu', 'memory'),
+    'all': ('cpu', 'memory'),
+    'true': ('cpu', 'memory'),
+    'yes': ('cpu', 'memory'),
+    'cpu': ('cpu',),
+    'memory': ('memory',),
+}
+
+def requested_modes(argv=None):
+    """Profilers to run for this process; strips --profile from argv"""
+    argv = sys.argv if argv is None else argv
+    modes = MODES.get(os.environ.get('NBA_PROFILE', '').lower(), ())
+    if '--profile' in argv:
+        argv.remove('--profile')
+        modes = modes or MODES['all']
+    return modes
+
+def top_count():
+    try:
+        return max(1, int(os.environ.get('NBA_PROFILE_TOP', DEFAULT_TOP)))
+    except ValueError:
+        return DEFAULT_TOP
+
+def peak_rss_bytes():
+    """Peak resident set size of this process so far"""
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS bytes
+    return peak if sys.platform == 'darwin' else peak * 1024
+
+def report_dir(name):
+    """A new report directory for one run of `name`"""
+    stamp = time.strftime('%Y%m%d-%H%M%S')
+    path = os.path.join(PROFILE_DIR, f"{name}-{stamp}-{os.getpid()}")
+    os.makedirs(path, exist_ok=True)
+    return path
+
+class ThreadProfiles:
+    """Per-thread cProfile for every thread started while installed"""
+
+    def __init__(self):
+        self.profiles = []
+        self.lock = threading.Lock()
+        self.original_run = threading.Thread.run
+
+    def install(self):
+        import cProfile
+        original_run, profiles, lock = self.original_run, self.profiles, self.lock
+
+        def run(thread):
+            profiler = cProfile.Profile()
+            try:
+                profiler.enable()
+            except ValueError:
+                # Python 3.12+ profiles through sys.monitoring, which already covers every thread
+                return original_run(thread)
+            try:
+                return original_run(thread)
+            finally:
+                profiler.disable()
+                with lock:
+                    profiles.append(profiler)
+
+        threading.Thread.run = run
+
+    def uninstall(self):
+        threading.Thread.run = self.original_run
+
+    def finished(self):
+        """Profilers of the threads that have finished"""
+        with self.lock:
+            return list(self.profiles)
+
+class PeakSampler(threading.Thread):
+    """Keeps the tracemalloc snapshot taken at the highest traced memory seen"""
+
+    def __init__(self, interval=SAMPLE_INTERVAL):
+        super().__init__(name='profiling-peak-sampler', daemon=True)
+        self.interval = interval
+        self.stopped = threading.Event()
+        self.started_at = time.perf_counter()
+        self.snapshot = None
+        self.size = 0
+        self.seconds = 0.0
+
+    def check(self):
+        """Snapshot the traced allocations if they grew past the kept snapshot"""
+        import tracemalloc
+        current = tracemalloc.get_traced_memory()[0]
+        if self.snapshot is None or current > self.size * (1 + SNAPSHOT_GROWTH):
+            self.snapshot = tracemalloc.take_snapshot()
+            self.size = current
+            self.seconds = time.perf_counter() - self.started_at
+
+    def run(self):
+        while not self.stopped.wait(self.interval):
+            self.check()
+
+    def stop(self):
+        """Stop sampling; the entry point's last state counts as a sample too"""
+        self.stopped.set()
+        self.join()
+        self.check()
+
+def write_cpu_report(profiler, thread_profiles, path):
+    import io
+    import pstats
+    output = io.StringIO()
+    stats = pstats.Stats(profiler, stream=output)
+    if thread_profiles:
+        stats.add(*thread_profiles)
+    stats.dump_stats(os.path.join(path, 'profile.pstats'))
+    stats.strip_dirs()
+    output.write(f"{len(thread_profiles)} finished threads merged into the main thread's profile\n\n")
+    for sort in ('cumulative', 'tottime'):
+        output.write(f"=== Top {top_count()} by {sort} ===\n")
+        stats.sort_stats(sort).print_stats(top_count())
+    with open(os.path.join(path, 'profile.txt'), 'w') as f:
+        f.write(output.getvalue())
+
+def write_memory_report(sampler, traced_peak, path):
+    snapshot = sampler.snapshot
+    lines = [f"Traced peak: {traced_peak / 1024 / 1024:.1f} MB",
+             f"Snapshot at {sampler.size / 1024 / 1024:.1f} MB traced, {sampler.seconds:.2f}s into the run",
+             f"Top {top_count()} allocation sites live at the peak:"]
+    for index, stat in enumerate(snapshot.statistics('lineno')[:top_count()], 1):
+        frame = stat.traceback[0]
+        lines.append(f"{index:3d}. {frame.filename}:{frame.lineno}: "
+                     f"{stat.size / 1024:.1f} KB in {stat.count} blocks")
+    lines.append("")
+    lines.append(f"Top {min(10, top_count())} call stacks:")
+    for stat in snapshot.statistics('traceback')[:min(10, top_count())]:
+        lines.append(f"{stat.size / 1024:.1f} KB in {stat.count} blocks")
+        lines.extend(f"    {line}" for line in stat.traceback.format())
+    with open(os.path.join(path, 'allocations.txt'), 'w') as f:
+        f.write('\n'.join(lines) + '\n')
+
+def run_profiled(entry, *args, name=None, **kwargs):
+    """Call entry(*args, **kwargs), profiling it when requested; returns its result"""
+    modes = requested_modes()
+    if not modes:
+        return entry(*args, **kwargs)
+
+    name = name or os.path.splitext(os.path.basename(sys.argv[0] or entry.__name__))[0]
+    import cProfile
+    import tracemalloc
+    profiler = cProfile.Profile() if 'cpu' in modes else None
+    threads = ThreadProfiles() if profiler else None
+    sampler = None
+    if 'memory' in modes:
+        tracemalloc.start(TRACEMALLOC_FRAMES)
+        sampler = PeakSampler()
+        sampler.start()
+
+    start = time.perf_counter()
+    cpu_start = time.process_time()
+    outcome = 'ok'
+    try:
+        if profiler:
+            threads.install()
+            profiler.enable()
+        return entry(*args, **kwargs)
+    except SystemExit as e:
+        outcome = f"exit {e.code}"
+        raise
+    except BaseException as e:
+        outcome = type(e).__name__
+        raise
+    finally:
+        if profiler:
+            profiler.disable()
+            threads.uninstall()
+        elapsed = time.perf_counter() - start
+        cpu_seconds = time.process_time() - cpu_start
+
+        path = report_dir(name)
+        summary = {
+            'script': name,
+            'argv': sys.argv[1:],
+            'outcome': outcome,
+            'wallSeconds': elapsed,
+            'cpuSeconds': cpu_seconds,
+            'peakRssBytes': peak_rss_bytes(),
+        }
+        if sampler:
+            sampler.stop()
+            traced_peak = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+            summary['tracedPeakBytes'] = traced_peak
+            write_memory_report(sampler, traced_peak, path)
+        if profiler:
+            thread_profiles = threads.finished()
+            summary['threadsProfiled'] = len(thread_profiles)
+            write_cpu_report(profiler, thread_profiles, path)
+        with open(os.path.join(path, 'summary.json'), 'w') as f:
+            json.dump(summary, f, indent=2)
+        print(f"Profile of {name} written to {path} ({elapsed:.1f}s wall, "
+              f"peak RSS {summary['peakRssBytes'] / 1024 / 1024:.0f} MB)", file=sys.stderr)
@@ -0,0 +1,138 @@
+import { spawn, type ChildProcessWithoutNullStreams } from 'child_process';
+
+// Default time a request may take before the worker is restarted; methods
+// that can legitimately run longer pass their own limit to the constructor
+const WORKER_REQUEST_TIMEOUT_MS = 60000;
+
+// JSON-RPC error code the Python workers use for bad caller input (see rpc_worker.py)
+export const INVALID_PARAMS = -32602;
+
+export class PythonWorkerError extends Error {
+  constructor(message: string, public code?: number) {
+    super(message);
+    this.name = 'PythonWorkerError';
+  }
+}
+
+interface PendingRequest {
+  resolve: (value: any) => void;
+  reject: (error: Error) => void;
+  timer: NodeJS.Timeout;
+}
+
+// Long-lived `python3 <script> --worker` process speaking line-delimited
+// JSON-RPC, so each request skips interpreter startup and heavy imports and
+// can be answered from the worker's in-memory caches. The process is started
+// on first use and restarted lazily after it exits.
+export class PythonWorker {
+  private process: ChildProcessWithoutNullStreams | null = null;
+  private pending = new Map<number, PendingRequest>();
+  private nextId = 1;
+  private buffer = '';
+
+  constructor(private scriptPath: string, private label: string,
+              private timeoutsMs: Record<string, number> = {}) {}
+
+  private start(): ChildProcessWithoutNullStreams {
+    const worker = spawn('python3', [this.scriptPath, '--worker']);
+
+    worker.stdout.on('data', (chunk) => {
+      this.buffer += chunk.toString();
+      let newline = this.buffer.indexOf('\n');
+      while (newline !== -1) {
+        const line = this.buffer.slice(0, newline).trim();
+        this.buffer = this.buffer.slice(newline + 1);
+        if (line) {
+          this.handleResponse(line);
+        }
+        newline = this.buffer.indexOf('\n');
+      }
+    });
+
+    worker.stderr.on('data', (chunk) => {
+      console.error(`${this.label}:`, chunk.toString().trim());
+    });
+
+    const handleExit = (reason: string) => {
+      if (this.process !== worker) {
+        return;
+      }
+      this.process = null;
+      this.buffer = '';
+      this.rejectAll(new PythonWorkerError(reason));
+    };
+
+    worker.on('error', (error) => handleExit(`${this.label} failed: ${error.message}`));
+    worker.on('close', (code) => handleExit(`${this.label} exited with code ${code}`));
+    // Writing to a worker that has just died emits EPIPE here; without a
+    // listener that would crash the Node process. The close handler above
+    // rejects whatever was pending.
+    worker.stdin.on('error', (error) => {
+      console.error(`${this.label} stdin error:`, error.message);
+    });
+
+    this.process = worker;
+    return worker;
+  }
+
+  private handleResponse(line: string) {
+    let response: any;
+    try {
+      response = JSON.parse(line);
+    } catch (parseError) {
+      console.error(`Failed to parse ${this.label} response:`, parseError);
+      return;
+    }
+
+    const request = this.pending.get(response.id);
+    if (!request) {
+      return;
+    }
+    this.pending.delete(response.id);
+    clearTimeout(request.timer);
+
+    if (response.error) {
+      request.reject(new PythonWorkerError(response.error.message, response.error.code));
+    } else {
+      request.resolve(response.result);
+    }
+  }
+
+  private rejectAll(error: Error) {
+    for (const request of Array.from(this.pending.values())) {
+      clearTimeout(request.timer);
+      request.reject(error);
+    }
+    this.pending.clear();
+  }
+
+  // The worker answers one request at a time, so a hung request would stall
+  // everything queued behind it: kill the process and fail its pending
+  // requests; the next call starts a fresh worker.
+  private restart(worker: ChildProcessWithoutNullStreams, reason: string) {
+    if (this.process !== worker) {
+      return;
+    }
+    this.process = null;
+    this.buffer = '';
+    worker.kill('SIGKILL');
+    this.rejectAll(new PythonWorkerError(reason));
+  }
+
+  call(method: string, params: Record<string, unknown>): Promise<any> {
+    const worker = this.process ?? this.start();
+    const id = this.nextId++;
+    const timeoutMs = this.timeoutsMs[method] ?? WORKER_REQUEST_TIMEOUT_MS;
+
+    return new Promise((resolve, reject) => {
+      const timer = setTimeout(() => {
+        this.pending.delete(id);
+        reject(new PythonWorkerError(`${this.label} timed out on ${method}`));
+        this.restart(worker, `${this.label} restarted after ${method} timed out`);
+      }, timeoutMs);
+
+      this.pending.set(id, { resolve, reject, timer });
+      worker.stdin.write(JSON.stringify({ jsonrpc: '2.0', id, method, params }) + '\n');
+    });
+  }
+}
@@ -10,6 +10,7 @@ import { eq, and } from "drizzle-orm";
 
 
 import { getTeamPossessionData } from "./team-stats-service";
+import { calculateFormula, isFormulaError } from "./formula-service";
 
 export async function registerRoutes(app: Express): Promise<Server> {
   
@@ -322,10 +323,10 @@ export async function registerRoutes(app: Express): Promise<Server> {
       console.log('Original formula:', formula);
       console.log('Resolved formula:', resolvedFormula);
       
+      const allPlayers = await storage.getAllPlayers();
       let players;
       if (season && season !== "all-time") {
         // Get players for specific season
-        const allPlayers = await storage.getAllPlayers();
         players = allPlayers.filter(player => {
           if (player.seasons && Array.isArray(player.seasons)) {
             return player.seasons.some(s => s.season === season);
@@ -361,7 +362,7 @@ export async function registerRoutes(app: Express): Promise<Server> {
           return player;
         });
       } else {
-        players = await storage.getAllPlayers();
+        players = allPlayers;
       }
       
       if (players.length === 0) {
@@ -381,6 +382,36 @@ export async function registerRoutes(app: Express): Promise<Server> {
         });
       }
 
+      // Evaluate with the Python formula worker (vectorized, cached leaderboards);
+      // fall back to evaluating each player-season with mathjs if it is unavailable.
+      // Both paths rank the same rows, those of nba_players: the worker gets
+      // allPlayers (seasons and career averages) rather than reading
+      // extended_players.json, so the result never depends on which path ran.
+      try {
+        const leaderboard = await calculateFormula(resolvedFormula, season, allPlayers);
+        const playersById = new Map<number, any>(players.map((player: any): [number, any] => [player.playerId, player]));
+
+        const rankedResults = leaderboard
+          .filter(row => playersById.has(row.playerId))
+          .map((row, index) => ({
+            player: {
+              ...playersById.get(row.playerId),
+              team: row.team
+            },
+            customStat: row.customStat,
+            bestSeason: row.season,
+            formula: resolvedFormula,
+            rank: index + 1
+          }));
+
+        return res.json(rankedResults);
+      } catch (workerError) {
+        if (isFormulaError(workerError)) {
+          return res.status(400).json({ message: workerError.message });
+        }
+        console.error('Formula worker unavailable, evaluating with mathjs:', workerError);
+      }
+
       // Calculate custom stat for each player (or each season for all-time)
       const results: any[] = [];
       
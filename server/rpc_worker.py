@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+"""Minimal line-delimited JSON-RPC 2.0 loop for long-lived Python workers.
+
+The Node server keeps one worker process alive and writes one request object
+per line to its stdin; every request gets exactly one response line on stdout.
+Anything diagnostic must go to stderr so it never corrupts the response stream.
+"""
+
+import json
+import sys
+
+PARSE_ERROR = -32700
+INVALID_REQUEST = -32600
+METHOD_NOT_FOUND = -32601
+INVALID_PARAMS = -32602
+INTERNAL_ERROR = -32603
+
+class RpcError(Exception):
+    """Raised by a handler to answer with its own JSON-RPC error code"""
+
+    def __init__(self, code, message):
+        super().__init__(message)
+        self.code = code
+
+class EncodedResult(str):
+    """A handler result that is already JSON-encoded and is written out verbatim"""
+
+def error_response(request_id, code, message):
+    """Build a JSON-RPC error response"""
+    return {'jsonrpc': '2.0', 'id': request_id, 'error': {'code': code, 'message': message}}
+
+def handle_request(methods, request, invalid_params_errors=()):
+    """Dispatch one decoded request to its handler and build the response.
+
+    Exceptions of the invalid_params_errors types are the caller's fault (an
+    invalid formula, say) and answer INVALID_PARAMS; anything else the handler
+    raises is a worker fault and answers INTERNAL_ERROR. An RpcError answers
+    its own code.
+    """
+    if not isinstance(request, dict) or not isinstance(request.get('method'), str):
+        return error_response(None, INVALID_REQUEST, 'Invalid request')
+
+    request_id = request.get('id')
+    handler = methods.get(request['method'])
+    if handler is None:
+        return error_response(request_id, METHOD_NOT_FOUND, f"Unknown method: {request['method']}")
+
+    params = request.get('params') or {}
+    try:
+        if isinstance(params, dict):
+            result = handler(**params)
+        else:
+            result = handler(*params)
+    except RpcError as e:
+        return error_response(request_id, e.code, str(e))
+    except invalid_params_errors as e:
+        return error_response(request_id, INVALID_PARAMS, str(e))
+    except Exception as e:
+        print(f"Error handling {request['method']}: {e}", file=sys.stderr)
+        return error_response(request_id, INTERNAL_ERROR, str(e))
+
+    return {'jsonrpc': '2.0', 'id': request_id, 'result': result}
+
+def encode_response(response):
+    """Serialize a response, splicing in pre-encoded results without re-encoding them"""
+    result = response.get('result')
+    if isinstance(result, EncodedResult):
+        return f'{{"jsonrpc": "2.0", "id": {json.dumps(response["id"])}, "result": {result}}}'
+    return json.dumps(response)
+
+def serve(methods, stdin=None, stdout=None, invalid_params_errors=()):
+    """Answer JSON-RPC requests read from stdin until it is closed"""
+    stdin = stdin or sys.stdin
+    stdout = stdout or sys.stdout
+
+    for line in stdin:
+        line = line.strip()
+        if not line:
+            continue
+
+        try:
+            request = json.loads(line)
+        except ValueError as e:
+            response = error_response(None, PARSE_ERROR, f"Parse error: {e}")
+        else:
+            response = handle_request(methods, request, invalid_params_errors)
+
+        stdout.write(encode_response(response) + '\n')
+        stdout.flush()
@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+"""Read-only, memory-mapped player-season store.
+
+Every player-season is a fixed-width record in one NumPy structured dtype, but
+the file is laid out column by column: it holds a single record whose fields
+are (N,) arrays, one per stat. np.load(mmap_mode='r') maps the file instead of
+reading it, so worker processes on the same host share the page cache copy
+and a query only faults in the pages of the columns it touches.
+
+The store is derived from extended_players.json and records the SHA-256,
+size and mtime of the JSON it was built from; open_season_store() rebuilds it
+when the size or mtime change, without hashing the JSON on every open. The
+formula CLI (formula_engine.py) and the benchmarks read their columns from here.
+"""
+
+import os
+import sys
+
+import numpy as np
+
+from player_snapshot import (
+    SEASON_KEYS, SEASON_STRING_FIELDS, SEASON_INT_FIELDS, file_sha256, load_players, source_stamp
+)
+
+# 8-byte columns first so every column stays 8-byte aligned in the file
+NUMERIC_FIELDS = ['playerId'] + [field for field in SEASON_KEYS if field not in SEASON_STRING_FIELDS]
+
+def store_path(json_path):
+    """Season store file kept next to a player dataset JSON file"""
+    return os.path.splitext(json_path)[0] + '.seasons.npy'
+
+def build_store(players, source_sha256='', stamp=(0, 0)):
+    """Pack player dicts (the JSON shape) into a one-record, column-per-field array"""
+    seasons = [season for player in players for season in player['seasons']]
+    columns = {'playerId': [player['playerId'] for player in players for _ in player['seasons']]}
+    for field in SEASON_KEYS:
+        columns[field] = [season[field] for season in seasons]
+
+    count = len(seasons)
+    fields = []
+    for field in NUMERIC_FIELDS:
+        dtype = 'int64' if field in SEASON_INT_FIELDS or field == 'playerId' else 'float64'
+        fields.append((field, dtype, (count,)))
+    for field in SEASON_STRING_FIELDS:
+        width = max([len(value) for value in columns[field]] + [1])
+        fields.append((field, f'U{width}', (count,)))
+    fields.append(('sourceSha256', 'U64'))
+    fields.append(('sourceSize', 'int64'))
+    fields.append(('sourceMtimeNs', 'int64'))
+
+    store = np.zeros((), dtype=fields)
+    for field in NUMERIC_FIELDS + SEASON_STRING_FIELDS:
+        store[field] = columns[field]
+    store['sourceSha256'] = source_sha256
+    store['sourceSize'], store['sourceMtimeNs'] = stamp
+    return store
+
+def write_season_store(players, path, source_sha256='', stamp=(0, 0)):
+    """Write the season store atomically so readers never map a partial file"""
+    store = build_store(players, source_sha256, stamp)
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    try:
+        with open(tmp_path, 'wb') as f:
+            np.save(f, store, allow_pickle=False)
+        os.replace(tmp_path, path)
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+def map_season_store(path):
+    """Memory-map a season store read-only; columns are views into the mapping"""
+    return np.load(path, mmap_mode='r', allow_pickle=False)
+
+def open_season_store(json_path):
+    """Map the season store for a dataset, rebuilding it first if it is missing or stale"""
+    path = store_path(json_path)
+    stamp = source_stamp(json_path) if os.path.exists(json_path) else None
+
+    if os.path.exists(path):
+        try:
+            store = map_season_store(path)
+            if stamp is None or (int(store['sourceSize']), int(store['sourceMtimeNs'])) == stamp:
+                return store
+            print(f"Season store {path} is out of date, rebuilding", file=sys.stderr)
+        except Exception as e:
+            print(f"Error mapping season store {path}: {e}", file=sys.stderr)
+
+    source_sha256 = file_sha256(json_path) if stamp is not None else ''
+    stamp = stamp or (0, 0)
+    players = load_players(json_path)
+    try:
+        write_season_store(players, path, source_sha256, stamp)
+    except OSError as e:
+        # Read-only deploys still work, just without sharing pages between processes
+        print(f"Could not write season store {path}: {e}", file=sys.stderr)
+        return build_store(players, source_sha256, stamp)
+    return map_season_store(path)
+
+def store_size(store):
+    """Number of player-seasons in a store"""
+    return store.dtype['playerId'].shape[0]
+
+def store_columns(store, fields):
+    """Zero-copy views of the requested columns ({field: array})"""
+    return {field: store[field] for field in fields}
+
+def matching_rows(store, field, value):
+    """Row numbers where a column equals value (reads only that column)"""
+    return np.flatnonzero(store[field] == value)
+
+def season_records(store, rows, fields=None):
+    """Season dicts in the extended_players.json shape for the given rows"""
+    fields = fields or SEASON_KEYS
+    values = [store[field][rows].tolist() for field in fields]
+    return [dict(zip(fields, row)) for row in zip(*values)]
+
+if __name__ == "__main__":
+    # Build (or refresh) the season store for a dataset JSON file
+    json_path = sys.argv[1] if len(sys.argv) > 1 else 'server/extended_players.json'
+    store = open_season_store(json_path)
+    print(f"{store_path(json_path)}: {store_size(store)} player-seasons, "
+          f"{os.path.getsize(store_path(json_path))} bytes")
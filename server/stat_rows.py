@@ -0,0 +1,157 @@
+#!/usr/bin/env python3
+"""Vectorized conversion of NBA stats API frames into the app's record shapes.
+
+LeagueDashPlayerStats/LeagueDashTeamStats return season totals. Every fetcher
+used to walk the frame with iterrows() and divide each column by games played
+one value at a time; these helpers do the same arithmetic as whole-column
+operations and zip the resulting columns into records in one pass.
+"""
+
+from itertools import repeat
+
+import numpy as np
+import pandas as pd
+
+# Per-game season fields in the order they appear in every season record
+SEASON_FIELDS = [
+    'team', 'position', 'gamesPlayed', 'minutesPerGame', 'points', 'assists',
+    'rebounds', 'steals', 'blocks', 'turnovers', 'fieldGoalPercentage',
+    'fieldGoalAttempts', 'threePointPercentage', 'threePointAttempts',
+    'freeThrowPercentage', 'freeThrowAttempts', 'plusMinus', 'winPercentage'
+]
+
+# Season totals that are divided by games played
+PER_GAME_COLUMNS = {
+    'minutesPerGame': 'MIN',
+    'points': 'PTS',
+    'assists': 'AST',
+    'rebounds': 'REB',
+    'steals': 'STL',
+    'blocks': 'BLK',
+    'turnovers': 'TOV',
+    'fieldGoalAttempts': 'FGA',
+    'threePointAttempts': 'FG3A',
+    'freeThrowAttempts': 'FTA',
+    'plusMinus': 'PLUS_MINUS',
+}
+
+# Rate columns that are passed through as-is
+PERCENTAGE_COLUMNS = {
+    'fieldGoalPercentage': 'FG_PCT',
+    'threePointPercentage': 'FG3_PCT',
+    'freeThrowPercentage': 'FT_PCT',
+    'winPercentage': 'W_PCT',
+}
+
+def numeric_column(df, column):
+    """Column as a float64 array with missing values treated as zero"""
+    values = pd.to_numeric(df[column], errors='coerce').to_numpy(dtype='float64', na_value=0.0)
+    return np.nan_to_num(values, nan=0.0)
+
+def games_played_column(df):
+    """Games played with zero/missing guarded to 1 to avoid division by zero"""
+    games = numeric_column(df, 'GP')
+    return np.where(games > 0, games, 1).astype('int64')
+
+def records_from_columns(columns):
+    """Zip a dict of equal-length columns into a list of dicts in one pass.
+
+    Columns may be NumPy arrays, lists or a scalar repeated for every row.
+    """
+    keys = list(columns)
+    values = []
+    length = None
+    for value in columns.values():
+        if isinstance(value, np.ndarray):
+            value = value.tolist()
+        if isinstance(value, list):
+            length = len(value)
+        values.append(value)
+    if length is None:
+        return []
+    values = [value if isinstance(value, list) else repeat(value, length) for value in values]
+    return [dict(zip(keys, row)) for row in zip(*values)]
+
+def player_stat_columns(df, season=None):
+    """Convert a LeagueDashPlayerStats totals frame into per-game columns.
+
+    Returns a dict of playerId and name followed by (optionally) season and the
+    SEASON_FIELDS columns, in record key order.
+    """
+    games = games_played_column(df)
+    games_float = games.astype('float64')
+
+    columns = {
+        'playerId': df['PLAYER_ID'].to_numpy(dtype='int64'),
+        'name': df['PLAYER_NAME'].tolist(),
+    }
+    if season is not None:
+        columns['season'] = season
+    columns['team'] = df['TEAM_ABBREVIATION'].tolist()
+    columns['position'] = 'G'  # Endpoint has no position data
+    columns['gamesPlayed'] = games
+
+    for field in SEASON_FIELDS[3:]:
+        if field in PER_GAME_COLUMNS:
+            columns[field] = numeric_column(df, PER_GAME_COLUMNS[field]) / games_float
+        else:
+            columns[field] = numeric_column(df, PERCENTAGE_COLUMNS[field])
+
+    return columns
+
+def player_records(df):
+    """Per-game player records ({'playerId', 'name', 'team', ...}) for a frame"""
+    return records_from_columns(player_stat_columns(df))
+
+def season_records(df, season):
+    """List of (playerId, name, season record) tuples for one season's frame"""
+    columns = player_stat_columns(df, season)
+    player_ids = columns.pop('playerId').tolist()
+    names = columns.pop('name')
+    return list(zip(player_ids, names, records_from_columns(columns)))
+
+def team_possession_columns(df):
+    """Team columns with possession, pace and offensive rating, in record key order.
+
+    Teams with no games are dropped; ratings fall back to 0 when possessions
+    or minutes are zero.
+    """
+    df = df[df['GP'] != 0]
+    games = df['GP'].to_numpy(dtype='float64')
+
+    # Possessions = FGA + 0.44 * FTA - OREB + TOV
+    possessions = (df['FGA'] + (0.44 * df['FTA']) - df['OREB'] + df['TOV']).to_numpy(dtype='float64')
+    total_minutes = df['MIN'].to_numpy(dtype='float64')
+    points = df['PTS'].to_numpy(dtype='float64')
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        pace = np.where(total_minutes > 0, (possessions * 48) / total_minutes, 0.0)
+        offensive_rating = np.where(possessions > 0, (points / possessions) * 100, 0.0)
+
+    return {
+        'teamId': df['TEAM_ID'].to_numpy(dtype='int64'),
+        'teamName': df['TEAM_NAME'].tolist(),
+        'gamesPlayed': df['GP'].to_numpy(dtype='int64'),
+        'wins': df['W'].to_numpy(dtype='int64'),
+        'losses': df['L'].to_numpy(dtype='int64'),
+        'winPercentage': df['W_PCT'].to_numpy(dtype='float64'),
+        'points': df['PTS'].to_numpy(dtype='int64'),
+        'pointsPerGame': points / games,
+        'fieldGoalAttempts': df['FGA'].to_numpy(dtype='int64'),
+        'freeThrowAttempts': df['FTA'].to_numpy(dtype='int64'),
+        'offensiveRebounds': df['OREB'].to_numpy(dtype='int64'),
+        'turnovers': df['TOV'].to_numpy(dtype='float64'),
+        'possessions': possessions,
+        'possessionsPerGame': possessions / games,
+        'pace': pace,
+        'offensiveRating': offensive_rating,
+        'defensiveRating': 110.0,  # Would need opponent data for accurate calculation
+        'assists': df['AST'].to_numpy(dtype='float64'),
+        'rebounds': df['REB'].to_numpy(dtype='float64'),
+        'steals': df['STL'].to_numpy(dtype='float64'),
+        'blocks': df['BLK'].to_numpy(dtype='float64'),
+        'fieldGoalPercentage': df['FG_PCT'].to_numpy(dtype='float64'),
+        'threePointPercentage': df['FG3_PCT'].to_numpy(dtype='float64'),
+        'freeThrowPercentage': df['FT_PCT'].to_numpy(dtype='float64'),
+        'plusMinus': df['PLUS_MINUS'].to_numpy(dtype='float64'),
+    }
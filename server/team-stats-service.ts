@@ -1,5 +1,6 @@
 import { spawn } from 'child_process';
 import path from 'path';
+import { PythonWorker } from './python-worker';
 
 interface TeamStats {
   teamId: number;
@@ -39,9 +40,37 @@ interface TeamPossessionData {
   };
 }
 
-export async function getTeamPossessionData(season: string = '2024-25'): Promise<TeamPossessionData | null> {
+const scriptPath = path.join(__dirname, 'team_stats_data.py');
+
+// Worst case of one NBA API request through nba_throttle.execute: every
+// attempt runs into the longest adaptive timeout (MAX_TIMEOUT) and waits the
+// longest jittered backoff (BACKOFF_BASE * 2**n, capped at BACKOFF_CAP)
+// before the next. The worker inherits NBA_MAX_ATTEMPTS from this process.
+const NBA_MAX_TIMEOUT_S = 90;
+const NBA_BACKOFF_CAP_S = 60;
+const NBA_DEFAULT_MAX_ATTEMPTS = 5;
+// Headroom for the rate limiter and the work around the request
+const TEAM_STATS_SLACK_S = 60;
+
+function nbaRetryBudgetSeconds(): number {
+  const configured = Math.floor(Number(process.env.NBA_MAX_ATTEMPTS ?? NBA_DEFAULT_MAX_ATTEMPTS));
+  const attempts = Math.max(1, Number.isFinite(configured) ? configured : NBA_DEFAULT_MAX_ATTEMPTS);
+  let seconds = attempts * NBA_MAX_TIMEOUT_S;
+  for (let retry = 0; retry < attempts - 1; retry++) {
+    seconds += Math.min(NBA_BACKOFF_CAP_S, 2 ** retry);
+  }
+  return seconds;
+}
+
+// Long-lived `team_stats_data.py --worker` process with a per-season cache.
+// A throttled fetch is still making progress while it retries, so the worker
+// is only restarted once the request has outlived the whole retry budget.
+const teamStatsWorker = new PythonWorker(scriptPath, 'Team stats worker', {
+  getTeamPossessionData: (nbaRetryBudgetSeconds() + TEAM_STATS_SLACK_S) * 1000
+});
+
+function runTeamStatsScript(season: string): Promise<TeamPossessionData | null> {
   return new Promise((resolve) => {
-    const scriptPath = path.join(__dirname, 'team_stats_data.py');
     const pythonProcess = spawn('python3', [scriptPath, season]);
     
     let data = '';
@@ -73,6 +102,16 @@ export async function getTeamPossessionData(season: string = '2024-25'): Promise
   });
 }
 
+export async function getTeamPossessionData(season: string = '2024-25'): Promise<TeamPossessionData | null> {
+  try {
+    return await teamStatsWorker.call('getTeamPossessionData', { season });
+  } catch (workerError) {
+    // Fall back to a one-off script run so a broken worker never takes the endpoint down
+    console.error('Team stats worker unavailable, running script directly:', workerError);
+    return runTeamStatsScript(season);
+  }
+}
+
 export function calculateAdvancedTeamMetrics(teamStats: any): TeamStats {
   const games = teamStats.GP;
   
@@ -2,12 +2,13 @@
 
 import json
 import sys
-try:
-    from nba_api.stats.endpoints import leaguedashteamstats
-    import pandas as pd
-    NBA_API_AVAILABLE = True
-except ImportError:
-    NBA_API_AVAILABLE = False
+import time
+from importlib.util import find_spec
+
+from profiling import run_profiled
+
+# nba_api and pandas are imported on the first request, not at startup
+NBA_API_AVAILABLE = all(find_spec(name) is not None for name in ('nba_api', 'pandas'))
 
 def get_team_possession_data(season='2024-25'):
     """Get team statistics including calculated possession data"""
@@ -15,71 +16,34 @@ def get_team_possession_data(season='2024-25'):
         return None
         
     try:
+        from nba_api.stats.endpoints import leaguedashteamstats
+        from nba_cache import fetch_endpoint
+        from stat_rows import records_from_columns, team_possession_columns
+        
         # Get team stats from NBA API
-        team_stats = leaguedashteamstats.LeagueDashTeamStats(season=season)
+        team_stats = fetch_endpoint(leaguedashteamstats.LeagueDashTeamStats, season=season)
         df = team_stats.get_data_frames()[0]
         
-        teams_data = []
-        total_possessions_per_game = 0
-        total_pace = 0
-        total_offensive_rating = 0
+        columns = team_possession_columns(df)
+        
+        # League averages use the unrounded per-team values
+        possessions_per_game = columns['possessionsPerGame'].tolist()
+        pace = columns['pace'].tolist()
+        offensive_rating = columns['offensiveRating'].tolist()
         
-        for _, row in df.iterrows():
-            games = row['GP']
-            if games == 0:
-                continue
-                
-            # Calculate possessions using standard formula
-            # Possessions = FGA + 0.44 * FTA - OREB + TOV
-            possessions = row['FGA'] + (0.44 * row['FTA']) - row['OREB'] + row['TOV']
-            possessions_per_game = possessions / games
-            
-            # Calculate pace (possessions per 48 minutes)
-            total_minutes = row['MIN']
-            pace = (possessions * 48) / total_minutes if total_minutes > 0 else 0
-            
-            # Calculate offensive rating (points per 100 possessions)
-            offensive_rating = (row['PTS'] / possessions) * 100 if possessions > 0 else 0
-            
-            team_data = {
-                'teamId': int(row['TEAM_ID']),
-                'teamName': row['TEAM_NAME'],
-                'gamesPlayed': int(games),
-                'wins': int(row['W']),
-                'losses': int(row['L']),
-                'winPercentage': float(row['W_PCT']),
-                'points': int(row['PTS']),
-                'pointsPerGame': float(row['PTS']) / games,
-                'fieldGoalAttempts': int(row['FGA']),
-                'freeThrowAttempts': int(row['FTA']),
-                'offensiveRebounds': int(row['OREB']),
-                'turnovers': float(row['TOV']),
-                'possessions': round(possessions),
-                'possessionsPerGame': round(possessions_per_game, 1),
-                'pace': round(pace, 1),
-                'offensiveRating': round(offensive_rating, 1),
-                'defensiveRating': 110.0,  # Would need opponent data for accurate calculation
-                'assists': float(row['AST']),
-                'rebounds': float(row['REB']),
-                'steals': float(row['STL']),
-                'blocks': float(row['BLK']),
-                'fieldGoalPercentage': float(row['FG_PCT']),
-                'threePointPercentage': float(row['FG3_PCT']),
-                'freeThrowPercentage': float(row['FT_PCT']),
-                'plusMinus': float(row['PLUS_MINUS'])
-            }
-            
-            teams_data.append(team_data)
-            total_possessions_per_game += possessions_per_game
-            total_pace += pace
-            total_offensive_rating += offensive_rating
+        columns['possessions'] = [round(value) for value in columns['possessions'].tolist()]
+        columns['possessionsPerGame'] = [round(value, 1) for value in possessions_per_game]
+        columns['pace'] = [round(value, 1) for value in pace]
+        columns['offensiveRating'] = [round(value, 1) for value in offensive_rating]
+        
+        teams_data = records_from_columns(columns)
         
         # Calculate league averages
         num_teams = len(teams_data)
         league_average = {
-            'possessionsPerGame': round(total_possessions_per_game / num_teams, 1) if num_teams > 0 else 0,
-            'pace': round(total_pace / num_teams, 1) if num_teams > 0 else 0,
-            'offensiveRating': round(total_offensive_rating / num_teams, 1) if num_teams > 0 else 0,
+            'possessionsPerGame': round(sum(possessions_per_game) / num_teams, 1) if num_teams > 0 else 0,
+            'pace': round(sum(pace) / num_teams, 1) if num_teams > 0 else 0,
+            'offensiveRating': round(sum(offensive_rating) / num_teams, 1) if num_teams > 0 else 0,
             'defensiveRating': 110.0
         }
         
@@ -95,11 +59,46 @@ def get_team_possession_data(season='2024-25'):
         print(f"Error fetching team data: {e}", file=sys.stderr)
         return None
 
-if __name__ == "__main__":
+def run_worker():
+    """Serve team stats over line-delimited JSON-RPC on stdin/stdout.
+
+    Keeps pandas/nba_api imported between requests and remembers each season's
+    result; the live season is recomputed once the response cache TTL expires.
+    """
+    from nba_cache import current_season, current_season_ttl
+    from rpc_worker import serve
+    
+    season_cache = {}
+    
+    def team_possession_data(season='2024-25'):
+        cached = season_cache.get(season)
+        if cached is not None:
+            cached_at, data = cached
+            if season != current_season() or time.time() - cached_at < current_season_ttl():
+                return data
+        
+        data = get_team_possession_data(season)
+        if data is not None:
+            season_cache[season] = (time.time(), data)
+        return data
+    
+    serve({
+        'getTeamPossessionData': team_possession_data,
+        'ping': lambda: 'pong'
+    })
+
+def main():
+    if len(sys.argv) > 1 and sys.argv[1] == '--worker':
+        run_worker()
+        return
+    
     season = sys.argv[1] if len(sys.argv) > 1 else '2024-25'
     
     data = get_team_possession_data(season)
     if data:
         print(json.dumps(data))
     else:
-        print("null")
\ No newline at end of file
+        print("null")
+
+if __name__ == "__main__":
+    run_profiled(main)
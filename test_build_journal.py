@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+"""Offline checks of the checkpoint journal used by the multi-season builds."""
+
+import json
+import os
+import sys
+import tempfile
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), 'server'))
+
+from build_journal import BuildJournal, unit_key
+
+UNIT = unit_key('LeagueDashPlayerStats', '2009-10')
+
+def journal_file():
+    return os.path.join(tempfile.mkdtemp(), 'build.jsonl')
+
+def failing():
+    raise RuntimeError("HTTP 500")
+
+def test_finished_units_are_replayed():
+    path = journal_file()
+    journal = BuildJournal('build', path, params={'targets': [1, 2]})
+    assert journal.run(UNIT, lambda: [[1, {'points': 20.0}]]) == [[1, {'points': 20.0}]]
+
+    resumed = BuildJournal('build', path, params={'targets': [1, 2]})
+    assert resumed.run(UNIT, failing) == [[1, {'points': 20.0}]]
+    assert resumed.resumed == 1 and resumed.complete()
+
+def test_failed_units_are_retried():
+    path = journal_file()
+    journal = BuildJournal('build', path)
+    assert journal.run(UNIT, failing, attempts=2, retry_delay=0) is None
+    assert not journal.complete()
+
+    resumed = BuildJournal('build', path)
+    assert resumed.run(UNIT, lambda: [], retry_delay=0) == []
+    assert resumed.complete() and resumed.resumed == 0
+
+def test_changed_params_discard_the_journal():
+    path = journal_file()
+    BuildJournal('build', path, params={'targets': [1, 2]}).run(UNIT, lambda: [[1, {}]])
+
+    # A different target set must not replay rows filtered for the old one
+    changed = BuildJournal('build', path, params={'targets': [1, 3]})
+    assert not os.path.exists(path)
+    assert changed.run(UNIT, lambda: [[3, {}]]) == [[3, {}]]
+    assert BuildJournal('build', path, params={'targets': [1, 3]}).run(UNIT, failing) == [[3, {}]]
+
+def test_journal_without_params_header_is_discarded():
+    path = journal_file()
+    with open(path, 'w') as f:
+        f.write(json.dumps({'unit': UNIT, 'status': 'done', 'rows': [[1, {}]], 'time': 0}) + '\n')
+    journal = BuildJournal('build', path, params={'targets': [1]})
+    assert not journal.is_done(UNIT)
+
+def test_torn_last_line_is_skipped():
+    path = journal_file()
+    journal = BuildJournal('build', path)
+    journal.run(UNIT, lambda: [[1, {}]])
+    with open(path, 'a') as f:
+        f.write('{"unit": "leaguedashplayerstats/2008-09", "sta')
+
+    resumed = BuildJournal('build', path)
+    assert resumed.is_done(UNIT)
+    resumed.run(unit_key('LeagueDashPlayerStats', '2008-09'), lambda: [[2, {}]])
+    assert BuildJournal('build', path).is_done(unit_key('LeagueDashPlayerStats', '2008-09'))
+
+def test_unchecked_units_are_not_replayed():
+    path = journal_file()
+    journal = BuildJournal('build', path)
+    assert journal.run(UNIT, failing, checkpoint=False) is None
+    assert not journal.complete()
+    assert journal.run(UNIT, lambda: [[1, {}]], checkpoint=False) == [[1, {}]]
+    assert journal.complete()
+
+    # A live unit is fetched again on every run
+    assert BuildJournal('build', path).run(UNIT, lambda: [[2, {}]], checkpoint=False) == [[2, {}]]
+
+def test_finish_removes_the_journal():
+    path = journal_file()
+    journal = BuildJournal('build', path)
+    journal.run(UNIT, lambda: [])
+    journal.finish()
+    assert not os.path.exists(path)
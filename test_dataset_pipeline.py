@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+"""Offline checks of dataset_pipeline.py's command line entry points."""
+
+import importlib
+import os
+import sys
+
+def import_pipeline(monkeypatch):
+    """dataset_pipeline with the server modules it expects.
+
+    Other tests import the outdated root copy of nba_data.py; the pipeline
+    needs server/nba_data.py, so it is imported with those copies unloaded.
+    """
+    for name in ('nba_data', 'team_stats_data', 'dataset_pipeline'):
+        monkeypatch.delitem(sys.modules, name, raising=False)
+    monkeypatch.setattr(sys, 'path', list(sys.path))
+    return importlib.import_module('dataset_pipeline')
+
+def test_legacy_main_accepts_profile(monkeypatch, tmp_path):
+    dataset_pipeline = import_pipeline(monkeypatch)
+    import profiling
+
+    calls = []
+    monkeypatch.setattr(dataset_pipeline, 'run_legacy_build', lambda *args: calls.append(args))
+    monkeypatch.setattr(profiling, 'PROFILE_DIR', str(tmp_path))
+    monkeypatch.setattr(sys, 'argv', ['create_historical_dataset.py', '--profile', '--dry-run'])
+
+    dataset_pipeline.legacy_main('create_historical_dataset')
+
+    assert calls == [('create_historical_dataset', None, [], True)]
+    reports = os.listdir(tmp_path)
+    assert len(reports) == 1 and reports[0].startswith('create_historical_dataset-')
+    assert 'summary.json' in os.listdir(tmp_path / reports[0])
+
+def test_failed_live_season_is_reported_not_raised(monkeypatch, tmp_path):
+    dataset_pipeline = import_pipeline(monkeypatch)
+    from build_journal import BuildJournal
+    from player_snapshot import load_players
+    from run_benchmarks import derived_player_frame
+
+    players = load_players(dataset_pipeline.DATASET_PATH)[:20]
+    frame = derived_player_frame([dict(player, seasons=player['seasons'][:1]) for player in players])
+    calls = []
+
+    def fetch_season_frame(season):
+        calls.append(season)
+        if season == '2024-25':
+            raise ConnectionError("reset by peer")
+        return frame
+
+    monkeypatch.setattr(dataset_pipeline, 'fetch_season_frame', fetch_season_frame)
+    monkeypatch.setattr(dataset_pipeline, 'PIPELINE_CACHE_DIR', str(tmp_path / 'cache'))
+    journal = BuildJournal('pipeline', str(tmp_path / 'journal.jsonl'))
+    runner = dataset_pipeline.StageRunner()
+
+    assert dataset_pipeline.fetch_stage(runner, journal, ['2024-25', '2023-24'], '2024-25') is None
+    # One attempt per season: the request layer (nba_throttle) owns the retries
+    assert sorted(calls) == ['2023-24', '2024-25']
+    assert journal.failed == {'leaguedashplayerstats/2024-25'}
+
+    # The next run refetches the live season only; the finished one is replayed
+    calls.clear()
+    monkeypatch.setattr(dataset_pipeline, 'fetch_season_frame',
+                        lambda season: calls.append(season) or frame)
+    resumed = BuildJournal('pipeline', str(tmp_path / 'journal.jsonl'))
+    fetched = dataset_pipeline.fetch_stage(runner, resumed, ['2024-25', '2023-24'], '2024-25')
+    assert calls == ['2024-25'] and set(fetched) == {'2024-25', '2023-24'}
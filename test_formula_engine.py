@@ -0,0 +1,190 @@
+#!/usr/bin/env python3
+"""Offline checks of the vectorized formula engine and its leaderboard cache.
+
+Expected values are what the old per-row path produced: every stat name
+substituted with the row's value, the string evaluated with mathjs and the
+result kept when finite and non-zero, as Number(value.toFixed(2)).
+"""
+
+import os
+import sys
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), 'server'))
+
+import numpy as np
+
+from formula_cache import FormulaCache, cache_key
+from formula_engine import (
+    DATASET_NOT_LOADED, FormulaError, compile_formula, formula_leaderboard, mathjs_round, player_columns,
+    round_half_up
+)
+from rpc_worker import INTERNAL_ERROR, INVALID_PARAMS, RpcError, handle_request
+
+def season_table(rows):
+    """Columnar player-season table from (playerId, season, team, gamesPlayed, {field: value}) rows"""
+    fields = sorted({field for *_, stats in rows for field in stats})
+    columns = {
+        'playerId': np.array([row[0] for row in rows], dtype='int64'),
+        'season': np.array([row[1] for row in rows]),
+        'team': np.array([row[2] for row in rows]),
+        'gamesPlayed': np.array([row[3] for row in rows], dtype='int64'),
+    }
+    for field in fields:
+        columns[field] = np.array([row[4].get(field, 0.0) for row in rows], dtype='float64')
+    return columns
+
+TABLE = season_table([
+    (1, '2023-24', 'AAA', 70, {'points': 25.0, 'assists': 5.0, 'turnovers': 2.0,
+                               'fieldGoalPercentage': 0.5, 'plusMinus': -3.2}),
+    (2, '2023-24', 'BBB', 5, {'points': 10.0, 'assists': 8.0, 'turnovers': 0.0,
+                              'fieldGoalPercentage': 0.6, 'plusMinus': 4.1}),
+    (3, '2023-24', 'CCC', 60, {'points': 0.0, 'assists': 0.0, 'turnovers': 1.0,
+                               'fieldGoalPercentage': 0.0, 'plusMinus': 0.0}),
+    (1, '2022-23', 'AAA', 65, {'points': 20.0, 'assists': 6.0, 'turnovers': 4.0,
+                               'fieldGoalPercentage': 0.45, 'plusMinus': 1.5}),
+    (2, '2022-23', 'DDD', 30, {'points': 12.5, 'assists': 3.0, 'turnovers': 2.5,
+                               'fieldGoalPercentage': 0.48, 'plusMinus': -0.5}),
+])
+
+def points_table(points):
+    """One 20-game season per points value, player ids counting from 1"""
+    return season_table([(index, 'S', 'T', 20, {'points': value}) for index, value in enumerate(points, 1)])
+
+def ranking(formula, columns=TABLE, season=None):
+    """(playerId, season, customStat) in rank order"""
+    rows = formula_leaderboard(formula, columns, season)
+    assert [row['rank'] for row in rows] == list(range(1, len(rows) + 1))
+    return [(row['playerId'], row['season'], row['customStat']) for row in rows]
+
+def assert_formula_error(formula):
+    try:
+        compile_formula(formula)
+    except FormulaError:
+        return
+    raise AssertionError(f"{formula!r} compiled but should be rejected")
+
+def test_arithmetic_matches_mathjs():
+    assert ranking('PTS + AST * 2') == [
+        (1, '2023-24', 35.0), (1, '2022-23', 32.0), (2, '2023-24', 26.0), (2, '2022-23', 18.5)
+    ]
+    # "25 - -3.2": substituted negative values subtract correctly
+    assert ranking('PTS - PLUS_MINUS') == [
+        (1, '2023-24', 28.2), (1, '2022-23', 18.5), (2, '2022-23', 13.0), (2, '2023-24', 5.9)
+    ]
+    assert ranking('ast ^ 2') == ranking('POW(AST, 2)') == [
+        (2, '2023-24', 64.0), (1, '2022-23', 36.0), (1, '2023-24', 25.0), (2, '2022-23', 9.0)
+    ]
+
+def test_missing_stats_count_as_zero():
+    # fieldGoalsMade is not in the dataset; the old path substituted `value || 0`
+    assert ranking('PTS + FGM') == ranking('PTS')
+
+def test_division_by_zero_is_dropped():
+    # 10 / 0 is Infinity and 0 / 1 is 0; neither is ranked
+    assert ranking('PTS / TOV', season='2023-24') == [(1, '2023-24', 12.5)]
+    assert ranking('PTS * 0 / 0') == []
+    assert ranking('PTS / 0') == []
+
+def test_modulo_by_zero_keeps_the_dividend():
+    # mathjs mod(x, 0) is x
+    assert ranking('PTS % TOV') == [(2, '2023-24', 10.0), (1, '2023-24', 1.0)]
+
+def test_percentage_stats_need_ten_games():
+    assert ranking('FG_PCT * 100') == [(1, '2023-24', 50.0), (2, '2022-23', 48.0), (1, '2022-23', 45.0)]
+
+def test_season_filter():
+    assert ranking('PTS + AST', season='2022-23') == [(1, '2022-23', 26.0), (2, '2022-23', 15.5)]
+    assert ranking('PTS + AST', season='all-time') == ranking('PTS + AST')
+
+def test_to_fixed_rounding():
+    # Number(x.toFixed(2)) rounds the exact binary value, and exact ties away from zero
+    points = [0.125, 1.005, 2.675, -0.125, 10.235]
+    assert round_half_up(np.array(points)).tolist() == [0.13, 1.0, 2.67, -0.13, 10.23]
+    assert [stat for *_, stat in ranking('PTS', points_table(points))] == [10.23, 2.67, 1.0, 0.13, -0.13]
+
+def test_round_matches_mathjs():
+    # mathjs rounds ties away from zero on the decimal form, unlike np.round
+    assert [stat for *_, stat in ranking('ROUND(PTS)', points_table([2.5, -2.5, 1.4999, 0.4]))] == [3.0, 1.0, -3.0]
+    assert mathjs_round(np.array([2.675, 1.005, -1.005]), 2).tolist() == [2.68, 1.01, -1.01]
+    assert mathjs_round(np.array([0.5, 1.5, 2.5]), 0).tolist() == [1.0, 2.0, 3.0]
+
+def test_invalid_formulas_are_formula_errors():
+    for formula in ['ROUND(PTS, AST)', 'ROUND(PTS, 1.5)', 'ROUND(PTS, 16)', 'SQRT(PTS, AST)', 'POW(PTS)',
+                    'ABS()', 'SQRT + PTS', 'PTS(2)', 'FOO + PTS', '2 + 3', 'PTS +', 'PTS; AST',
+                    '__IMPORT__(PTS)', 'PTS.REAL', "'PTS'"]:
+        assert_formula_error(formula)
+    assert issubclass(FormulaError, ValueError)
+
+def test_cache_key_is_canonical():
+    def key(formula, season=None):
+        return cache_key(compile_formula(formula).tree, season, 'v1')
+
+    assert key('AST + PTS') == key('pts+ast') == key('(PTS) + AST', 'all-time')
+    assert key('2 * PTS') == key('PTS * 2.0')
+    assert key('PTS - AST') != key('AST - PTS')
+    assert key('PTS') != key('PTS', '2023-24')
+
+def test_cache_evicts_least_recently_used():
+    cache = FormulaCache(max_bytes=10)
+    cache.put('a', 'xxxx')
+    cache.put('b', 'yyyy')
+    assert cache.get('a') == 'xxxx'
+    cache.put('c', 'zzzz')
+    assert cache.get('b') is None
+    assert cache.get('a') == 'xxxx' and cache.get('c') == 'zzzz'
+    cache.put('d', 'too large for the budget')
+    assert cache.get('d') is None
+    assert cache.stats()['bytes'] == 8
+
+def test_only_formula_errors_are_invalid_params():
+    def calculate(formula):
+        if formula == 'corrupt':
+            raise ValueError("Unsupported snapshot version 9")
+        return formula_leaderboard(formula, TABLE)
+
+    def call(formula):
+        request = {'jsonrpc': '2.0', 'id': 1, 'method': 'calculate', 'params': {'formula': formula}}
+        return handle_request({'calculate': calculate}, request, invalid_params_errors=FormulaError)
+
+    assert call('ROUND(PTS, AST)')['error']['code'] == INVALID_PARAMS
+    assert call('corrupt')['error']['code'] == INTERNAL_ERROR
+    assert call('PTS')['result'][0]['customStat'] == 25.0
+
+def test_rpc_errors_answer_their_own_code():
+    def calculate(version):
+        raise RpcError(DATASET_NOT_LOADED, f"Dataset version {version} is not loaded")
+
+    request = {'jsonrpc': '2.0', 'id': 1, 'method': 'calculate', 'params': {'version': 'abc'}}
+    assert handle_request({'calculate': calculate}, request)['error'] == {
+        'code': DATASET_NOT_LOADED, 'message': "Dataset version abc is not loaded"}
+
+# nba_players rows as the server reads them from the database
+DATABASE_PLAYERS = [
+    {'playerId': 1, 'team': 'AAA', 'currentSeason': '2023-24', 'gamesPlayed': 135, 'points': 22.6,
+     'seasons': [
+         {'season': '2023-24', 'team': 'AAA', 'gamesPlayed': 70, 'points': 25.0, 'assists': 5.0},
+         {'season': '2022-23', 'team': 'BBB', 'gamesPlayed': 65, 'points': 20.0, 'assists': None},
+     ]},
+    # No per-season data: ranked on career averages in all-time leaderboards only
+    {'playerId': 2, 'team': 'CCC', 'currentSeason': '2023-24', 'gamesPlayed': 40, 'points': 21.0,
+     'assists': 2.0, 'seasons': None},
+    {'playerId': 3, 'team': 'DDD', 'currentSeason': None, 'gamesPlayed': 12, 'points': 9.0},
+    # An empty seasons list has nothing to rank, as in the mathjs path
+    {'playerId': 4, 'team': 'EEE', 'currentSeason': '2023-24', 'gamesPlayed': 50, 'points': 30.0,
+     'seasons': []},
+]
+
+def test_database_players_rank_seasons_and_career_rows():
+    columns = player_columns(DATABASE_PLAYERS)
+    assert columns['careerRow'].tolist() == [False, False, True, True]
+    assert ranking('PTS', columns) == [(1, '2023-24', 25.0), (2, '2023-24', 21.0),
+                                       (1, '2022-23', 20.0), (3, '2024-25', 9.0)]
+    assert ranking('PTS', columns, '2023-24') == [(1, '2023-24', 25.0)]
+    # Missing stats count as 0, and the career row's team is the player's
+    assert ranking('AST', columns) == [(1, '2023-24', 5.0), (2, '2023-24', 2.0)]
+    assert formula_leaderboard('PTS', columns)[1]['team'] == 'CCC'
+    # Career rows use career games for the percentage-stat minimum
+    assert [row[0] for row in ranking('PTS + FG_PCT', columns)] == [1, 2, 1, 3]
+
+def test_empty_database_ranks_nothing():
+    assert formula_leaderboard('PTS', player_columns([])) == []
+    assert formula_leaderboard('PTS', player_columns([]), '2023-24') == []
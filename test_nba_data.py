@@ -0,0 +1,29 @@
+#!/usr/bin/env python3
+"""Offline checks of server/nba_data.py's dataset loading."""
+
+import importlib
+import json
+import os
+import sys
+
+SERVER_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'server')
+
+def import_nba_data(monkeypatch):
+    """server/nba_data.py, not the outdated root copy other tests import"""
+    monkeypatch.delitem(sys.modules, 'nba_data', raising=False)
+    monkeypatch.setattr(sys, 'path', [SERVER_DIR] + sys.path)
+    return importlib.import_module('nba_data')
+
+def test_dataset_json_is_read_without_the_snapshot_module(monkeypatch, tmp_path):
+    nba_data = import_nba_data(monkeypatch)
+    # As left by a failed career_stats/player_snapshot import
+    monkeypatch.setattr(nba_data, 'DATASET_AVAILABLE', False)
+    for name in ('load_players', 'snapshot_path'):
+        monkeypatch.delattr(nba_data, name)
+
+    players = [{'playerId': 1, 'name': 'A Player', 'seasons': []}]
+    (tmp_path / 'server').mkdir()
+    (tmp_path / 'server' / 'extended_players.json').write_text(json.dumps(players))
+    monkeypatch.chdir(tmp_path)
+
+    assert nba_data.get_all_players_with_seasons() == players
@@ -0,0 +1,167 @@
+#!/usr/bin/env python3
+"""Offline checks of the shared NBA API request executor (rate limit,
+retries, circuit breaker and adaptive timeouts).
+"""
+
+import os
+import sys
+import tempfile
+from contextlib import contextmanager
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), 'server'))
+
+import nba_throttle
+from nba_throttle import CircuitOpenError, HTTPStatusError, TokenBucket, endpoint_state, execute
+
+@contextmanager
+def settings(**values):
+    """NBA_* environment settings, no rate limit and no backoff for one test"""
+    values.setdefault('NBA_RATE_LIMIT', '0')
+    saved = {name: os.environ.get(name) for name in values}
+    backoff_base = nba_throttle.BACKOFF_BASE
+    os.environ.update({name: str(value) for name, value in values.items()})
+    nba_throttle.BACKOFF_BASE = 0.0
+    try:
+        yield
+    finally:
+        nba_throttle.BACKOFF_BASE = backoff_base
+        for name, value in saved.items():
+            if value is None:
+                os.environ.pop(name, None)
+            else:
+                os.environ[name] = value
+
+def flaky(*errors, result='ok'):
+    """send() that raises the given errors in turn, then returns result; records its timeouts"""
+    pending = list(errors)
+    timeouts = []
+
+    def send(timeout):
+        timeouts.append(timeout)
+        if pending:
+            raise pending.pop(0)
+        return result
+
+    return send, timeouts
+
+def test_bucket_allows_a_burst_then_waits():
+    bucket = TokenBucket(os.path.join(tempfile.mkdtemp(), 'bucket.json'), rate=1.0, burst=3)
+    assert [bucket.take() for _ in range(3)] == [0.0, 0.0, 0.0]
+    wait = bucket.take()
+    assert 0.9 < wait <= 1.0
+
+def test_bucket_state_is_shared_through_the_file():
+    path = os.path.join(tempfile.mkdtemp(), 'bucket.json')
+    TokenBucket(path, rate=0.5, burst=1).take()
+    # Another process (here another bucket) sees the token as taken
+    assert TokenBucket(path, rate=0.5, burst=1).take() > 1.0
+
+def test_retryable_errors_are_retried():
+    with settings(NBA_MAX_ATTEMPTS=3):
+        send, timeouts = flaky(HTTPStatusError(503), ConnectionError("reset"))
+        assert execute('RetryEndpoint', send) == 'ok'
+        assert len(timeouts) == 3
+
+def test_client_errors_are_not_retried():
+    with settings(NBA_MAX_ATTEMPTS=3):
+        send, timeouts = flaky(HTTPStatusError(404))
+        try:
+            execute('NotFoundEndpoint', send)
+        except HTTPStatusError as e:
+            assert e.status_code == 404
+        else:
+            raise AssertionError("404 should not be retried into a success")
+        assert len(timeouts) == 1
+
+def test_bugs_are_not_retried():
+    with settings(NBA_MAX_ATTEMPTS=3):
+        for error in (KeyError('resultSets'), ValueError("Expecting value"), TypeError("NoneType")):
+            send, timeouts = flaky(error)
+            try:
+                execute('BuggyEndpoint', send)
+            except type(error):
+                pass
+            assert len(timeouts) == 1
+
+def test_request_transport_errors_are_retried():
+    import requests
+    with settings(NBA_MAX_ATTEMPTS=3):
+        send, timeouts = flaky(requests.ConnectionError("reset"), requests.ReadTimeout("slow"))
+        assert execute('TransportEndpoint', send) == 'ok'
+        assert len(timeouts) == 3
+        send, timeouts = flaky(requests.exceptions.InvalidURL("no host"))
+        try:
+            execute('TransportEndpoint', send)
+        except requests.exceptions.InvalidURL:
+            pass
+        assert len(timeouts) == 1
+
+def test_circuit_opens_after_consecutive_failures():
+    with settings(NBA_MAX_ATTEMPTS=1, NBA_BREAKER_THRESHOLD=2, NBA_BREAKER_COOLDOWN=60):
+        for _ in range(2):
+            try:
+                execute('BrokenEndpoint', flaky(HTTPStatusError(500))[0])
+            except HTTPStatusError:
+                pass
+        send, timeouts = flaky()
+        try:
+            execute('BrokenEndpoint', send)
+        except CircuitOpenError:
+            pass
+        else:
+            raise AssertionError("the circuit should be open")
+        assert timeouts == []
+
+def test_half_open_circuit_lets_one_trial_through():
+    with settings(NBA_MAX_ATTEMPTS=1, NBA_BREAKER_THRESHOLD=2, NBA_BREAKER_COOLDOWN=0):
+        for _ in range(2):
+            try:
+                execute('RecoveringEndpoint', flaky(HTTPStatusError(500))[0])
+            except HTTPStatusError:
+                pass
+        assert execute('RecoveringEndpoint', flaky()[0]) == 'ok'
+        assert endpoint_state('RecoveringEndpoint').failures == 0
+
+def test_half_open_circuit_admits_a_single_caller():
+    with settings(NBA_BREAKER_THRESHOLD=1, NBA_BREAKER_COOLDOWN=0):
+        state = endpoint_state('ContendedEndpoint')
+        state.record_failure(False, 1.0)
+        state.check_circuit()
+        # Every other caller fails fast while the trial request is out
+        for _ in range(3):
+            try:
+                state.check_circuit()
+            except CircuitOpenError:
+                pass
+            else:
+                raise AssertionError("only the trial caller may pass a half-open circuit")
+        state.record_success(0.1)
+        state.check_circuit()
+
+def test_failed_trial_reopens_the_circuit():
+    with settings(NBA_BREAKER_THRESHOLD=1, NBA_BREAKER_COOLDOWN=60):
+        state = endpoint_state('FlappingEndpoint')
+        state.record_failure(False, 1.0)
+        state.opened_at -= 60
+        state.check_circuit()
+        state.record_failure(False, 1.0)
+        assert not state.half_open_trial and state.opened_at is not None
+        try:
+            state.check_circuit()
+        except CircuitOpenError as e:
+            assert 'circuit open' in str(e)
+        else:
+            raise AssertionError("a failed trial should reopen the circuit")
+
+def test_timeouts_adapt_to_response_times():
+    with settings(NBA_MAX_ATTEMPTS=2):
+        state = endpoint_state('SlowEndpoint')
+        assert state.timeout() == nba_throttle.DEFAULT_TIMEOUT
+        state.record_success(1.0)
+        assert state.timeout() == nba_throttle.MIN_TIMEOUT
+        state.record_success(20.0)
+        # The average moves LATENCY_SMOOTHING of the way: 1.0 -> 4.8
+        assert abs(state.timeout() - 4.8 * nba_throttle.TIMEOUT_MULTIPLIER) < 1e-9
+
+        send, timeouts = flaky(TimeoutError("read timed out"))
+        assert execute('SlowEndpoint', send) == 'ok'
+        assert timeouts[1] > timeouts[0]
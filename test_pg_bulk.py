@@ -0,0 +1,191 @@
+#!/usr/bin/env python3
+"""Offline checks of the COPY-based bulk loader used by the restore/import scripts.
+
+No database is needed: the loaders only use a DB-API connection's cursor(),
+commit() and rollback() and a cursor's execute() and copy_expert(), so a
+recording connection stands in for psycopg2 and parses the streamed CSV the
+way COPY ... WITH (FORMAT csv) does.
+"""
+
+import threading
+
+from pg_bulk import CsvStream, pg_array, pg_json, replace_table_contents, replace_tables_contents
+
+class RecordingCursor:
+    """Cursor that records SQL and decodes COPY csv input (unquoted empty field = NULL)"""
+
+    def __init__(self, conn):
+        self.conn = conn
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def execute(self, sql):
+        if self.conn.fail_on and self.conn.fail_on in sql:
+            raise RuntimeError(f"failed: {sql}")
+        self.conn.statements.append(sql)
+
+    def copy_expert(self, sql, stream):
+        self.execute(sql)
+        self.conn.copied.extend(parse_copy_csv(stream.read().decode('utf-8')))
+
+def parse_copy_csv(text):
+    """Rows of COPY csv text: quoted fields are strings, an unquoted empty field is NULL"""
+    rows, row, field, quoted, in_quotes = [], [], '', False, False
+    index = 0
+    while index < len(text):
+        char = text[index]
+        if in_quotes:
+            if char == '"' and text[index + 1:index + 2] == '"':
+                field += '"'
+                index += 1
+            elif char == '"':
+                in_quotes = False
+            else:
+                field += char
+        elif char == '"':
+            in_quotes = quoted = True
+        elif char in ',\n':
+            row.append(field if field or quoted else None)
+            field, quoted = '', False
+            if char == '\n':
+                rows.append(row)
+                row = []
+        else:
+            field += char
+        index += 1
+    return rows
+
+class RecordingConnection:
+    def __init__(self, fail_on=None):
+        self.fail_on = fail_on
+        self.statements = []
+        self.copied = []
+        self.commits = 0
+        self.rollbacks = 0
+
+    def cursor(self):
+        return RecordingCursor(self)
+
+    def commit(self):
+        self.commits += 1
+
+    def rollback(self):
+        self.rollbacks += 1
+
+class RecordingPool:
+    """Connection pool handing out recording connections; keeps every one it created"""
+
+    def __init__(self, fail_on=None):
+        self.fail_on = fail_on
+        self.connections = []
+        self.checked_out = 0
+        self.lock = threading.Lock()
+
+    def getconn(self):
+        with self.lock:
+            conn = RecordingConnection(self.fail_on)
+            self.connections.append(conn)
+            self.checked_out += 1
+            return conn
+
+    def putconn(self, conn):
+        with self.lock:
+            self.checked_out -= 1
+
+ROWS = [
+    (1, 'LeBron James', 27.1, None, True),
+    (2, 'Say "Hey" Kid, Jr.', 0.1, '', False),
+    (3, 'Ünïcode\nname', -1.5, pg_array(['2024-25', 'a"b']), None),
+]
+
+def test_csv_round_trip():
+    # None must come back as NULL and '' as an empty string
+    assert parse_copy_csv(CsvStream(ROWS).read().decode('utf-8')) == [
+        ['1', 'LeBron James', '27.1', None, 'true'],
+        ['2', 'Say "Hey" Kid, Jr.', '0.1', '', 'false'],
+        ['3', 'Ünïcode\nname', '-1.5', '{"2024-25","a\\"b"}', None],
+    ]
+
+def test_stream_reads_in_small_pieces():
+    rows = [(index, f"player {index}") for index in range(2500)]
+    stream = CsvStream(rows, chunk_rows=100)
+    pieces = []
+    while True:
+        piece = stream.read(4096)
+        if not piece:
+            break
+        assert len(piece) <= 4096
+        pieces.append(piece)
+    assert b''.join(pieces) == CsvStream(rows).read()
+    assert stream.row_count == 2500
+
+def test_array_and_json_literals():
+    assert pg_array(None) is None and pg_json(None) is None
+    assert pg_array([]) == '{}'
+    assert pg_array(['back\\slash']) == '{"back\\\\slash"}'
+    assert pg_json({'a': [1, 2]}) == '{"a": [1, 2]}'
+
+def test_replace_table_contents_swaps_in_one_transaction():
+    conn = RecordingConnection()
+    rows = [(1, 'A'), (2, None)]
+    assert replace_table_contents(conn, 'nba_players', ['id', 'name'], rows) == 2
+    assert conn.statements == [
+        "CREATE TEMP TABLE nba_players_staging (LIKE nba_players INCLUDING DEFAULTS) ON COMMIT DROP",
+        "COPY nba_players_staging (id, name) FROM STDIN WITH (FORMAT csv)",
+        "DELETE FROM nba_players",
+        "INSERT INTO nba_players (id, name) SELECT id, name FROM nba_players_staging",
+    ]
+    assert conn.copied == [['1', 'A'], ['2', None]]
+    assert (conn.commits, conn.rollbacks) == (1, 0)
+
+def test_failed_swap_rolls_back():
+    conn = RecordingConnection(fail_on='DELETE FROM')
+    try:
+        replace_table_contents(conn, 'nba_players', ['id'], [(1,)])
+    except RuntimeError:
+        pass
+    else:
+        raise AssertionError("the failed DELETE should propagate")
+    assert (conn.commits, conn.rollbacks) == (0, 1)
+
+AWARD_LOADS = {
+    'awards': (['id', 'name'], [(1, 'MVP'), (2, 'DPOY')]),
+    'award_winners': (['award_id', 'player_id'], [(1, 2544)]),
+}
+
+def test_tables_are_staged_apart_and_swapped_together():
+    pool = RecordingPool()
+    assert replace_tables_contents(pool, AWARD_LOADS) == {'awards': 2, 'award_winners': 1}
+    assert pool.checked_out == 0
+
+    *loads, swap = pool.connections
+    assert sorted(conn.copied for conn in loads) == [[['1', '2544']], [['1', 'MVP'], ['2', 'DPOY']]]
+    assert all(conn.statements[0].startswith("DROP TABLE IF EXISTS") for conn in loads)
+    assert all("CREATE UNLOGGED TABLE" in conn.statements[1] for conn in loads)
+    # One transaction replaces both tables and drops both staging tables
+    assert swap.commits == 1 and swap.statements == [
+        "DELETE FROM awards",
+        "INSERT INTO awards (id, name) SELECT id, name FROM awards_staging",
+        "DROP TABLE IF EXISTS awards_staging",
+        "DELETE FROM award_winners",
+        "INSERT INTO award_winners (award_id, player_id) SELECT award_id, player_id FROM award_winners_staging",
+        "DROP TABLE IF EXISTS award_winners_staging",
+    ]
+
+def test_failed_swap_drops_the_staging_tables():
+    pool = RecordingPool(fail_on='DELETE FROM award_winners')
+    try:
+        replace_tables_contents(pool, AWARD_LOADS)
+    except RuntimeError:
+        pass
+    else:
+        raise AssertionError("the failed swap should propagate")
+    assert pool.checked_out == 0
+
+    swap, cleanup = pool.connections[-2:]
+    assert swap.rollbacks == 1 and swap.commits == 0
+    assert cleanup.statements == ["DROP TABLE IF EXISTS awards_staging", "DROP TABLE IF EXISTS award_winners_staging"]
@@ -0,0 +1,35 @@
+#!/usr/bin/env python3
+"""Offline checks that the compact player models round-trip the dataset."""
+
+import json
+import os
+import sys
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), 'server'))
+
+from player_model import (
+    load_player_models, players_from_dicts, players_from_snapshot_arrays, players_to_dicts, save_player_models
+)
+from player_snapshot import players_from_snapshot, snapshot_arrays
+
+DATASET_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'server', 'extended_players.json')
+
+def dataset():
+    with open(DATASET_PATH, 'r') as f:
+        return json.load(f)
+
+def test_models_match_the_snapshot_dicts():
+    arrays = snapshot_arrays(dataset())
+    assert players_to_dicts(players_from_snapshot_arrays(arrays)) == players_from_snapshot(arrays)
+
+def test_models_round_trip_the_json():
+    players = dataset()
+    models = players_from_dicts(players)
+    assert players_to_dicts(models) == players
+    # Key order included, so the file is reproduced byte for byte
+    assert json.dumps(players_to_dicts(models), indent=2) == json.dumps(players, indent=2)
+
+def test_saved_models_load_back(tmp_path):
+    players = dataset()[:50]
+    json_path = str(tmp_path / 'players.json')
+    save_player_models(players_from_dicts(players), json_path)
+    assert players_to_dicts(load_player_models(json_path)) == players
@@ -0,0 +1,55 @@
+#!/usr/bin/env python3
+"""Offline checks of the player dataset JSON and its columnar snapshot."""
+
+import json
+import os
+import sys
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), 'server'))
+
+import player_snapshot
+from player_snapshot import load_players, save_players
+
+SEASON = {
+    'season': '2023-24', 'team': 'AAA', 'position': 'G', 'gamesPlayed': 70, 'minutesPerGame': 34.5,
+    'points': 25.0, 'assists': 5.0, 'rebounds': 6.1, 'steals': 1.2, 'blocks': 0.4, 'turnovers': 2.0,
+    'fieldGoalPercentage': 0.5, 'fieldGoalAttempts': 19.0, 'threePointPercentage': 0.38,
+    'threePointAttempts': 7.5, 'freeThrowPercentage': 0.88, 'freeThrowAttempts': 6.0,
+    'plusMinus': -3.2, 'winPercentage': 0.55,
+}
+
+def dataset(points):
+    """A one-player dataset in the extended_players.json shape"""
+    return [{
+        'playerId': 1, 'name': 'A Player', 'seasons': [dict(SEASON, points=points)],
+        'currentSeason': '2023-24', 'team': 'AAA', 'position': 'G', 'gamesPlayed': 70,
+        'points': points, 'assists': 5.0, 'rebounds': 6.1, 'steals': 1.2, 'blocks': 0.4,
+        'turnovers': 2.0, 'fieldGoalPercentage': 0.5, 'threePointPercentage': 0.38,
+        'freeThrowPercentage': 0.88, 'minutesPerGame': 34.5, 'plusMinus': -3.2,
+        'availableSeasons': ['2023-24'],
+    }]
+
+def test_saved_players_load_back(tmp_path):
+    json_path = str(tmp_path / 'players.json')
+    save_players(dataset(25.0), json_path)
+    assert load_players(json_path) == dataset(25.0)
+    with open(json_path) as f:
+        assert json.load(f) == dataset(25.0)
+
+def test_failed_save_keeps_the_previous_json(monkeypatch, tmp_path):
+    json_path = str(tmp_path / 'players.json')
+    save_players(dataset(25.0), json_path)
+
+    def fail_replace(source, destination):
+        raise OSError("disk full")
+
+    monkeypatch.setattr(player_snapshot.os, 'replace', fail_replace)
+    try:
+        save_players(dataset(30.0), json_path)
+    except OSError:
+        pass
+    else:
+        raise AssertionError("the failed write should propagate")
+
+    with open(json_path) as f:
+        assert json.load(f) == dataset(25.0)
+    assert not [name for name in os.listdir(tmp_path) if name.endswith('.tmp')]